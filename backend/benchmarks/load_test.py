@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+后端端到端压测：在本地模拟OKX服务器上启动 main:app，按配置的比例和并发请求各路由，
+输出每个路由的吞吐量和 p50/p95/p99 延迟 (JSON)，并与保存的基线比较，出现性能回退时以非0状态退出。
+
+用法 (在 backend 目录下):
+    python benchmarks/load_test.py --concurrency 32 --duration 30 --output results.json
+    python benchmarks/load_test.py --update-baseline          # 把本次结果保存为基线
+    python benchmarks/load_test.py --require-baseline         # CI: 没有基线时以非0状态退出
+    python benchmarks/load_test.py --target http://127.0.0.1:3001   # 压测已在运行的后端
+    python benchmarks/load_test.py --mix quote=50,chains=50 --mock-latency 0.2
+
+基线与机器相关，应在同一台机器 (或同一规格的CI环境) 上生成和比较。
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(BACKEND_DIR, "benchmarks", "baseline.json")
+
+# 默认的请求比例 (路由名=权重)
+DEFAULT_MIX = "quote=30,tokens=25,search=15,chains=20,status_batch=10"
+
+NATIVE_TOKEN_ADDRESS = "0xeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeee"
+CHAIN_IDS = ["1", "56", "137", "10", "42161", "8453"]
+SEARCH_QUERIES = ["usd", "eth", "wbtc", "link", "tk1", "dai", "uni"]
+
+
+def build_request(route: str, rng: random.Random) -> Dict[str, Any]:
+    """ 为路由生成一个请求 (method, url, json)。 """
+    if route == "quote":
+        from_chain, to_chain = rng.sample(CHAIN_IDS, 2)
+        return {
+            "method": "POST",
+            "url": "/api/v1/quote/",
+            "json": {
+                "from_chain_id": from_chain,
+                "to_chain_id": to_chain,
+                "from_token_address": NATIVE_TOKEN_ADDRESS,
+                "to_token_address": NATIVE_TOKEN_ADDRESS,
+                "amount": str(rng.randint(1, 100) * 10 ** 16),
+                "slippage": "0.01",
+                "user_address": "0x" + "1" * 40,
+            },
+        }
+    if route == "tokens":
+        return {"method": "GET", "url": f"/api/v1/tokens/{rng.choice(CHAIN_IDS)}?limit=100"}
+    if route == "search":
+        return {"method": "GET", "url": f"/api/v1/tokens/?query={rng.choice(SEARCH_QUERIES)}&limit=50"}
+    if route == "chains":
+        return {"method": "GET", "url": "/api/v1/chains/"}
+    if route == "status_batch":
+        tx_ids = ",".join(f"0x{rng.getrandbits(64):016x}" for _ in range(rng.randint(1, 10)))
+        return {"method": "GET", "url": f"/api/v1/status/batch/{tx_ids}"}
+    raise ValueError(f"未知的路由: {route}")
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    for name in weights:
+        build_request(name, random.Random(0))  # 提前校验路由名
+    return weights
+
+
+def percentile(sorted_values: List[float], p: float) -> Optional[float]:
+    """ 最近秩法计算百分位 (sorted_values 需已排序)。 """
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(p / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class RouteStats:
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.statuses: Dict[str, int] = {}
+
+    def record(self, latency: float, status: str, ok: bool):
+        self.latencies.append(latency)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if not ok:
+            self.errors += 1
+
+    def summary(self, duration: float) -> Dict[str, Any]:
+        values = sorted(self.latencies)
+        count = len(values)
+        ms = lambda v: round(v * 1000, 2) if v is not None else None
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "throughput_rps": round(count / duration, 2) if duration else 0.0,
+            "mean_ms": ms(sum(values) / count) if count else None,
+            "p50_ms": ms(percentile(values, 50)),
+            "p95_ms": ms(percentile(values, 95)),
+            "p99_ms": ms(percentile(values, 99)),
+            "max_ms": ms(values[-1]) if values else None,
+            "statuses": dict(sorted(self.statuses.items())),
+        }
+
+
+async def run_load(base_url: str, weights: Dict[str, float], concurrency: int, duration: float, warmup: float, seed: int) -> Dict[str, Any]:
+    """ concurrency 个并发worker持续请求，先预热 warmup 秒 (不计入结果)，再压测 duration 秒。 """
+    stats = {route: RouteStats() for route in weights}
+    routes = list(weights)
+    route_weights = [weights[route] for route in routes]
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        async def worker(worker_id: int, deadline: float, record: bool):
+            rng = random.Random(seed * 1000 + worker_id + (0 if record else 500))
+            while time.monotonic() < deadline:
+                route = rng.choices(routes, route_weights)[0]
+                request = build_request(route, rng)
+                started = time.perf_counter()
+                try:
+                    response = await client.request(request["method"], request["url"], json=request.get("json"))
+                    await response.aread()
+                    status, ok = str(response.status_code), response.status_code < 400
+                except httpx.HTTPError as e:
+                    status, ok = type(e).__name__, False
+                if record:
+                    stats[route].record(time.perf_counter() - started, status, ok)
+
+        if warmup > 0:
+            deadline = time.monotonic() + warmup
+            await asyncio.gather(*(worker(i, deadline, False) for i in range(concurrency)))
+
+        started = time.monotonic()
+        deadline = started + duration
+        await asyncio.gather(*(worker(i, deadline, True) for i in range(concurrency)))
+        elapsed = time.monotonic() - started
+
+    total = sum(len(s.latencies) for s in stats.values())
+    errors = sum(s.errors for s in stats.values())
+    return {
+        "duration_s": round(elapsed, 2),
+        "total_requests": total,
+        "total_errors": errors,
+        "throughput_rps": round(total / elapsed, 2) if elapsed else 0.0,
+        "routes": {route: s.summary(elapsed) for route, s in stats.items()},
+    }
+
+
+def compare_with_baseline(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, error_tolerance: float) -> List[str]:
+    """
+    与基线比较，返回回退描述列表 (为空表示没有回退)。
+
+    以下任一情况视为回退：某路由的 p95 / p99 比基线高出 tolerance 以上、吞吐量比基线低
+    tolerance 以上，或错误率比基线高出 error_tolerance 以上。
+    """
+    regressions = []
+    for route, base in baseline.get("routes", {}).items():
+        current = results["routes"].get(route)
+        if current is None or not current["requests"]:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if base.get(metric) and current[metric] is not None and current[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{route}: {metric} {current[metric]} > 基线 {base[metric]} (+{tolerance:.0%})")
+        if base.get("throughput_rps") and current["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{route}: 吞吐量 {current['throughput_rps']} < 基线 {base['throughput_rps']} (-{tolerance:.0%})")
+        if current["error_rate"] > base.get("error_rate", 0.0) + error_tolerance:
+            regressions.append(f"{route}: 错误率 {current['error_rate']} > 基线 {base.get('error_rate', 0.0)} (+{error_tolerance})")
+    return regressions
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"进程提前退出 (退出码 {process.returncode}): {url}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"等待服务启动超时: {url}")
+
+
+def start_servers(args) -> tuple:
+    """ 启动模拟OKX服务器和后端，返回 (后端地址, 进程列表)。 """
+    mock_port = args.mock_port or free_port()
+    backend_port = args.backend_port or free_port()
+    mock = subprocess.Popen(
+        [sys.executable, "mock_okx_server.py", "--port", str(mock_port),
+         "--latency", str(args.mock_latency), "--jitter", str(args.mock_jitter),
+         "--error-rate", str(args.mock_error_rate), "--rate-limit-rate", str(args.mock_rate_limit_rate),
+         "--tokens-per-chain", str(args.tokens_per_chain), "--seed", str(args.seed)],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL
+    )
+    processes = [mock]
+    try:
+        wait_until_ready(f"http://127.0.0.1:{mock_port}/mock/config", mock)
+        env = dict(os.environ, OKX_BASE_API_URL=f"http://127.0.0.1:{mock_port}")
+        if not args.keep_rate_limit:
+            env["OKX_CLIENT_RATE_LIMIT"] = "false"
+        backend = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+             "--port", str(backend_port), "--log-level", "warning", "--no-access-log"],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL
+        )
+        processes.append(backend)
+        wait_until_ready(f"http://127.0.0.1:{backend_port}/health", backend)
+    except Exception:
+        stop_servers(processes)
+        raise
+    return f"http://127.0.0.1:{backend_port}", processes
+
+
+def stop_servers(processes: List[subprocess.Popen]):
+    for process in reversed(processes):
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="后端端到端压测")
+    parser.add_argument("--concurrency", type=int, default=16, help="并发请求数")
+    parser.add_argument("--duration", type=float, default=20.0, help="压测时长（秒）")
+    parser.add_argument("--warmup", type=float, default=3.0, help="预热时长（秒），不计入结果")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"路由比例，默认 {DEFAULT_MIX}")
+    parser.add_argument("--seed", type=int, default=1, help="随机种子")
+    parser.add_argument("--target", default=None, help="压测已在运行的后端，不启动模拟服务器")
+    parser.add_argument("--backend-port", type=int, default=None)
+    parser.add_argument("--mock-port", type=int, default=None)
+    parser.add_argument("--mock-latency", type=float, default=0.05, help="模拟OKX的基础延迟（秒）")
+    parser.add_argument("--mock-jitter", type=float, default=0.01)
+    parser.add_argument("--mock-error-rate", type=float, default=0.0)
+    parser.add_argument("--mock-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--tokens-per-chain", type=int, default=2000)
+    parser.add_argument("--keep-rate-limit", action="store_true", help="保留按OKX配额设置的客户端限流")
+    parser.add_argument("--output", default=None, help="结果JSON文件，默认只输出到标准输出")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线JSON文件")
+    parser.add_argument("--update-baseline", action="store_true", help="把本次结果保存为基线")
+    parser.add_argument("--require-baseline", action="store_true", help="没有基线时以非0状态退出 (用于CI)，默认跳过比较")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="允许的延迟/吞吐量变化比例")
+    parser.add_argument("--error-tolerance", type=float, default=0.01, help="允许的错误率增加")
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    processes = []
+    base_url = args.target
+    if base_url is None:
+        base_url, processes = start_servers(args)
+    try:
+        results = asyncio.run(run_load(base_url, weights, args.concurrency, args.duration, args.warmup, args.seed))
+    finally:
+        stop_servers(processes)
+
+    results["config"] = {
+        "concurrency": args.concurrency,
+        "mix": weights,
+        "mock_latency": None if args.target else args.mock_latency,
+        "target": args.target or "local mock",
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+    }
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"基线已更新: {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        if args.require_baseline:
+            print(f"❌ 未找到基线 {args.baseline} (使用 --update-baseline 生成)", file=sys.stderr)
+            return 2
+        print(f"未找到基线 {args.baseline}，跳过比较 (使用 --update-baseline 生成)", file=sys.stderr)
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare_with_baseline(results, baseline, args.tolerance, args.error_tolerance)
+    if regressions:
+        print("❌ 性能回退:", file=sys.stderr)
+        for regression in regressions:
+            print(f"  - {regression}", file=sys.stderr)
+        return 1
+    print("✅ 未发现性能回退", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+路由增强辅助函数的微基准测试 (仿 pytest-benchmark)：对每个辅助函数、完整的
+按代币 / 按路由增强循环以及跨链代币搜索索引，在实际规模的数据上测量每次调用的耗时 (min/median/mean/stddev/ops)，
+并用 tracemalloc 测量峰值内存和结果占用的内存。结果以JSON输出，可与基线比较，
+中位数耗时或峰值内存回退时以非0状态退出。
+
+用法 (在 backend 目录下):
+    python benchmarks/micro_bench.py                          # 运行全部用例
+    python benchmarks/micro_bench.py -k tokens --rounds 50     # 只运行名称包含 tokens 的用例
+    python benchmarks/micro_bench.py --update-baseline         # 把本次结果保存为基线
+    python benchmarks/micro_bench.py --output results.json
+
+与 load_test.py 一样，基线与机器相关，应在同一台机器上生成和比较。
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(BACKEND_DIR, "benchmarks", "micro_baseline.json")
+sys.path.insert(0, BACKEND_DIR)
+
+# 路由模块导入时会打印SDK导入信息，重定向到标准错误，保持标准输出只有JSON结果
+with contextlib.redirect_stdout(sys.stderr):
+    import mock_okx_server  # noqa: E402
+    from routers.quote import (  # noqa: E402
+        enhance_route, estimate_transaction_time, format_fee_info, get_bridge_logo,
+        get_safety_rating, parse_route_steps
+    )
+    from routers.tokens import (  # noqa: E402
+        enhance_token, get_token_logo_url, get_token_type, is_popular_token, rank_and_enhance_tokens
+    )
+    from services.token_index import ChainTokenIndex, TokenSearchIndex  # noqa: E402
+
+# 各辅助函数每轮处理的输入个数，结果按单次调用折算
+HELPER_BATCH = 1000
+TOKEN_LIST_SIZES = [100, 1000, 10000]
+ROUTE_COUNTS = [3, 20]
+# 跨链搜索：每条链的代币数和搜索关键词 (短前缀、符号、名称子串、合约地址前缀)
+SEARCH_TOKENS_PER_CHAIN = 10000
+SEARCH_QUERIES = ["u", "usdc", "tk12", "oken", "0x"]
+
+BRIDGE_NAMES = ["Stargate", "Across", "cBridge", "LayerZero", "Hop Protocol", "Synapse", "Multichain", "Orbiter Finance", "Meson"]
+CHAIN_IDS = ["1", "56", "137", "10", "42161", "43114", "8453", "324"]
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+# ==================== 测试数据 ====================
+
+def make_tokens(count: int, seed: int = 1, missing_logo_ratio: float = 0.3) -> List[Dict[str, Any]]:
+    """
+    生成与 all-tokens 接口相同结构的代币列表 (来自 mock_okx_server，原生代币 + 常见代币 + 长尾代币)，
+    其中 missing_logo_ratio 比例的代币没有 tokenLogoUrl，以覆盖本地Logo映射的分支。
+    路由按 tokenAddress 判断代币类型，这里同时填充该字段。
+    """
+    mock_okx_server.settings.tokens_per_chain = count
+    rng = random.Random(seed)
+    tokens = []
+    for token in mock_okx_server.token_list("1"):
+        token = dict(token, tokenAddress=token["tokenContractAddress"])
+        if rng.random() < missing_logo_ratio:
+            token["tokenLogoUrl"] = ""
+        tokens.append(token)
+    rng.shuffle(tokens)
+    return tokens
+
+
+def make_routes(count: int, seed: int = 1) -> List[Dict[str, Any]]:
+    """ 生成与 cross-chain/quote 接口相同结构的路由列表，桥名称包含有Logo映射和没有映射的情况。 """
+    rng = random.Random(seed)
+    routes = []
+    for i in range(count):
+        from_chain, to_chain = rng.sample(CHAIN_IDS, 2)
+        bridge_name = BRIDGE_NAMES[i % len(BRIDGE_NAMES)]
+        amount = rng.randint(1, 100) * 10 ** 16
+        received = amount * (9950 - 15 * i) // 10000
+        routes.append({
+            "fromChainId": from_chain,
+            "toChainId": to_chain,
+            "fromTokenAmount": str(amount),
+            "fromToken": {"tokenSymbol": "USDC", "decimals": "6", "tokenLogoUrl": "https://static.okx.com/cdn/wallet/logo/usdc.png"},
+            "toToken": {"tokenSymbol": "USDC", "decimals": "6", "tokenLogoUrl": "https://static.okx.com/cdn/wallet/logo/usdc.png"},
+            "routerList": [{
+                "estimateGasFee": str(210000 + 10000 * i),
+                "estimateGasFeeUsd": f"{1.2 + 0.3 * i:.2f}",
+                "estimateTime": str(60 + 120 * (i % 3)),
+                "minimumReceived": str(received * 995 // 1000),
+                "needApprove": i % 2,
+                "router": {"bridgeId": 200 + i, "bridgeName": bridge_name, "crossChainFeeUsd": f"{0.3 + 0.05 * i:.2f}"},
+                "toDexRouterList": [],
+                "fromDexRouterList": [],
+                "toTokenAmount": str(received),
+            }],
+        })
+    return routes
+
+
+def flatten_route(route: Dict[str, Any]) -> Dict[str, Any]:
+    """ 辅助函数接收的是 enhance_route 展开后的路由 (包含 bridgeName 等字段)。 """
+    router = route["routerList"][0]
+    return {
+        **route,
+        "bridgeName": router["router"]["bridgeName"],
+        "fromTokenSymbol": route["fromToken"]["tokenSymbol"],
+        "fromTokenLogo": route["fromToken"]["tokenLogoUrl"],
+        "toTokenSymbol": route["toToken"]["tokenSymbol"],
+        "toTokenLogo": route["toToken"]["tokenLogoUrl"],
+        "estimatedAmount": router["toTokenAmount"],
+    }
+
+
+def cycle(items: List[Any], count: int) -> List[Any]:
+    return [items[i % len(items)] for i in range(count)]
+
+
+# ==================== 用例注册 ====================
+
+class BenchmarkCase:
+    def __init__(self, name: str, group: str, func: Callable[[], Any], per_call: int = 1):
+        self.name = name
+        self.group = group
+        self.func = func
+        # 每次调用 func 处理的输入个数，耗时和内存除以该值得到单次调用的结果
+        self.per_call = per_call
+
+
+CASES: List[BenchmarkCase] = []
+
+
+def bench(name: str, group: str, per_call: int = 1):
+    """ 注册一个用例：被装饰的函数负责准备数据，返回要测量的无参函数。 """
+    def decorator(setup: Callable[[], Callable[[], Any]]):
+        CASES.append(BenchmarkCase(name, group, setup, per_call))
+        return setup
+    return decorator
+
+
+@bench("get_token_logo_url", "helpers", per_call=HELPER_BATCH)
+def bench_get_token_logo_url():
+    symbols = cycle([t["tokenSymbol"] for t in make_tokens(HELPER_BATCH)], HELPER_BATCH)
+    return lambda: [get_token_logo_url(symbol, "") for symbol in symbols]
+
+
+@bench("is_popular_token", "helpers", per_call=HELPER_BATCH)
+def bench_is_popular_token():
+    symbols = cycle([t["tokenSymbol"] for t in make_tokens(HELPER_BATCH)], HELPER_BATCH)
+    return lambda: [is_popular_token(symbol) for symbol in symbols]
+
+
+@bench("get_token_type", "helpers", per_call=HELPER_BATCH)
+def bench_get_token_type():
+    addresses = cycle([t["tokenAddress"] for t in make_tokens(HELPER_BATCH)] + [ZERO_ADDRESS, ""], HELPER_BATCH)
+    return lambda: [get_token_type(address) for address in addresses]
+
+
+@bench("get_bridge_logo", "helpers", per_call=HELPER_BATCH)
+def bench_get_bridge_logo():
+    names = cycle(BRIDGE_NAMES, HELPER_BATCH)
+    return lambda: [get_bridge_logo(name) for name in names]
+
+
+@bench("estimate_transaction_time", "helpers", per_call=HELPER_BATCH)
+def bench_estimate_transaction_time():
+    routes = cycle([flatten_route(r) for r in make_routes(20)], HELPER_BATCH)
+    return lambda: [estimate_transaction_time(route) for route in routes]
+
+
+@bench("get_safety_rating", "helpers", per_call=HELPER_BATCH)
+def bench_get_safety_rating():
+    routes = cycle([flatten_route(r) for r in make_routes(20)], HELPER_BATCH)
+    return lambda: [get_safety_rating(route) for route in routes]
+
+
+@bench("parse_route_steps", "helpers", per_call=HELPER_BATCH)
+def bench_parse_route_steps():
+    routes = cycle([flatten_route(r) for r in make_routes(20)], HELPER_BATCH)
+    return lambda: [parse_route_steps(route) for route in routes]
+
+
+@bench("format_fee_info", "helpers", per_call=HELPER_BATCH)
+def bench_format_fee_info():
+    fees = cycle([
+        {"totalFeeUsd": f"{1.5 + 0.35 * i:.3f}", "gasFeeUsd": f"{1.2 + 0.3 * i:.3f}", "bridgeFeeUsd": f"{0.3 + 0.05 * i:.3f}"}
+        for i in range(20)
+    ] + [{"totalFeeUsd": "0.000", "gasFeeUsd": "0.000", "bridgeFeeUsd": "0.000"}], HELPER_BATCH)
+    return lambda: [format_fee_info(fee) for fee in fees]
+
+
+def _register_token_loops():
+    for size in TOKEN_LIST_SIZES:
+        def enhance_setup(size=size):
+            tokens = make_tokens(size)
+            return lambda: [enhance_token(token, "1") for token in tokens]
+
+        def rank_setup(size=size):
+            # 与 get_tokens_by_chain 相同：按热门程度排序取前100个，再增强
+            tokens = make_tokens(size)
+            return lambda: rank_and_enhance_tokens(tokens, 100, "1")
+
+        bench(f"enhance_tokens[{size}]", "tokens")(enhance_setup)
+        bench(f"rank_and_enhance_tokens[{size}]", "tokens")(rank_setup)
+
+
+def _register_route_loops():
+    for count in ROUTE_COUNTS:
+        def setup(count=count):
+            routes = make_routes(count)
+            return lambda: [enhance_route(route, i) for i, route in enumerate(routes)]
+
+        bench(f"enhance_routes[{count}]", "routes")(setup)
+
+
+def _register_search_cases():
+    @bench(f"token_index_build[{SEARCH_TOKENS_PER_CHAIN}]", "search")
+    def build_setup():
+        tokens = make_tokens(SEARCH_TOKENS_PER_CHAIN)
+        return lambda: ChainTokenIndex("1", tokens, is_popular_token)
+
+    for query in SEARCH_QUERIES:
+        def search_setup(query=query):
+            # 与 search_tokens 相同：所有链、前50个
+            index = TokenSearchIndex(is_popular=is_popular_token)
+            tokens = make_tokens(SEARCH_TOKENS_PER_CHAIN)
+            for chain_id in CHAIN_IDS:
+                index.schedule_update(chain_id, tokens).result()
+            index.shutdown()
+            return lambda: index.search(query, None, 50)
+
+        bench(f"token_index_search[{query}]", "search")(search_setup)
+
+
+_register_token_loops()
+_register_route_loops()
+_register_search_cases()
+
+
+# ==================== 测量 ====================
+
+def calibrate(func: Callable[[], Any], min_time: float) -> int:
+    """ 确定每轮的调用次数，使一轮至少持续 min_time 秒。 """
+    iterations = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time:
+            return iterations
+        iterations = max(iterations * 2, int(iterations * min_time / elapsed) + 1) if elapsed > 0 else iterations * 10
+
+
+def measure_time(func: Callable[[], Any], rounds: int, min_time: float, warmup_rounds: int) -> Dict[str, Any]:
+    """ 多轮计时 (测量期间关闭GC)，返回每次调用的耗时统计 (秒)。 """
+    iterations = calibrate(func, min_time)
+    for _ in range(warmup_rounds):
+        for _ in range(iterations):
+            func()
+
+    samples = []
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                func()
+            samples.append((time.perf_counter() - started) / iterations)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {
+        "rounds": rounds,
+        "iterations": iterations,
+        "min": min(samples),
+        "max": max(samples),
+        "mean": statistics.mean(samples),
+        "median": statistics.median(samples),
+        "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def measure_memory(func: Callable[[], Any]) -> Dict[str, int]:
+    """ 用 tracemalloc 测量一次调用的峰值内存和返回结果仍占用的内存 (字节)。 """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"peak_bytes": peak - before, "retained_bytes": current - before}
+
+
+def run_case(case: BenchmarkCase, rounds: int, min_time: float, warmup_rounds: int, memory: bool) -> Dict[str, Any]:
+    func = case.func()
+    timing = measure_time(func, rounds, min_time, warmup_rounds)
+    us = lambda seconds: round(seconds / case.per_call * 1e6, 4)
+    result = {
+        "group": case.group,
+        "per_call": case.per_call,
+        "rounds": timing["rounds"],
+        "iterations": timing["iterations"],
+        "min_us": us(timing["min"]),
+        "max_us": us(timing["max"]),
+        "mean_us": us(timing["mean"]),
+        "median_us": us(timing["median"]),
+        "stddev_us": us(timing["stddev"]),
+        "ops": round(case.per_call / timing["mean"], 1) if timing["mean"] else None,
+    }
+    if memory:
+        usage = measure_memory(func)
+        result["peak_kb"] = round(usage["peak_bytes"] / 1024, 2)
+        result["retained_kb"] = round(usage["retained_bytes"] / 1024, 2)
+        result["peak_bytes_per_call"] = round(usage["peak_bytes"] / case.per_call, 1)
+    return result
+
+
+def compare_with_baseline(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, memory_tolerance: float) -> List[str]:
+    """
+    与基线比较，返回回退描述列表 (为空表示没有回退)。
+
+    某用例的中位数耗时比基线高出 tolerance 以上，或峰值内存比基线高出 memory_tolerance 以上，视为回退。
+    """
+    regressions = []
+    for name, base in baseline.get("benchmarks", {}).items():
+        current = results["benchmarks"].get(name)
+        if current is None:
+            continue
+        if base.get("median_us") and current["median_us"] > base["median_us"] * (1 + tolerance):
+            regressions.append(f"{name}: median {current['median_us']}us > 基线 {base['median_us']}us (+{tolerance:.0%})")
+        if base.get("peak_kb") and current.get("peak_kb") is not None and current["peak_kb"] > base["peak_kb"] * (1 + memory_tolerance):
+            regressions.append(f"{name}: 峰值内存 {current['peak_kb']}KB > 基线 {base['peak_kb']}KB (+{memory_tolerance:.0%})")
+    return regressions
+
+
+def format_table(benchmarks: Dict[str, Dict[str, Any]]) -> str:
+    """ 按分组输出类似 pytest-benchmark 的表格 (单位：微秒/次)。 """
+    header = f"{'Name (us/call)':<34}{'Min':>11}{'Median':>11}{'Mean':>11}{'StdDev':>11}{'OPS':>14}{'Peak KB':>11}"
+    lines = []
+    for group in dict.fromkeys(b["group"] for b in benchmarks.values()):
+        lines.append(f"\n---- {group} " + "-" * (len(header) - len(group) - 6))
+        lines.append(header)
+        for name, b in benchmarks.items():
+            if b["group"] != group:
+                continue
+            peak = f"{b['peak_kb']:.1f}" if "peak_kb" in b else "-"
+            lines.append(
+                f"{name:<34}{b['min_us']:>11.3f}{b['median_us']:>11.3f}{b['mean_us']:>11.3f}"
+                f"{b['stddev_us']:>11.3f}{b['ops']:>14,.0f}{peak:>11}"
+            )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="路由增强辅助函数的微基准测试")
+    parser.add_argument("-k", "--filter", default=None, help="只运行名称包含该字符串的用例")
+    parser.add_argument("--rounds", type=int, default=20, help="计时轮数")
+    parser.add_argument("--min-time", type=float, default=0.02, help="每轮最少耗时（秒），据此确定每轮调用次数")
+    parser.add_argument("--warmup-rounds", type=int, default=2, help="预热轮数，不计入结果")
+    parser.add_argument("--no-memory", action="store_true", help="不测量内存")
+    parser.add_argument("--output", default=None, help="结果JSON文件，默认只输出到标准输出")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="基线JSON文件")
+    parser.add_argument("--update-baseline", action="store_true", help="把本次结果保存为基线")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="允许的中位数耗时增加比例")
+    parser.add_argument("--memory-tolerance", type=float, default=0.1, help="允许的峰值内存增加比例")
+    args = parser.parse_args()
+
+    cases = [case for case in CASES if not args.filter or args.filter in case.name]
+    if not cases:
+        print(f"没有名称包含 {args.filter!r} 的用例", file=sys.stderr)
+        return 2
+
+    benchmarks = {}
+    for case in cases:
+        print(f"⏱  {case.name} ...", file=sys.stderr)
+        benchmarks[case.name] = run_case(case, args.rounds, args.min_time, args.warmup_rounds, not args.no_memory)
+    print(format_table(benchmarks), file=sys.stderr)
+
+    results = {
+        "benchmarks": benchmarks,
+        "config": {
+            "rounds": args.rounds,
+            "min_time": args.min_time,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+        },
+    }
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"基线已更新: {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"未找到基线 {args.baseline}，跳过比较 (使用 --update-baseline 生成)", file=sys.stderr)
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare_with_baseline(results, baseline, args.tolerance, args.memory_tolerance)
+    if regressions:
+        print("❌ 性能回退:", file=sys.stderr)
+        for regression in regressions:
+            print(f"  - {regression}", file=sys.stderr)
+        return 1
+    print("✅ 未发现性能回退", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,6 +24,10 @@ config = Config(
     passphrase=passphrase
 )
 
+# 可指向本地模拟服务器 (mock_okx_server.py) 离线运行
+if os.getenv('OKX_BASE_API_URL'):
+    config.BASE_API_URL = os.getenv('OKX_BASE_API_URL').rstrip('/')
+
 print(f"Config API Key: {config.API_KEY[:10]}..." if config.API_KEY else "Config API Key: None")
 
 # 创建AssetExplorer
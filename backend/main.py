@@ -4,13 +4,15 @@ OKX Cross-Chain Bridge API Backend
 可复用于其他项目
 """
 
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Depends, Request, Header
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+import logging
 import sys
 import os
-from typing import Dict, Any, List, Optional
+from typing import Dict, Optional
 import uvicorn
+from pydantic import BaseModel, Field
 
 # 加载环境变量
 try:
@@ -18,34 +20,56 @@ try:
     # 优先加载.env.local，然后加载.env
     load_dotenv('.env.local')  # 本地配置优先
     load_dotenv('.env')        # 默认配置
-    print("✅ 环境变量加载成功")
+    dotenv_loaded = True
 except ImportError:
-    print("⚠️  python-dotenv未安装，跳过.env文件加载")
+    dotenv_loaded = False
+
+# 日志配置依赖环境变量 (LOG_LEVEL 等)，需在加载环境变量之后、导入其他模块之前完成
+from services.log import RequestContextMiddleware, configure_logging, get_logging_manager
+
+configure_logging()
+logger = logging.getLogger("main")
+if dotenv_loaded:
+    logger.info("环境变量加载成功")
+else:
+    logger.warning("python-dotenv未安装，跳过.env文件加载")
 
 # 添加项目根目录到Python路径，以便导入OKX SDK
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 try:
     from okx_crosschain_sdk import (
-        Config,
-        AssetExplorer,
-        Quoter,
-        TransactionBuilder,
-        StatusTracker,
-        OnChainGateway,
-        APIError
+        APIError,
+        RateLimitExceeded,
+        CircuitOpenError
     )
 except ImportError as e:
-    print(f"警告: 无法导入OKX SDK: {e}")
-    print("请确保okx_crosschain_sdk目录在项目根目录下")
+    logger.error("无法导入OKX SDK: %s，请确保okx_crosschain_sdk目录在项目根目录下", e)
+
+from services.json_response import CodecJSONResponse
+from services.executor import ExecutorRejected, route_slot
+from services.registry import SDKRegistry
 
-# 创建FastAPI应用
+# 应用生命周期：启动时创建所有请求共享的SDK客户端，关闭时释放连接池和线程池
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 路由模块在文件末尾导入，lifespan 运行时已经可用
+    app.state.sdk = SDKRegistry.from_env(token_popularity=tokens.is_popular_token)
+    app.state.sdk.start()
+    try:
+        yield
+    finally:
+        await app.state.sdk.aclose()
+
+# 创建FastAPI应用 (响应使用SDK的JSON编解码器，安装了 orjson 时更快)
 app = FastAPI(
     title="OKX Cross-Chain Bridge API",
     description="基于OKX DEX API的通用跨链桥后端服务",
     version="1.0.0",
+    default_response_class=CodecJSONResponse,
     docs_url="/docs",  # Swagger UI
-    redoc_url="/redoc"  # ReDoc
+    redoc_url="/redoc",  # ReDoc
+    lifespan=lifespan
 )
 
 # 配置CORS - 允许前端访问
@@ -55,50 +79,60 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
 
-# 全局配置和SDK实例
-config = Config()  # 使用默认配置，不需要API Key的功能
-asset_explorer = AssetExplorer(config)
-quoter = Quoter(config)
-transaction_builder = TransactionBuilder(config)
-status_tracker = StatusTracker(config)
-
-# 如果有API Key配置，可以初始化OnChainGateway
-onchain_gateway = None
-try:
-    # 从环境变量读取API Key（可选）
-    api_key = os.getenv("OKX_API_KEY")
-    secret_key = os.getenv("OKX_SECRET_KEY")
-    passphrase = os.getenv("OKX_PASSPHRASE")
-    
-    if api_key and secret_key and passphrase:
-        auth_config = Config(api_key=api_key, secret_key=secret_key, passphrase=passphrase)
-        onchain_gateway = OnChainGateway(auth_config)
-        print("✅ OnChainGateway 初始化成功 (API Key已配置)")
-    else:
-        print("ℹ️  OnChainGateway 未初始化 (未配置API Key)")
-except Exception as e:
-    print(f"⚠️  OnChainGateway 初始化失败: {e}")
+# 请求ID和按路由的日志采样 (见 services/log.py)
+app.add_middleware(RequestContextMiddleware)
 
 # 错误处理
+@app.exception_handler(RateLimitExceeded)
+async def rate_limit_error_handler(request, exc: RateLimitExceeded):
+    # 客户端限流拒绝：提示调用方稍后重试，而不是当作上游错误
+    retry_after = max(1, int(exc.retry_after or 1))
+    return CodecJSONResponse(
+        status_code=429,
+        content={"error": "请求过于频繁", "detail": str(exc)},
+        headers={"Retry-After": str(retry_after)}
+    )
+
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_error_handler(request, exc: CircuitOpenError):
+    # 上游熔断：快速返回503，而不是让请求挂起直到超时
+    retry_after = max(1, int(exc.retry_after or 1))
+    return CodecJSONResponse(
+        status_code=503,
+        content={"error": "上游服务暂不可用", "detail": str(exc)},
+        headers={"Retry-After": str(retry_after)}
+    )
+
+@app.exception_handler(ExecutorRejected)
+async def executor_rejected_handler(request, exc: ExecutorRejected):
+    # 路由并发已满且排队过多：快速返回503，让调用方稍后重试
+    retry_after = max(1, int(exc.retry_after or 1))
+    return CodecJSONResponse(
+        status_code=503,
+        content={"error": "服务繁忙", "detail": str(exc)},
+        headers={"Retry-After": str(retry_after)}
+    )
+
 @app.exception_handler(APIError)
 async def api_error_handler(request, exc: APIError):
-    return JSONResponse(
+    return CodecJSONResponse(
         status_code=400,
         content={"error": "API调用失败", "detail": str(exc)}
     )
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc: Exception):
-    return JSONResponse(
+    return CodecJSONResponse(
         status_code=500,
         content={"error": "服务器内部错误", "detail": str(exc)}
     )
 
 # 根路径 - 健康检查
 @app.get("/")
-async def root():
+async def root(request: Request):
     return {
         "message": "OKX Cross-Chain Bridge API",
         "version": "1.0.0",
@@ -108,7 +142,7 @@ async def root():
             "quoter": True,
             "transaction_builder": True,
             "status_tracker": True,
-            "onchain_gateway": onchain_gateway is not None
+            "onchain_gateway": request.app.state.sdk.onchain_gateway is not None
         }
     }
 
@@ -117,15 +151,69 @@ async def root():
 async def health_check():
     return {"status": "healthy", "timestamp": "2024-01-01T00:00:00Z"}
 
+@app.get("/health/upstream")
+async def upstream_health(request: Request):
+    # 上游调用和后台组件的运行统计，各项含义见对应组件的 get_stats
+    sdk = request.app.state.sdk
+    config = sdk.config
+    credential_pool = config.credential_pool
+    return {
+        # SDK (应用配置实际使用的组件，关闭时为 null): 缓存与请求合并、熔断器 (按 endpoint/链)、
+        # API Key 健康状态、按 endpoint 的计数和耗时
+        "response_cache": config.response_cache.get_stats() if config.response_cache is not None else None,
+        "single_flight": config.single_flight.get_stats() if config.single_flight is not None else None,
+        "circuit_breakers": config.circuit_breakers.get_states(),
+        "credentials": credential_pool.get_stats() if credential_pool is not None else [],
+        "http_metrics": sdk.http_metrics.get_stats(),
+        # 各路由的并发、排队深度和拒绝次数
+        "executor": sdk.executor.get_stats(),
+        # 后台维护的索引和监视器
+        "token_index": sdk.token_index.get_stats(),
+        "token_equivalence": sdk.token_equivalence.get_stats(),
+        "chain_registry": sdk.chain_registry.get_stats(),
+        "reachability": sdk.reachability.get_stats(),
+        "status_watcher": sdk.status_watcher.get_stats()
+    }
+
+# 运行时查看和调整日志级别、采样率：需要设置 LOG_ADMIN_TOKEN，并在请求头 X-Admin-Token 中提供
+def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    admin_token = os.getenv("LOG_ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=403, detail="未配置 LOG_ADMIN_TOKEN，日志管理接口已关闭")
+    if x_admin_token != admin_token:
+        raise HTTPException(status_code=401, detail="X-Admin-Token 无效")
+
+class LoggingUpdate(BaseModel):
+    levels: Dict[str, str] = Field(default_factory=dict, description="logger名称到级别，如 {\"routers.quote\": \"DEBUG\"}")
+    sample_rates: Dict[str, float] = Field(default_factory=dict, description="路由到采样率 (0~1)，如 {\"quote\": 0.1}")
+    sample_rate: Optional[float] = Field(None, description="未单独配置的路由的采样率")
+
+@app.get("/admin/logging", dependencies=[Depends(require_admin_token)])
+async def get_logging_state():
+    return get_logging_manager().get_state()
+
+@app.post("/admin/logging", dependencies=[Depends(require_admin_token)])
+async def update_logging(update: LoggingUpdate):
+    manager = get_logging_manager()
+    try:
+        manager.set_levels(update.levels)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"无效的日志级别: {e}")
+    manager.set_sample_rates(update.sample_rates, default=update.sample_rate)
+    logger.warning("日志配置已更新", extra={"update": update.model_dump(exclude_none=True)})
+    return manager.get_state()
+
 # 导入路由模块
 from routers import chains, tokens, quote, transaction, status
 
-# 注册路由
-app.include_router(chains.router, prefix="/api/v1/chains", tags=["链信息"])
-app.include_router(tokens.router, prefix="/api/v1/tokens", tags=["代币信息"])
-app.include_router(quote.router, prefix="/api/v1/quote", tags=["询价"])
-app.include_router(transaction.router, prefix="/api/v1/transaction", tags=["交易"])
-app.include_router(status.router, prefix="/api/v1/status", tags=["状态查询"])
+# 注册路由 (每个路由有独立的并发名额，见 services/executor.py)
+app.include_router(chains.router, prefix="/api/v1/chains", tags=["链信息"], dependencies=[Depends(route_slot("chains"))])
+app.include_router(tokens.router, prefix="/api/v1/tokens", tags=["代币信息"], dependencies=[Depends(route_slot("tokens"))])
+app.include_router(quote.router, prefix="/api/v1/quote", tags=["询价"], dependencies=[Depends(route_slot("quote"))])
+app.include_router(transaction.router, prefix="/api/v1/transaction", tags=["交易"], dependencies=[Depends(route_slot("transaction"))])
+app.include_router(status.router, prefix="/api/v1/status", tags=["状态查询"], dependencies=[Depends(route_slot("status"))])
+# 状态推送是长连接，不占用并发名额 (上游查询由状态监视器统一进行)
+app.include_router(status.stream_router, prefix="/api/v1/status", tags=["状态查询"])
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+本地模拟OKX DEX API服务器，用于离线开发、压测和CI
+
+实现后端用到的跨链、聚合器和交易上链接口，响应格式与OKX一致。
+可配置延迟、错误率和429注入，运行时也可以通过 /mock/config 调整。
+
+用法:
+    python mock_okx_server.py --port 8081 --latency 0.05 --jitter 0.02 --error-rate 0.01 --rate-limit-rate 0.02
+    # 让后端使用模拟服务器
+    OKX_BASE_API_URL=http://127.0.0.1:8081 python start.py
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+# 模拟的链: (chainIndex, 名称, 原生代币符号)
+CHAINS = [
+    ("1", "Ethereum", "ETH"),
+    ("56", "BNB Chain", "BNB"),
+    ("137", "Polygon", "MATIC"),
+    ("10", "Optimism", "ETH"),
+    ("42161", "Arbitrum One", "ETH"),
+    ("43114", "Avalanche C", "AVAX"),
+    ("8453", "Base", "ETH"),
+    ("324", "zkSync Era", "ETH"),
+    ("59144", "Linea", "ETH"),
+    ("534352", "Scroll", "ETH"),
+]
+
+# 每条链上都有的常见代币
+COMMON_TOKENS = ["USDC", "USDT", "DAI", "WETH", "WBTC", "LINK", "UNI", "AAVE"]
+
+BRIDGES = [
+    {"bridgeId": 211, "bridgeName": "Stargate", "crossChainFeeUsd": "0.35"},
+    {"bridgeId": 235, "bridgeName": "Across", "crossChainFeeUsd": "0.52"},
+    {"bridgeId": 299, "bridgeName": "cBridge", "crossChainFeeUsd": "0.80"},
+]
+
+NATIVE_TOKEN_ADDRESS = "0xeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeee"
+
+
+class MockSettings:
+    """ 模拟服务器的可调参数，可通过命令行、环境变量或 POST /mock/config 修改。 """
+
+    def __init__(self):
+        # 每个请求的基础延迟和随机抖动（秒）
+        self.latency = float(os.getenv("MOCK_OKX_LATENCY", "0.05"))
+        self.jitter = float(os.getenv("MOCK_OKX_JITTER", "0.02"))
+        # 返回 500 的概率
+        self.error_rate = float(os.getenv("MOCK_OKX_ERROR_RATE", "0"))
+        # 返回 429 的概率
+        self.rate_limit_rate = float(os.getenv("MOCK_OKX_RATE_LIMIT_RATE", "0"))
+        # 429 响应的 Retry-After（秒）
+        self.retry_after = float(os.getenv("MOCK_OKX_RETRY_AFTER", "1"))
+        # 每条链 all-tokens 接口返回的代币数
+        self.tokens_per_chain = int(os.getenv("MOCK_OKX_TOKENS_PER_CHAIN", "500"))
+        # 按路径片段覆盖延迟，例如 {"/cross-chain/quote": 0.3}
+        self.endpoint_latency: Dict[str, float] = {}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(vars(self))
+
+    def update(self, values: Dict[str, Any]):
+        for key, value in values.items():
+            if key in vars(self):
+                setattr(self, key, type(getattr(self, key))(value))
+
+
+settings = MockSettings()
+stats: Dict[str, int] = {}
+_token_lists: Dict[tuple, List[Dict[str, Any]]] = {}
+
+app = FastAPI(title="Mock OKX DEX API", docs_url=None, redoc_url=None)
+
+
+def _address(*parts) -> str:
+    """ 根据参数生成稳定的伪地址。 """
+    return "0x" + hashlib.sha1(":".join(str(p) for p in parts).encode()).hexdigest()[:40]
+
+
+def _ok(data: Any) -> Dict[str, Any]:
+    return {"code": "0", "msg": "", "data": data}
+
+
+def _chain(chain_index: str) -> Optional[tuple]:
+    for chain in CHAINS:
+        if chain[0] == chain_index:
+            return chain
+    return None
+
+
+def token_list(chain_index: str) -> List[Dict[str, Any]]:
+    """ 某条链的代币列表 (原生代币 + 常见代币 + 长尾代币)，同样的参数总是返回同样的结果。 """
+    key = (chain_index, settings.tokens_per_chain)
+    if key not in _token_lists:
+        chain = _chain(chain_index)
+        if chain is None:
+            _token_lists[key] = []
+        else:
+            symbols = [chain[2]] + COMMON_TOKENS
+            symbols += [f"TK{i}" for i in range(max(0, settings.tokens_per_chain - len(symbols)))]
+            _token_lists[key] = [
+                {
+                    "decimals": "18" if symbol not in ("USDC", "USDT") else "6",
+                    "tokenContractAddress": NATIVE_TOKEN_ADDRESS if i == 0 else _address(chain_index, symbol),
+                    "tokenLogoUrl": f"https://static.okx.com/cdn/wallet/logo/{symbol.lower()}.png",
+                    "tokenName": f"{symbol} Token",
+                    "tokenSymbol": symbol,
+                }
+                for i, symbol in enumerate(symbols[:settings.tokens_per_chain])
+            ]
+    return _token_lists[key]
+
+
+def _find_token(chain_index: str, address: str) -> Dict[str, Any]:
+    address = (address or "").lower()
+    for token in token_list(chain_index):
+        if token["tokenContractAddress"].lower() == address:
+            return token
+    return {"tokenSymbol": "UNKNOWN", "decimals": "18", "tokenContractAddress": address, "tokenLogoUrl": ""}
+
+
+@app.middleware("http")
+async def inject_faults(request: Request, call_next):
+    """ 按配置注入延迟、429 和 500，/mock/* 管理接口不受影响。 """
+    path = request.url.path
+    if path.startswith("/mock"):
+        return await call_next(request)
+
+    stats[path] = stats.get(path, 0) + 1
+    latency = settings.latency
+    for fragment, value in settings.endpoint_latency.items():
+        if fragment in path:
+            latency = value
+    delay = max(0.0, latency + random.uniform(-settings.jitter, settings.jitter))
+    if delay:
+        await asyncio.sleep(delay)
+
+    roll = random.random()
+    if roll < settings.rate_limit_rate:
+        stats["injected_429"] = stats.get("injected_429", 0) + 1
+        return JSONResponse(
+            {"code": "50011", "msg": "Too Many Requests", "data": []},
+            status_code=429,
+            headers={"Retry-After": f"{settings.retry_after:g}"}
+        )
+    if roll < settings.rate_limit_rate + settings.error_rate:
+        stats["injected_500"] = stats.get("injected_500", 0) + 1
+        return JSONResponse({"code": "50001", "msg": "Service temporarily unavailable", "data": []}, status_code=500)
+    return await call_next(request)
+
+
+# ---- 跨链接口 /api/v5/dex/cross-chain ----
+
+@app.get("/api/v5/dex/cross-chain/supported/chain")
+async def supported_chain(chainIndex: Optional[str] = None):
+    chains = [
+        {"chainId": index, "chainIndex": index, "chainName": name, "dexTokenApproveAddress": _address("approve", index)}
+        for index, name, _ in CHAINS
+        if chainIndex is None or index == chainIndex
+    ]
+    return _ok(chains)
+
+
+@app.get("/api/v5/dex/cross-chain/supported/tokens")
+async def supported_tokens(chainIndex: Optional[str] = None):
+    indexes = [chainIndex] if chainIndex else [chain[0] for chain in CHAINS]
+    return _ok([dict(token, chainId=index) for index in indexes for token in token_list(index)[:len(COMMON_TOKENS) + 1]])
+
+
+@app.get("/api/v5/dex/cross-chain/configured-token-list")
+async def configured_token_list(chainIndex: Optional[str] = None):
+    return await supported_tokens(chainIndex)
+
+
+@app.get("/api/v5/dex/cross-chain/supported/bridges")
+async def supported_bridges(chainIndex: Optional[str] = None):
+    chain_ids = [chain[0] for chain in CHAINS]
+    return _ok([
+        dict(bridge, supportedChains=chain_ids, logoUrl=f"https://static.okx.com/cdn/bridge/{bridge['bridgeName'].lower()}.png")
+        for bridge in BRIDGES
+    ])
+
+
+@app.get("/api/v5/dex/cross-chain/quote")
+async def quote(
+    fromChainId: str,
+    toChainId: str,
+    fromTokenAddress: str,
+    toTokenAddress: str,
+    amount: str,
+    slippage: Optional[str] = None,
+    sort: Optional[str] = None
+):
+    if _chain(fromChainId) is None or _chain(toChainId) is None:
+        return _ok([])
+    from_token = _find_token(fromChainId, fromTokenAddress)
+    to_token = _find_token(toChainId, toTokenAddress)
+    amount_value = int(amount) if amount.isdigit() else 0
+    routers = []
+    for i, bridge in enumerate(BRIDGES):
+        received = amount_value * (9950 - 15 * i) // 10000
+        routers.append({
+            "estimateGasFee": str(210000 + 10000 * i),
+            "estimateGasFeeUsd": f"{1.2 + 0.3 * i:.2f}",
+            "estimateTime": str(60 + 120 * i),
+            "minimumReceived": str(received * 995 // 1000),
+            "needApprove": 0 if fromTokenAddress.lower() == NATIVE_TOKEN_ADDRESS else 1,
+            "router": dict(bridge),
+            "toDexRouterList": [],
+            "fromDexRouterList": [],
+            "toTokenAmount": str(received),
+        })
+    return _ok([{
+        "fromChainId": fromChainId,
+        "toChainId": toChainId,
+        "fromToken": from_token,
+        "toToken": to_token,
+        "fromTokenAmount": amount,
+        "routerList": routers,
+    }])
+
+
+async def _request_params(request: Request) -> Dict[str, Any]:
+    """ 合并查询参数和JSON请求体 (OKX文档为GET，SDK以POST发送路由对象，两者都支持)。 """
+    params: Dict[str, Any] = dict(request.query_params)
+    if request.method == "POST":
+        try:
+            body = await request.json()
+        except ValueError:
+            body = None
+        if isinstance(body, dict):
+            params.update(body)
+    return params
+
+
+@app.api_route("/api/v5/dex/cross-chain/approve-transaction", methods=["GET", "POST"])
+async def approve_transaction(request: Request):
+    params = await _request_params(request)
+    chain_id = params.get("chainId") or params.get("fromChainId")
+    return _ok([{
+        "data": "0x095ea7b3" + "0" * 128,
+        "dexContractAddress": _address("approve", chain_id),
+        "gasLimit": "60000",
+        "gasPrice": "12000000000",
+    }])
+
+
+@app.api_route("/api/v5/dex/cross-chain/build-tx", methods=["GET", "POST"])
+async def build_tx(request: Request):
+    params = await _request_params(request)
+    amount = str(params.get("amount") or params.get("fromTokenAmount") or "0")
+    tx_id = _address("tx", params.get("fromChainId"), params.get("userWalletAddress"), time.time_ns())[:34]
+    return _ok([{
+        "fromTokenAmount": amount,
+        "toTokenAmount": amount,
+        "minimumReceived": amount,
+        "router": dict(BRIDGES[0]),
+        "tx": {
+            "data": "0x" + "ab" * 64,
+            "from": params.get("userWalletAddress", ""),
+            "to": _address("router", params.get("fromChainId")),
+            "value": "0",
+            "gasLimit": "500000",
+            "gasPrice": "12000000000",
+        },
+        "txId": tx_id,
+    }])
+
+
+@app.get("/api/v5/dex/cross-chain/status")
+async def status(hash: Optional[str] = None, txId: Optional[str] = None, chainId: Optional[str] = None):
+    tx = txId or hash or ""
+    # 根据交易ID稳定地分配状态，便于压测覆盖不同分支
+    states = ["SUCCESS", "PENDING", "SUCCESS", "FROM_SUCCESS", "FAILURE"]
+    state = states[int(hashlib.sha1(tx.encode()).hexdigest(), 16) % len(states)]
+    return _ok([{
+        "txId": tx,
+        "fromChainId": chainId or "1",
+        "toChainId": "56",
+        "fromTxHash": "0x" + hashlib.sha256(tx.encode()).hexdigest(),
+        "toTxHash": "0x" + hashlib.sha256(("to" + tx).encode()).hexdigest() if state == "SUCCESS" else "",
+        "bridgeHash": "",
+        "status": state,
+        "detailStatus": state,
+        "state": state.lower(),
+        "sourceChainGasfee": "0.0012",
+        "destinationChainGasfee": "0.0003",
+        "crossChainFee": {"symbol": "USDC", "address": "", "amount": "0.35"},
+    }])
+
+
+# ---- 聚合器接口 /api/v5/dex/aggregator ----
+
+@app.get("/api/v5/dex/aggregator/all-tokens")
+async def all_tokens(chainIndex: Optional[str] = None):
+    if chainIndex and _chain(chainIndex) is None:
+        # 与线上接口一致：不支持的链返回业务错误
+        return {"code": "51000", "msg": "Parameter chainId error", "data": []}
+    indexes = [chainIndex] if chainIndex else [chain[0] for chain in CHAINS]
+    return _ok([token for index in indexes for token in token_list(index)])
+
+
+# ---- 交易上链接口 /api/v5/dex/pre-transaction, /api/v5/dex/post-transaction ----
+
+@app.get("/api/v5/dex/pre-transaction/supported/chain")
+async def pre_transaction_supported_chain():
+    return _ok([{"chainIndex": index, "name": name, "logoUrl": "", "shortName": symbol} for index, name, symbol in CHAINS])
+
+
+@app.get("/api/v5/dex/pre-transaction/gas-price")
+async def gas_price(chainIndex: str):
+    return _ok([{
+        "normal": "12000000000",
+        "min": "10000000000",
+        "max": "20000000000",
+        "supporteip1559": True,
+        "eip1559Protocol": {
+            "suggestBaseFee": "11000000000",
+            "baseFee": "11000000000",
+            "proposePriorityFee": "1000000000",
+            "safePriorityFee": "500000000",
+            "fastPriorityFee": "2000000000",
+        },
+    }])
+
+
+@app.post("/api/v5/dex/pre-transaction/gas-limit")
+async def gas_limit(request: Request):
+    return _ok([{"gasLimit": "65000"}])
+
+
+@app.post("/api/v5/dex/pre-transaction/broadcast-transaction")
+async def broadcast_transaction(request: Request):
+    body = await request.body()
+    return _ok([{"orderId": _address("order", body)[:26], "txHash": "0x" + hashlib.sha256(body).hexdigest()}])
+
+
+@app.get("/api/v5/dex/post-transaction/orders")
+async def orders(address: str, chainIndex: str, cursor: Optional[str] = None):
+    return _ok([{"cursor": "", "orders": [{
+        "chainIndex": chainIndex,
+        "address": address,
+        "orderId": _address("order", address)[:26],
+        "txStatus": "2",
+        "txHash": "0x" + hashlib.sha256(address.encode()).hexdigest(),
+    }]}])
+
+
+# ---- 管理接口 ----
+
+@app.get("/mock/config")
+async def get_mock_config():
+    return settings.to_dict()
+
+
+@app.post("/mock/config")
+async def update_mock_config(values: Dict[str, Any]):
+    """ 运行时调整延迟、错误率和429注入，例如 {"latency": 0.2, "rate_limit_rate": 0.1}。 """
+    settings.update(values)
+    return settings.to_dict()
+
+
+@app.get("/mock/stats")
+async def get_mock_stats():
+    """ 各路径的请求数和注入的错误数。 """
+    return dict(stats)
+
+
+@app.post("/mock/reset")
+async def reset_mock_stats():
+    stats.clear()
+    return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地模拟OKX DEX API服务器")
+    parser.add_argument("--host", default=os.getenv("MOCK_OKX_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("MOCK_OKX_PORT", "8081")))
+    parser.add_argument("--latency", type=float, default=settings.latency, help="基础延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=settings.jitter, help="随机抖动（秒）")
+    parser.add_argument("--error-rate", type=float, default=settings.error_rate, help="返回500的概率")
+    parser.add_argument("--rate-limit-rate", type=float, default=settings.rate_limit_rate, help="返回429的概率")
+    parser.add_argument("--retry-after", type=float, default=settings.retry_after, help="429响应的Retry-After（秒）")
+    parser.add_argument("--tokens-per-chain", type=int, default=settings.tokens_per_chain, help="每条链的代币数")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子，便于复现错误注入")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    settings.update({
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+        "rate_limit_rate": args.rate_limit_rate,
+        "retry_after": args.retry_after,
+        "tokens_per_chain": args.tokens_per_chain,
+    })
+    print(f"🧪 模拟OKX API: http://{args.host}:{args.port} ({settings.to_dict()})")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,263 +2,106 @@
 链信息相关API路由
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import List, Dict, Any
+import logging
 import sys
 import os
 
-# 加载环境变量
-try:
-    from dotenv import load_dotenv
-    load_dotenv('.env.local')
-    load_dotenv('.env')
-except ImportError:
-    pass
-
 # 添加项目根目录到Python路径
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
 try:
-    from okx_crosschain_sdk import AssetExplorer, Config, APIError
+    from okx_crosschain_sdk import AsyncAssetExplorer, APIError
+    from services.registry import get_registry
 except ImportError:
-    AssetExplorer = None
-    Config = None
+    AsyncAssetExplorer = None
+    get_registry = None
     APIError = Exception
 
+from services.chain_registry import CHAIN_PRIORITY, STATIC_CHAIN_INFO, ChainRegistry, enhance_chain
+from services.reachability import ReachabilityMatrix
+
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
-# 静态链信息映射（使用支持CORS的图片源）
-STATIC_CHAIN_INFO = {
-    "1": {
-        "name": "Ethereum",
-        "shortName": "ETH",
-        "logoUrl": "https://assets.coingecko.com/coins/images/279/small/ethereum.png",
-        "category": "Layer 1",
-        "ecosystem": "Ethereum"
-    },
-    "56": {
-        "name": "BNB Chain", 
-        "shortName": "BNB",
-        "logoUrl": "https://assets.coingecko.com/coins/images/825/small/bnb-icon2_2x.png",
-        "category": "Layer 1",
-        "ecosystem": "BNB Chain"
-    },
-    "137": {
-        "name": "Polygon",
-        "shortName": "MATIC", 
-        "logoUrl": "https://assets.coingecko.com/coins/images/4713/small/matic-token-icon.png",
-        "category": "Layer 2",
-        "ecosystem": "Polygon"
-    },
-    "10": {
-        "name": "Optimism",
-        "shortName": "OP",
-        "logoUrl": "https://assets.coingecko.com/coins/images/25244/small/Optimism.png",
-        "category": "Layer 2", 
-        "ecosystem": "Optimism"
-    },
-    "42161": {
-        "name": "Arbitrum",
-        "shortName": "ARB",
-        "logoUrl": "https://assets.coingecko.com/coins/images/16547/small/photo_2023-03-29_21.47.00.jpeg",
-        "category": "Layer 2",
-        "ecosystem": "Arbitrum"
-    },
-    "43114": {
-        "name": "Avalanche",
-        "shortName": "AVAX",
-        "logoUrl": "https://assets.coingecko.com/coins/images/12559/small/Avalanche_Circle_RedWhite_Trans.png",
-        "category": "Layer 1",
-        "ecosystem": "Avalanche"
-    },
-    "8453": {
-        "name": "Base",
-        "shortName": "BASE",
-        "logoUrl": "https://assets.coingecko.com/coins/images/7598/small/wrapped_bitcoin_wbtc.png",
-        "category": "Layer 2",
-        "ecosystem": "Base"
-    },
-    "501": {
-        "name": "Solana",
-        "shortName": "SOL", 
-        "logoUrl": "https://assets.coingecko.com/coins/images/4128/small/solana.png",
-        "category": "Layer 1",
-        "ecosystem": "Solana"
-    },
-    "324": {
-        "name": "zkSync Era",
-        "shortName": "zkSync",
-        "logoUrl": "https://assets.coingecko.com/coins/images/24091/small/zkSync_era.png",
-        "category": "Layer 2",
-        "ecosystem": "zkSync"
-    },
-    "59144": {
-        "name": "Linea",
-        "shortName": "Linea",
-        "logoUrl": "https://assets.coingecko.com/coins/images/30724/small/linea.png",
-        "category": "Layer 2",
-        "ecosystem": "Linea"
-    },
-    "534352": {
-        "name": "Scroll",
-        "shortName": "Scroll", 
-        "logoUrl": "https://assets.coingecko.com/coins/images/26998/small/scroll.png",
-        "category": "Layer 2",
-        "ecosystem": "Scroll"
+# 跨链可达矩阵还不可用时 (启动后第一次构建未完成，或桥列表不含 supportedChains) 使用的常见跨链路径
+COMMON_CROSS_CHAIN_PATHS = {
+    "1": {  # Ethereum
+        "targets": ["56", "137", "10", "42161", "43114", "8453", "324", "59144", "534352"],
+        "popular_tokens": ["USDT", "USDC", "ETH", "WETH", "DAI", "LINK", "UNI"]
     },
-    "195": {
-        "name": "TRON",
-        "shortName": "TRX",
-        "logoUrl": "https://assets.coingecko.com/coins/images/1094/small/tron-logo.png",
-        "category": "Layer 1",
-        "ecosystem": "TRON"
+    "56": {  # BNB Chain  
+        "targets": ["1", "137", "10", "42161", "43114", "8453", "324", "196"],
+        "popular_tokens": ["USDT", "USDC", "BNB", "WBNB", "ETH", "BTCB"]
     },
-    "637": {
-        "name": "Aptos",
-        "shortName": "APT",
-        "logoUrl": "https://assets.coingecko.com/coins/images/26455/small/aptos_round.png",
-        "category": "Layer 1", 
-        "ecosystem": "Aptos"
+    "137": {  # Polygon
+        "targets": ["1", "56", "10", "42161", "43114", "8453", "324"],
+        "popular_tokens": ["USDT", "USDC", "MATIC", "WMATIC", "ETH", "WETH"]
     },
-    "784": {
-        "name": "SUI",
-        "shortName": "SUI",
-        "logoUrl": "https://assets.coingecko.com/coins/images/26375/small/sui_asset.jpeg",
-        "category": "Layer 1",
-        "ecosystem": "SUI"
+    "10": {  # Optimism
+        "targets": ["1", "56", "137", "42161", "8453", "324"],
+        "popular_tokens": ["USDT", "USDC", "ETH", "WETH", "OP"]
     },
-    "196": {
-        "name": "X Layer",
-        "shortName": "X Layer",
-        "logoUrl": "https://assets.coingecko.com/coins/images/4713/small/matic-token-icon.png", # 使用Polygon logo作为占位
-        "category": "Layer 2",
-        "ecosystem": "X Layer"
+    "42161": {  # Arbitrum
+        "targets": ["1", "56", "137", "10", "8453", "324", "43114"],
+        "popular_tokens": ["USDT", "USDC", "ETH", "WETH", "ARB"]
     },
-    "169": {
-        "name": "Manta Pacific",
-        "shortName": "Manta",
-        "logoUrl": "https://assets.coingecko.com/coins/images/28286/small/manta.png",
-        "category": "Layer 2",
-        "ecosystem": "Manta"
+    "43114": {  # Avalanche
+        "targets": ["1", "56", "137", "10", "42161", "8453"],
+        "popular_tokens": ["USDT", "USDC", "AVAX", "WAVAX", "ETH"]
     },
-    "1088": {
-        "name": "Metis",
-        "shortName": "METIS",
-        "logoUrl": "https://assets.coingecko.com/coins/images/15595/small/metis.PNG",
-        "category": "Layer 2",
-        "ecosystem": "Metis"
+    "8453": {  # Base
+        "targets": ["1", "56", "137", "10", "42161", "324"],
+        "popular_tokens": ["USDT", "USDC", "ETH", "WETH"]
     },
-    "4200": {
-        "name": "Merlin",
-        "shortName": "Merlin",
-        "logoUrl": "data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMzIiIGhlaWdodD0iMzIiIHZpZXdCb3g9IjAgMCAzMiAzMiIgZmlsbD0ibm9uZSIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KPGNpcmNsZSBjeD0iMTYiIGN5PSIxNiIgcj0iMTYiIGZpbGw9IiNGRjY5MDAiLz4KPHRleHQgeD0iMTYiIHk9IjIwIiB0ZXh0LWFuY2hvcj0ibWlkZGxlIiBmaWxsPSJ3aGl0ZSIgZm9udC1zaXplPSIxNCIgZm9udC13ZWlnaHQ9ImJvbGQiPk08L3RleHQ+Cjwvc3ZnPgo=",
-        "category": "Layer 2",
-        "ecosystem": "Merlin"
+    "324": {  # zkSync Era
+        "targets": ["1", "56", "137", "10", "42161", "8453"],
+        "popular_tokens": ["USDT", "USDC", "ETH", "WETH"]
     },
-    "34443": {
-        "name": "Mode",
-        "shortName": "Mode", 
-        "logoUrl": "data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMzIiIGhlaWdodD0iMzIiIHZpZXdCb3g9IjAgMCAzMiAzMiIgZmlsbD0ibm9uZSIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KPGNpcmNsZSBjeD0iMTYiIGN5PSIxNiIgcj0iMTYiIGZpbGw9IiMwMEZGMDAiLz4KPHRleHQgeD0iMTYiIHk9IjIwIiB0ZXh0LWFuY2hvcj0ibWlkZGxlIiBmaWxsPSJ3aGl0ZSIgZm9udC1zaXplPSIxNCIgZm9udC13ZWlnaHQ9ImJvbGQiPk08L3RleHQ+Cjwvc3ZnPgo=",
-        "category": "Layer 2",
-        "ecosystem": "Mode"
-    },
-    "33139": {
-        "name": "ApeChain",
-        "shortName": "APE",
-        "logoUrl": "https://assets.coingecko.com/coins/images/18876/small/apecoin.jpg",
-        "category": "Layer 2",
-        "ecosystem": "ApeChain"
-    },
-    "146": {
-        "name": "Sonic Mainnet",
-        "shortName": "Sonic",
-        "logoUrl": "data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMzIiIGhlaWdodD0iMzIiIHZpZXdCb3g9IjAgMCAzMiAzMiIgZmlsbD0ibm9uZSIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KPGNpcmNsZSBjeD0iMTYiIGN5PSIxNiIgcj0iMTYiIGZpbGw9IiMwMDdCRkYiLz4KPHRleHQgeD0iMTYiIHk9IjIwIiB0ZXh0LWFuY2hvcj0ibWlkZGxlIiBmaWxsPSJ3aGl0ZSIgZm9udC1zaXplPSIxNCIgZm9udC13ZWlnaHQ9ImJvbGQiPlM8L3RleHQ+Cjwvc3ZnPgo=",
-        "category": "Layer 1",
-        "ecosystem": "Sonic"
+    "501": {  # Solana
+        "targets": ["1", "56", "137"],
+        "popular_tokens": ["USDT", "USDC", "SOL"]
     }
 }
 
-# 链优先级排序
-CHAIN_PRIORITY = {
-    "1": 1,    # Ethereum - 最高优先级
-    "56": 2,   # BNB Chain
-    "137": 3,  # Polygon
-    "10": 4,   # Optimism
-    "42161": 5, # Arbitrum
-    "43114": 6, # Avalanche
-    "8453": 7,  # Base
-    "501": 8,   # Solana
-    "324": 9,   # zkSync Era
-    "59144": 10, # Linea
-    "534352": 11, # Scroll
-    "195": 12,  # TRON
-}
+# 标记为热门的目标链
+POPULAR_TARGET_CHAINS = {"56", "137", "10", "42161", "43114", "8453"}
 
-# 依赖注入：获取AssetExplorer实例
-def get_asset_explorer():
-    if AssetExplorer is None:
+# 依赖注入：获取AssetExplorer实例 (异步版本，不阻塞事件循环)
+def get_asset_explorer(request: Request):
+    if AsyncAssetExplorer is None:
         raise HTTPException(status_code=500, detail="OKX SDK未正确导入")
     
-    # 从环境变量获取API Key配置
-    api_key = os.getenv('OKX_API_KEY')
-    secret_key = os.getenv('OKX_SECRET_KEY')
-    passphrase = os.getenv('OKX_PASSPHRASE')
-    
-    # 如果有API Key配置，则使用认证配置，否则使用默认配置
-    if api_key and secret_key and passphrase:
-        print("✅ 使用API Key认证配置")
-        config = Config(
-            api_key=api_key,
-            secret_key=secret_key,
-            passphrase=passphrase
-        )
-    else:
-        print("⚠️ 使用默认配置（无API Key认证）")
-        config = Config()
-    
-    return AssetExplorer(config)
+    # 应用启动时创建的共享实例 (见 services/registry.py)
+    return get_registry(request).asset_explorer
+
+# 依赖注入：获取链信息注册表 (合并了静态信息，后台定期刷新)
+def get_chain_registry(request: Request) -> ChainRegistry:
+    if get_registry is None:
+        raise HTTPException(status_code=500, detail="OKX SDK未正确导入")
+    return get_registry(request).chain_registry
+
+# 依赖注入：获取跨链可达矩阵 (由桥列表和各链支持跨链的代币列表维护)
+def get_reachability(request: Request) -> ReachabilityMatrix:
+    if get_registry is None:
+        raise HTTPException(status_code=500, detail="OKX SDK未正确导入")
+    return get_registry(request).reachability
 
 @router.get("/", summary="获取支持的链列表")
 async def get_chains(
-    asset_explorer: AssetExplorer = Depends(get_asset_explorer)
+    asset_explorer: AsyncAssetExplorer = Depends(get_asset_explorer),
+    chain_registry: ChainRegistry = Depends(get_chain_registry)
 ) -> List[Dict[str, Any]]:
     """
     获取OKX DEX支持的区块链网络列表
     
-    返回增强的链信息，包含静态logo、名称等
+    返回增强的链信息，包含静态logo、名称等 (按优先级排序，由链信息注册表预先合并)
     """
     try:
-        # 获取跨链API支持的链
-        cross_chain_chains = asset_explorer.get_supported_chains()
-        
-        # 合并静态信息
-        enhanced_chains = []
-        for chain in cross_chain_chains:
-            chain_index = chain.get('chainId') or chain.get('chainIndex')
-            static_info = STATIC_CHAIN_INFO.get(chain_index, {})
-            
-            # 构建增强的链信息
-            enhanced_chain = {
-                "chainIndex": chain_index,
-                "chainName": static_info.get('name', chain.get('chainName', f"Chain {chain_index}")),
-                "shortName": static_info.get('shortName', chain.get('chainName', '')),
-                "logoUrl": static_info.get('logoUrl'),
-                "category": static_info.get('category', 'Layer 1'),
-                "ecosystem": static_info.get('ecosystem', 'Unknown'),
-                # 保留原始信息
-                "originalChainInfo": chain,
-                # 添加一些有用的元数据
-                "isMainnet": True,
-                "isTestnet": False,
-                "priority": CHAIN_PRIORITY.get(chain_index, 999)
-            }
-            
-            enhanced_chains.append(enhanced_chain)
-        
-        # 按优先级排序
-        enhanced_chains.sort(key=lambda x: x.get('priority', 999))
-        
-        return enhanced_chains
+        # 只有注册表还没有加载过时才需要等待上游
+        await chain_registry.ensure_loaded(asset_explorer.get_supported_chains)
+        return chain_registry.get_chains()
         
     except APIError as e:
         raise HTTPException(status_code=400, detail=f"获取链列表失败: {str(e)}")
@@ -268,7 +111,8 @@ async def get_chains(
 @router.get("/{chain_id}", summary="获取特定链的详细信息")
 async def get_chain_info(
     chain_id: str,
-    asset_explorer: AssetExplorer = Depends(get_asset_explorer)
+    asset_explorer: AsyncAssetExplorer = Depends(get_asset_explorer),
+    chain_registry: ChainRegistry = Depends(get_chain_registry)
 ) -> Dict[str, Any]:
     """
     获取特定区块链的详细信息
@@ -277,15 +121,8 @@ async def get_chain_info(
     - chain_id: 链ID或chainIndex
     """
     try:
-        # 获取所有链信息
-        chains = await get_chains(asset_explorer)
-        
-        # 查找指定的链
-        target_chain = None
-        for chain in chains:
-            if chain.get('chainIndex') == chain_id:
-                target_chain = chain
-                break
+        await chain_registry.ensure_loaded(asset_explorer.get_supported_chains)
+        target_chain = chain_registry.get_chain(chain_id)
                 
         if not target_chain:
             raise HTTPException(
@@ -312,105 +149,122 @@ async def get_chain_info(
 @router.get("/{from_chain_id}/supported-targets", summary="获取指定源链支持的跨链目标链")
 async def get_supported_target_chains(
     from_chain_id: str,
-    asset_explorer: AssetExplorer = Depends(get_asset_explorer)
+    chain_registry: ChainRegistry = Depends(get_chain_registry),
+    reachability: ReachabilityMatrix = Depends(get_reachability)
 ) -> Dict[str, Any]:
     """
     获取指定源链支持跨链的目标链列表
     
-    使用静态配置的常见跨链路径，避免频繁调用OKX API导致429错误
-    实际支持情况以询价API结果为准
+    由跨链可达矩阵 (各桥支持的链 × 各链支持跨链的代币，后台定期刷新) 直接返回，不访问上游；
+    矩阵还不可用时使用静态配置的常见跨链路径。实际支持情况以询价API结果为准
     """
     try:
-        # 静态配置的常见跨链路径（基于OKX实际支持情况）
-        COMMON_CROSS_CHAIN_PATHS = {
-            "1": {  # Ethereum
-                "targets": ["56", "137", "10", "42161", "43114", "8453", "324", "59144", "534352"],
-                "popular_tokens": ["USDT", "USDC", "ETH", "WETH", "DAI", "LINK", "UNI"]
-            },
-            "56": {  # BNB Chain  
-                "targets": ["1", "137", "10", "42161", "43114", "8453", "324", "196"],
-                "popular_tokens": ["USDT", "USDC", "BNB", "WBNB", "ETH", "BTCB"]
-            },
-            "137": {  # Polygon
-                "targets": ["1", "56", "10", "42161", "43114", "8453", "324"],
-                "popular_tokens": ["USDT", "USDC", "MATIC", "WMATIC", "ETH", "WETH"]
-            },
-            "10": {  # Optimism
-                "targets": ["1", "56", "137", "42161", "8453", "324"],
-                "popular_tokens": ["USDT", "USDC", "ETH", "WETH", "OP"]
-            },
-            "42161": {  # Arbitrum
-                "targets": ["1", "56", "137", "10", "8453", "324", "43114"],
-                "popular_tokens": ["USDT", "USDC", "ETH", "WETH", "ARB"]
-            },
-            "43114": {  # Avalanche
-                "targets": ["1", "56", "137", "10", "42161", "8453"],
-                "popular_tokens": ["USDT", "USDC", "AVAX", "WAVAX", "ETH"]
-            },
-            "8453": {  # Base
-                "targets": ["1", "56", "137", "10", "42161", "324"],
-                "popular_tokens": ["USDT", "USDC", "ETH", "WETH"]
-            },
-            "324": {  # zkSync Era
-                "targets": ["1", "56", "137", "10", "42161", "8453"],
-                "popular_tokens": ["USDT", "USDC", "ETH", "WETH"]
-            },
-            "501": {  # Solana
-                "targets": ["1", "56", "137"],
-                "popular_tokens": ["USDT", "USDC", "SOL"]
-            }
-        }
-        
-        # 获取源链配置
-        source_config = COMMON_CROSS_CHAIN_PATHS.get(from_chain_id)
-        if not source_config:
-            return {
-                "success": True,
-                "data": {
-                    "fromChainId": from_chain_id,
-                    "supportedTargetChains": [],
-                    "totalTargets": 0,
-                    "message": f"链 {from_chain_id} 暂无预配置的跨链路径"
-                }
-            }
+        if await reachability.wait_ready():
+            return build_reachable_targets(from_chain_id, chain_registry, reachability)
+        return build_static_targets(from_chain_id)
         
-        # 构建目标链信息
-        supported_targets = []
-        for target_chain_id in source_config["targets"]:
-            static_info = STATIC_CHAIN_INFO.get(target_chain_id, {})
-            
-            target_info = {
-                "chainIndex": target_chain_id,
-                "chainName": static_info.get('name', f"Chain {target_chain_id}"),
-                "shortName": static_info.get('shortName', ''),
-                "logoUrl": static_info.get('logoUrl'),
-                "category": static_info.get('category', 'Layer 1'),
-                "supportedTokens": source_config["popular_tokens"],
-                "tokenCount": len(source_config["popular_tokens"]),
-                "priority": CHAIN_PRIORITY.get(target_chain_id, 999),
-                "isPopular": target_chain_id in ["56", "137", "10", "42161", "43114", "8453"]
+    except Exception as e:
+        logger.exception("获取支持的目标链失败: %s", e)
+        raise HTTPException(status_code=500, detail=f"服务器错误: {str(e)}")
+
+def build_reachable_targets(from_chain_id: str, chain_registry: ChainRegistry, reachability: ReachabilityMatrix) -> Dict[str, Any]:
+    """ 根据跨链可达矩阵构建目标链列表。 """
+    targets = reachability.get_targets(from_chain_id)
+    if not targets:
+        return {
+            "success": True,
+            "data": {
+                "fromChainId": from_chain_id,
+                "supportedTargetChains": [],
+                "totalTargets": 0,
+                "message": f"链 {from_chain_id} 暂无可用的跨链路径",
+                "source": "reachability"
             }
-            
-            supported_targets.append(target_info)
-        
-        # 按优先级排序
-        supported_targets.sort(key=lambda x: x.get('priority', 999))
-        
+        }
+    
+    supported_targets = []
+    reachable_tokens = set()
+    for target_chain_id, reach in targets.items():
+        chain = chain_registry.get_chain(target_chain_id) or enhance_chain({"chainIndex": target_chain_id})
+        reachable_tokens.update(reach["tokens"])
+        supported_targets.append({
+            "chainIndex": target_chain_id,
+            "chainName": chain["chainName"],
+            "shortName": chain["shortName"],
+            "logoUrl": chain["logoUrl"],
+            "category": chain["category"],
+            "supportedTokens": reach["tokens"],
+            "tokenCount": len(reach["tokens"]),
+            "bridges": reach["bridges"],
+            "priority": chain["priority"],
+            "isPopular": target_chain_id in POPULAR_TARGET_CHAINS
+        })
+    supported_targets.sort(key=lambda x: x.get('priority', 999))
+    
+    source_tokens = reachability.get_chain_assets(from_chain_id)
+    return {
+        "success": True,
+        "data": {
+            "fromChainId": from_chain_id,
+            "supportedTargetChains": supported_targets,
+            "totalTargets": len(supported_targets),
+            "sourceTokenCount": len(source_tokens),
+            "commonTokens": [token for token in source_tokens if token in reachable_tokens],
+            "note": "根据各桥支持的链和各链支持跨链的代币计算，实际支持情况以询价API结果为准",
+            "source": "reachability"
+        }
+    }
+
+def build_static_targets(from_chain_id: str) -> Dict[str, Any]:
+    """ 根据静态配置的常见跨链路径构建目标链列表。 """
+    # 获取源链配置
+    source_config = COMMON_CROSS_CHAIN_PATHS.get(from_chain_id)
+    if not source_config:
         return {
             "success": True,
             "data": {
                 "fromChainId": from_chain_id,
-                "supportedTargetChains": supported_targets,
-                "totalTargets": len(supported_targets),
-                "sourceTokenCount": len(source_config["popular_tokens"]),
-                "commonTokens": source_config["popular_tokens"],
-                "note": "实际支持情况以询价API结果为准，此列表基于常见跨链路径配置"
+                "supportedTargetChains": [],
+                "totalTargets": 0,
+                "message": f"链 {from_chain_id} 暂无预配置的跨链路径",
+                "source": "static"
             }
         }
+    
+    # 构建目标链信息
+    supported_targets = []
+    for target_chain_id in source_config["targets"]:
+        static_info = STATIC_CHAIN_INFO.get(target_chain_id, {})
         
-    except Exception as e:
-        print(f"获取支持的目标链失败: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"服务器错误: {str(e)}")
+        target_info = {
+            "chainIndex": target_chain_id,
+            "chainName": static_info.get('name', f"Chain {target_chain_id}"),
+            "shortName": static_info.get('shortName', ''),
+            "logoUrl": static_info.get('logoUrl'),
+            "category": static_info.get('category', 'Layer 1'),
+            "supportedTokens": source_config["popular_tokens"],
+            "tokenCount": len(source_config["popular_tokens"]),
+            "priority": CHAIN_PRIORITY.get(target_chain_id, 999),
+            "isPopular": target_chain_id in POPULAR_TARGET_CHAINS
+        }
+        
+        supported_targets.append(target_info)
+    
+    # 按优先级排序
+    supported_targets.sort(key=lambda x: x.get('priority', 999))
+    
+    return {
+        "success": True,
+        "data": {
+            "fromChainId": from_chain_id,
+            "supportedTargetChains": supported_targets,
+            "totalTargets": len(supported_targets),
+            "sourceTokenCount": len(source_config["popular_tokens"]),
+            "commonTokens": source_config["popular_tokens"],
+            "note": "实际支持情况以询价API结果为准，此列表基于常见跨链路径配置",
+            "source": "static"
+        }
+    }
 
 # 辅助函数
 def get_chain_features(chain_index: str) -> List[str]:
@@ -2,33 +2,30 @@
 询价相关API路由 - 跨链桥核心功能
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
+import logging
 import sys
 import os
 
-# 加载环境变量
-try:
-    from dotenv import load_dotenv
-    load_dotenv('.env.local')
-    load_dotenv('.env')
-except ImportError:
-    pass
+from services.log import log_enabled
+from services.reachability import ReachabilityMatrix
 
 # 添加项目根目录到Python路径
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
 try:
-    from okx_crosschain_sdk import Quoter, Config, APIError
-    print("✅ 询价模块: OKX SDK 导入成功")
+    from okx_crosschain_sdk import AsyncQuoter, APIError
+    from services.registry import get_registry
 except ImportError as e:
-    print(f"❌ 询价模块: OKX SDK 导入失败: {e}")
-    Quoter = None
-    Config = None
+    logging.getLogger(__name__).error("询价模块: OKX SDK 导入失败: %s", e)
+    AsyncQuoter = None
+    get_registry = None
     APIError = Exception
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # 常见桥的Logo映射
 BRIDGE_LOGOS = {
@@ -64,34 +61,24 @@ class QuoteResponse(BaseModel):
     data: List[Dict[str, Any]]
     message: str = ""
 
-# 依赖注入：获取Quoter实例
-def get_quoter():
-    if Quoter is None:
+# 依赖注入：获取Quoter实例 (异步版本，不阻塞事件循环)
+def get_quoter(request: Request):
+    if AsyncQuoter is None:
         raise HTTPException(status_code=500, detail="OKX SDK未正确导入")
     
-    # 从环境变量获取API Key配置
-    api_key = os.getenv('OKX_API_KEY')
-    secret_key = os.getenv('OKX_SECRET_KEY')
-    passphrase = os.getenv('OKX_PASSPHRASE')
-    
-    # 如果有API Key配置，则使用认证配置，否则使用默认配置
-    if api_key and secret_key and passphrase:
-        print("✅ 使用API Key认证配置")
-        config = Config(
-            api_key=api_key,
-            secret_key=secret_key,
-            passphrase=passphrase
-        )
-    else:
-        print("⚠️ 使用默认配置（无API Key认证）")
-        config = Config()
-    
-    return Quoter(config)
+    # 应用启动时创建的共享实例，询价对冲策略 (OKX_QUOTE_HEDGING) 也在其中配置 (见 services/registry.py)
+    return get_registry(request).quoter
+
+# 依赖注入：获取跨链可达矩阵 (由桥列表和各链支持跨链的代币列表维护)
+def get_reachability(request: Request) -> ReachabilityMatrix:
+    if get_registry is None:
+        raise HTTPException(status_code=500, detail="OKX SDK未正确导入")
+    return get_registry(request).reachability
 
 @router.post("/", summary="获取跨链交易报价", response_model=QuoteResponse)
 async def get_quote(
     request: QuoteRequest,
-    quoter: Quoter = Depends(get_quoter)
+    quoter: AsyncQuoter = Depends(get_quoter)
 ) -> QuoteResponse:
     """
     获取跨链交易报价
@@ -100,17 +87,20 @@ async def get_quote(
     前端可以根据需要进行排序。
     """
     try:
-        print(f"📝 收到报价请求:")
-        print(f"  - 源链: {request.from_chain_id}")
-        print(f"  - 目标链: {request.to_chain_id}")
-        print(f"  - 源代币: {request.from_token_address}")
-        print(f"  - 目标代币: {request.to_token_address}")
-        print(f"  - 数量: {request.amount}")
-        print(f"  - 用户地址: {request.user_address}")
-        print(f"  - 滑点: {request.slippage}")
+        # 调试日志默认关闭，关闭或请求未被采样时不构造日志字段
+        if log_enabled(logger):
+            logger.debug("收到报价请求", extra={
+                "from_chain": request.from_chain_id,
+                "to_chain": request.to_chain_id,
+                "from_token": request.from_token_address,
+                "to_token": request.to_token_address,
+                "amount": request.amount,
+                "user_address": request.user_address,
+                "slippage": request.slippage
+            })
         
         # 获取所有路由 - 使用默认排序（最优路由）
-        routes = quoter.get_quote(
+        routes = await quoter.get_quote(
             from_chain_id=request.from_chain_id,
             to_chain_id=request.to_chain_id,
             from_token_address=request.from_token_address,
@@ -128,96 +118,10 @@ async def get_quote(
                 message="未找到可用的跨链路径，请检查参数或稍后重试"
             )
         
-        print(f"🎯 获取到 {len(routes)} 条路径")
+        logger.debug("获取到 %d 条路径", len(routes))
         
         # 增强路由信息，添加前端需要的字段
-        enhanced_routes = []
-        for i, route in enumerate(routes):
-            # 从routerList中提取桥接信息
-            router_list = route.get('routerList', [])
-            bridge_name = "Unknown Bridge"
-            bridge_id = "unknown"
-            estimated_amount = "0"
-            minimum_received = "0"
-            total_fee_usd = "0.000"
-            gas_fee_usd = "0.000"
-            bridge_fee_usd = "0.000"
-            bridge_logo_url = None
-            
-            if router_list and len(router_list) > 0:
-                first_router = router_list[0]
-                # 从router对象中获取桥信息
-                router_info = first_router.get('router', {})
-                bridge_name = router_info.get('bridgeName', 'Unknown Bridge')
-                bridge_id = router_info.get('bridgeId', 'unknown')
-                
-                # 尝试获取桥logo（如果API返回了的话）
-                bridge_logo_url = router_info.get('bridgeLogoUrl') or get_bridge_logo(bridge_name)
-                
-                # 获取金额信息
-                estimated_amount = first_router.get('toTokenAmount', '0')
-                minimum_received = first_router.get('minimumReceived', estimated_amount)
-                
-                # 计算费用 - 保留3位小数
-                cross_chain_fee_usd = float(router_info.get('crossChainFeeUsd', '0'))
-                estimate_gas_fee_usd = float(first_router.get('estimateGasFeeUsd', '0'))
-                bridge_fee_usd = f"{cross_chain_fee_usd:.3f}"
-                gas_fee_usd = f"{estimate_gas_fee_usd:.3f}"
-                total_fee_usd = f"{cross_chain_fee_usd + estimate_gas_fee_usd:.3f}"
-            
-            # 从toToken中获取代币信息
-            to_token = route.get('toToken', {})
-            to_token_symbol = to_token.get('tokenSymbol', 'Unknown')
-            to_token_decimals = to_token.get('decimals', '18')
-            to_token_logo = to_token.get('tokenLogoUrl', '')
-            
-            # 从fromToken中获取代币信息
-            from_token = route.get('fromToken', {})
-            from_token_symbol = from_token.get('tokenSymbol', 'Unknown')
-            from_token_logo = from_token.get('tokenLogoUrl', '')
-            
-            enhanced_route = {
-                # 原始数据
-                **route,
-                # 映射到前端期望的字段
-                "bridgeName": bridge_name,
-                "bridgeId": bridge_id,
-                "bridgeLogoUrl": bridge_logo_url,
-                "toTokenAmount": estimated_amount,
-                "estimatedAmount": estimated_amount,
-                "minimumReceived": minimum_received,
-                "totalFeeUsd": total_fee_usd,
-                "gasFeeUsd": gas_fee_usd,
-                "bridgeFeeUsd": bridge_fee_usd,
-                "priceImpact": "0",  # OKX API可能不直接提供
-                # 添加路由排名
-                "rank": i + 1,
-                "isRecommended": i == 0,  # 第一个为推荐路由
-                # 添加预计时间信息
-                "estimatedTime": estimate_transaction_time(route),
-                # 添加安全评级
-                "safetyRating": get_safety_rating(route),
-                # 格式化费用信息
-                "formattedFees": format_fee_info({
-                    "totalFeeUsd": total_fee_usd,
-                    "gasFeeUsd": gas_fee_usd,
-                    "bridgeFeeUsd": bridge_fee_usd
-                }),
-                # 添加路由步骤详情 - 包含真实的代币logo
-                "routeSteps": parse_route_steps({
-                    **route,
-                    "bridgeName": bridge_name,
-                    "fromTokenSymbol": from_token_symbol,
-                    "fromTokenLogo": from_token_logo,
-                    "toTokenSymbol": to_token_symbol,
-                    "toTokenLogo": to_token_logo,
-                    "estimatedAmount": estimated_amount
-                }),
-                # 添加代币logo信息
-                "fromTokenLogo": from_token_logo,
-                "toTokenLogo": to_token_logo
-            }
-            enhanced_routes.append(enhanced_route)
+        enhanced_routes = [enhance_route(route, i) for i, route in enumerate(routes)]
         
         return QuoteResponse(
             success=True,
@@ -226,15 +130,102 @@ async def get_quote(
         )
         
     except APIError as e:
-        print(f"❌ API错误: {e}")
+        logger.warning("获取报价失败: %s", e)
         raise HTTPException(status_code=400, detail=f"获取报价失败: {str(e)}")
     except ValueError as e:
-        print(f"❌ 参数错误: {e}")
+        logger.warning("报价参数错误: %s", e)
         raise HTTPException(status_code=400, detail=f"参数错误: {str(e)}")
     except Exception as e:
-        print(f"❌ 未知错误: {e}")
+        logger.exception("获取报价时发生未知错误: %s", e)
         raise HTTPException(status_code=500, detail=f"服务器错误: {str(e)}")
 
+def enhance_route(route: Dict[str, Any], index: int) -> Dict[str, Any]:
+    """ 把OKX返回的一条路由转换为前端需要的格式 (桥信息、费用、预计时间、安全评级和步骤)，index 为排名序号 (从0开始)。 """
+    # 从routerList中提取桥接信息
+    router_list = route.get('routerList', [])
+    bridge_name = "Unknown Bridge"
+    bridge_id = "unknown"
+    estimated_amount = "0"
+    minimum_received = "0"
+    total_fee_usd = "0.000"
+    gas_fee_usd = "0.000"
+    bridge_fee_usd = "0.000"
+    bridge_logo_url = None
+    
+    if router_list and len(router_list) > 0:
+        first_router = router_list[0]
+        # 从router对象中获取桥信息
+        router_info = first_router.get('router', {})
+        bridge_name = router_info.get('bridgeName', 'Unknown Bridge')
+        bridge_id = router_info.get('bridgeId', 'unknown')
+        
+        # 尝试获取桥logo（如果API返回了的话）
+        bridge_logo_url = router_info.get('bridgeLogoUrl') or get_bridge_logo(bridge_name)
+        
+        # 获取金额信息
+        estimated_amount = first_router.get('toTokenAmount', '0')
+        minimum_received = first_router.get('minimumReceived', estimated_amount)
+        
+        # 计算费用 - 保留3位小数
+        cross_chain_fee_usd = float(router_info.get('crossChainFeeUsd', '0'))
+        estimate_gas_fee_usd = float(first_router.get('estimateGasFeeUsd', '0'))
+        bridge_fee_usd = f"{cross_chain_fee_usd:.3f}"
+        gas_fee_usd = f"{estimate_gas_fee_usd:.3f}"
+        total_fee_usd = f"{cross_chain_fee_usd + estimate_gas_fee_usd:.3f}"
+    
+    # 从toToken中获取代币信息
+    to_token = route.get('toToken', {})
+    to_token_symbol = to_token.get('tokenSymbol', 'Unknown')
+    to_token_decimals = to_token.get('decimals', '18')
+    to_token_logo = to_token.get('tokenLogoUrl', '')
+    
+    # 从fromToken中获取代币信息
+    from_token = route.get('fromToken', {})
+    from_token_symbol = from_token.get('tokenSymbol', 'Unknown')
+    from_token_logo = from_token.get('tokenLogoUrl', '')
+    
+    return {
+        # 原始数据
+        **route,
+        # 映射到前端期望的字段
+        "bridgeName": bridge_name,
+        "bridgeId": bridge_id,
+        "bridgeLogoUrl": bridge_logo_url,
+        "toTokenAmount": estimated_amount,
+        "estimatedAmount": estimated_amount,
+        "minimumReceived": minimum_received,
+        "totalFeeUsd": total_fee_usd,
+        "gasFeeUsd": gas_fee_usd,
+        "bridgeFeeUsd": bridge_fee_usd,
+        "priceImpact": "0",  # OKX API可能不直接提供
+        # 添加路由排名
+        "rank": index + 1,
+        "isRecommended": index == 0,  # 第一个为推荐路由
+        # 添加预计时间信息
+        "estimatedTime": estimate_transaction_time(route),
+        # 添加安全评级
+        "safetyRating": get_safety_rating(route),
+        # 格式化费用信息
+        "formattedFees": format_fee_info({
+            "totalFeeUsd": total_fee_usd,
+            "gasFeeUsd": gas_fee_usd,
+            "bridgeFeeUsd": bridge_fee_usd
+        }),
+        # 添加路由步骤详情 - 包含真实的代币logo
+        "routeSteps": parse_route_steps({
+            **route,
+            "bridgeName": bridge_name,
+            "fromTokenSymbol": from_token_symbol,
+            "fromTokenLogo": from_token_logo,
+            "toTokenSymbol": to_token_symbol,
+            "toTokenLogo": to_token_logo,
+            "estimatedAmount": estimated_amount
+        }),
+        # 添加代币logo信息
+        "fromTokenLogo": from_token_logo,
+        "toTokenLogo": to_token_logo
+    }
+
 # 辅助函数：获取桥logo
 def get_bridge_logo(bridge_name: str) -> str | None:
     """根据桥名称获取logo URL，如果没有则返回None"""
@@ -339,16 +330,25 @@ async def estimate_time(
 
 @router.get("/supported-pairs", summary="获取支持的交易对")
 async def get_supported_pairs(
-    quoter: Quoter = Depends(get_quoter)
+    reachability: ReachabilityMatrix = Depends(get_reachability)
 ) -> Dict[str, Any]:
     """
     获取支持的跨链交易对
     
-    返回所有支持的源链->目标链组合
+    返回所有支持的源链->目标链组合，由跨链可达矩阵直接返回 (不访问上游)，矩阵还不可用时返回常见的组合
     """
     try:
-        # 这里可以调用SDK获取支持的链，然后组合出所有可能的交易对
-        # 由于OKX API可能没有直接的接口，我们返回常见的组合
+        if await reachability.wait_ready():
+            pairs = [
+                {**pair, "popular": is_popular_pair(pair["from"], pair["to"])}
+                for pair in reachability.get_pairs()
+            ]
+            return {
+                "supportedPairs": pairs,
+                "totalPairs": len(pairs),
+                "note": "根据各桥支持的链和各链支持跨链的代币计算，实际支持的交易对以询价结果为准",
+                "source": "reachability"
+            }
         
         common_pairs = [
             {"from": "1", "to": "56", "popular": True},    # ETH -> BSC
@@ -364,12 +364,19 @@ async def get_supported_pairs(
         return {
             "supportedPairs": common_pairs,
             "totalPairs": len(common_pairs),
-            "note": "实际支持的交易对以询价结果为准"
+            "note": "实际支持的交易对以询价结果为准",
+            "source": "static"
         }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"获取交易对失败: {str(e)}")
 
+# 热门交易对：以太坊与这些链之间的跨链
+POPULAR_PAIR_CHAINS = {"56", "137", "10", "42161"}
+
+def is_popular_pair(from_chain: str, to_chain: str) -> bool:
+    return (from_chain == "1" and to_chain in POPULAR_PAIR_CHAINS) or (to_chain == "1" and from_chain in POPULAR_PAIR_CHAINS)
+
 # 辅助函数：预估交易时间
 def estimate_transaction_time(route: Dict[str, Any]) -> Dict[str, Any]:
     """根据路由信息预估交易时间"""
@@ -2,8 +2,12 @@
 交易状态查询相关API路由
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict, Any, List
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Dict, Any, List, Optional
+import asyncio
+import json
 import sys
 import os
 
@@ -11,101 +15,264 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
 try:
-    from okx_crosschain_sdk import StatusTracker, Config, APIError
+    from okx_crosschain_sdk import AsyncStatusTracker, APIError
+    from okx_crosschain_sdk.status_tracker import BATCH_NOT_FOUND
+    from services.registry import get_registry
 except ImportError:
-    StatusTracker = None
-    Config = None
+    AsyncStatusTracker = None
+    BATCH_NOT_FOUND = None
+    get_registry = None
     APIError = Exception
 
+from services.status_watcher import EVENT_END, EVENT_STATUS, StatusWatcher
+
+try:
+    from okx_crosschain_sdk.codec import get_default_codec
+except ImportError:
+    get_default_codec = None
+
 router = APIRouter()
+# 状态推送 (SSE) 是长连接，单独注册，不占用 status 路由的并发名额 (见 main.py)
+stream_router = APIRouter()
+
+# SSE 连接上没有事件时发送心跳的间隔（秒），避免代理断开空闲连接
+SSE_HEARTBEAT_INTERVAL = 15.0
+
+# 一次批量查询最多的交易数。单笔查询受客户端限流约束 (默认每个 API Key 5 次/秒)，
+# 单个 Key 时 500 个交易约需 100 秒，在 MAX_BATCH_TIMEOUT 之内
+MAX_BATCH_SIZE = 500
+# 批量查询截止时间（秒）的下限和上限，未指定时按需要查询的交易数和限流速率估算
+DEFAULT_BATCH_TIMEOUT = 30.0
+MAX_BATCH_TIMEOUT = 120.0
+
+class BatchStatusRequest(BaseModel):
+    tx_ids: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE, description="交易ID列表")
+    timeout: Optional[float] = Field(
+        None, gt=0, le=MAX_BATCH_TIMEOUT,
+        description="整批查询的截止时间（秒），默认按交易数和限流速率估算，超时未完成的交易返回 error"
+    )
 
-# 依赖注入：获取StatusTracker实例
-def get_status_tracker():
-    if StatusTracker is None:
+class WatchRequest(BaseModel):
+    tx_ids: List[str] = Field(..., min_length=1, max_length=100, description="需要后台监视的交易ID列表")
+
+# 依赖注入：获取StatusTracker实例 (异步版本，不阻塞事件循环)
+def get_status_tracker(request: Request):
+    if AsyncStatusTracker is None:
+        raise HTTPException(status_code=500, detail="OKX SDK未正确导入")
+    return get_registry(request).status_tracker
+
+# 依赖注入：获取交易状态监视器 (后台自适应轮询，向订阅者推送状态变化)
+def get_status_watcher(request: Request) -> StatusWatcher:
+    if get_registry is None:
         raise HTTPException(status_code=500, detail="OKX SDK未正确导入")
-    return StatusTracker(Config())
+    return get_registry(request).status_watcher
+
+def enhance_status(tx_id: str, status_info: Dict[str, Any]) -> Dict[str, Any]:
+    """ 在上游返回的状态上添加描述、进度、下一步操作、预计完成时间和区块浏览器链接。 """
+    return {
+        **status_info,
+        "txId": tx_id,
+        "statusDescription": get_status_description(status_info.get("state", "")),
+        "progressPercentage": get_progress_percentage(status_info.get("state", "")),
+        "nextSteps": get_next_steps(status_info.get("state", "")),
+        "estimatedCompletion": get_estimated_completion(status_info),
+        "explorerLinks": get_explorer_links(status_info)
+    }
 
 @router.get("/{tx_id}", summary="查询交易状态")
 async def get_transaction_status(
     tx_id: str,
-    status_tracker: StatusTracker = Depends(get_status_tracker)
+    status_tracker: AsyncStatusTracker = Depends(get_status_tracker),
+    status_watcher: StatusWatcher = Depends(get_status_watcher)
 ) -> Dict[str, Any]:
     """
     查询跨链交易的执行状态
     
+    交易已被状态监视器监视 (通过 POST /watch 或订阅 /events) 时直接返回监视器最近一次查询到的状态，
+    否则查询上游一次。普通查询不会开始监视，避免一次查询带来持续的后台轮询占用状态查询的限流配额
+    
     参数:
     - tx_id: OKX内部交易ID (从构建交易接口获得)
     """
     try:
-        # 调用SDK查询交易状态
-        status_info = status_tracker.get_transaction_status(tx_id=tx_id)
+        status_info = status_watcher.get_status(tx_id)
+        if status_info is None:
+            # 调用SDK查询交易状态
+            status_info = await status_tracker.get_transaction_status(tx_id=tx_id)
+            
+            if not status_info:
+                raise HTTPException(status_code=404, detail=f"未找到交易ID为 {tx_id} 的交易")
         
-        if not status_info:
-            raise HTTPException(status_code=404, detail=f"未找到交易ID为 {tx_id} 的交易")
-        
-        # 增强状态信息
-        enhanced_status = {
-            **status_info,
-            "txId": tx_id,
-            "statusDescription": get_status_description(status_info.get("state", "")),
-            "progressPercentage": get_progress_percentage(status_info.get("state", "")),
-            "nextSteps": get_next_steps(status_info.get("state", "")),
-            "estimatedCompletion": get_estimated_completion(status_info),
-            "explorerLinks": get_explorer_links(status_info)
-        }
-        
-        return enhanced_status
+        return enhance_status(tx_id, status_info)
         
+    except HTTPException:
+        raise
     except APIError as e:
         raise HTTPException(status_code=400, detail=f"查询交易状态失败: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"服务器错误: {str(e)}")
 
+@router.post("/watch", summary="后台监视交易状态")
+async def watch_transactions(
+    body: WatchRequest,
+    status_watcher: StatusWatcher = Depends(get_status_watcher)
+) -> Dict[str, Any]:
+    """
+    让状态监视器在后台轮询这些交易 (例如交易刚提交时)，之后的状态查询和订阅直接使用监视器的结果
+    
+    返回每笔交易是否在监视 (同时监视的交易数达到上限时为 false)
+    """
+    watching = {tx_id: status_watcher.watch(tx_id) for tx_id in dict.fromkeys(body.tx_ids)}
+    return {"success": True, "data": watching}
+
+@stream_router.get("/{tx_id}/events", summary="订阅交易状态变化 (SSE)")
+async def stream_transaction_status(
+    tx_id: str,
+    status_watcher: StatusWatcher = Depends(get_status_watcher)
+) -> StreamingResponse:
+    """
+    以 Server-Sent Events 推送交易状态变化
+    
+    - event: status — 状态变化 (连接后先推送最近一次的状态)，data 与查询交易状态接口的返回相同，另有 phase 字段;
+    - event: error — 查询上游失败，监视继续;
+    - event: end — 交易进入终态或停止监视，之后服务端关闭连接。
+    
+    同一笔交易的所有订阅者共用监视器的一路上游轮询
+    """
+    queue = status_watcher.subscribe(tx_id)
+    if queue is None:
+        raise HTTPException(status_code=503, detail="同时监视的交易数已达上限，请稍后再试")
+    
+    async def events():
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                
+                # 同一个事件对象推送给所有订阅者，不能修改
+                event_type = event["type"]
+                if event_type == EVENT_STATUS:
+                    data = {**enhance_status(tx_id, event["status"]), "phase": event["phase"]}
+                else:
+                    data = {key: value for key, value in event.items() if key != "type"}
+                yield b"event: " + event_type.encode() + b"\ndata: " + encode_event(data) + b"\n\n"
+                if event_type == EVENT_END:
+                    break
+        finally:
+            status_watcher.unsubscribe(tx_id, queue)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def encode_event(data: Dict[str, Any]) -> bytes:
+    """ SSE 的 data 字段：单行JSON (与响应相同的编解码器)。 """
+    if get_default_codec is not None:
+        return get_default_codec().dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+
+async def query_batch_status(
+    request: Request,
+    tx_ids: List[str],
+    status_tracker: AsyncStatusTracker,
+    status_watcher: StatusWatcher,
+    timeout: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    批量查询交易状态，结果与 tx_ids 一一对应 (顺序相同)。
+    
+    被状态监视器监视的交易直接使用最近一次的状态，其余交易由SDK并发查询
+    (并发数见 OKX_STATUS_BATCH_CONCURRENCY，经过共享的客户端限流器)，超过 timeout 秒未完成的返回 error。
+    未指定 timeout 时按需要查询的交易数和限流速率估算 (至少 DEFAULT_BATCH_TIMEOUT，最多 MAX_BATCH_TIMEOUT)。
+    """
+    cached = {}
+    for tx_id in tx_ids:
+        status_info = status_watcher.get_status(tx_id)
+        if status_info is not None:
+            cached[tx_id] = status_info
+    
+    pending = [tx_id for tx_id in tx_ids if tx_id not in cached]
+    if timeout is None:
+        # 留出 20% 余量给排队和上游延迟
+        estimated = 1.2 * len(pending) / status_tracker.status_query_rate()
+        timeout = min(MAX_BATCH_TIMEOUT, max(DEFAULT_BATCH_TIMEOUT, estimated))
+    
+    fetched = await status_tracker.batch_get_transaction_status(
+        pending,
+        concurrency=get_registry(request).status_batch_concurrency,
+        timeout=timeout
+    )
+    
+    results = []
+    for tx_id in tx_ids:
+        status_info = cached[tx_id] if tx_id in cached else fetched[tx_id]
+        error = status_info.get("error")
+        if error is None:
+            results.append({
+                **status_info,
+                "txId": tx_id,
+                "statusDescription": get_status_description(status_info.get("state", "")),
+                "progressPercentage": get_progress_percentage(status_info.get("state", ""))
+            })
+        elif error == BATCH_NOT_FOUND:
+            results.append({
+                "txId": tx_id,
+                "state": "not_found",
+                "statusDescription": "交易未找到",
+                "progressPercentage": 0
+            })
+        else:
+            results.append({
+                "txId": tx_id,
+                "state": "error",
+                "statusDescription": f"查询失败: {error}",
+                "progressPercentage": 0
+            })
+    return results
+
+@router.post("/batch", summary="批量查询交易状态")
+async def post_batch_transaction_status(
+    request: Request,
+    body: BatchStatusRequest,
+    status_tracker: AsyncStatusTracker = Depends(get_status_tracker),
+    status_watcher: StatusWatcher = Depends(get_status_watcher)
+) -> List[Dict[str, Any]]:
+    """
+    批量查询多个交易的状态 (最多 MAX_BATCH_SIZE 个，适合对账等大批量查询)
+    
+    各交易并发查询，整批最多等待 timeout 秒，返回结果的顺序与 tx_ids 相同。
+    上游查询受限流约束 (默认每个 API Key 5 次/秒)，大批量查询需要相应的时间
+    """
+    try:
+        return await query_batch_status(request, body.tx_ids, status_tracker, status_watcher, body.timeout)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"批量查询失败: {str(e)}")
+
 @router.get("/batch/{tx_ids}", summary="批量查询交易状态")
 async def get_batch_transaction_status(
+    request: Request,
     tx_ids: str,  # 逗号分隔的交易ID列表
-    status_tracker: StatusTracker = Depends(get_status_tracker)
+    status_tracker: AsyncStatusTracker = Depends(get_status_tracker),
+    status_watcher: StatusWatcher = Depends(get_status_watcher)
 ) -> List[Dict[str, Any]]:
     """
-    批量查询多个交易的状态
+    批量查询多个交易的状态 (交易较多时使用 POST /batch)
     
     参数:
     - tx_ids: 逗号分隔的交易ID列表 (如: "tx1,tx2,tx3")
     """
     try:
-        tx_id_list = [tx_id.strip() for tx_id in tx_ids.split(",")]
-        
-        if len(tx_id_list) > 10:
-            raise HTTPException(status_code=400, detail="一次最多查询10个交易")
+        tx_id_list = [tx_id.strip() for tx_id in tx_ids.split(",") if tx_id.strip()]
         
-        results = []
-        for tx_id in tx_id_list:
-            try:
-                status_info = status_tracker.get_transaction_status(tx_id=tx_id)
-                if status_info:
-                    enhanced_status = {
-                        **status_info,
-                        "txId": tx_id,
-                        "statusDescription": get_status_description(status_info.get("state", "")),
-                        "progressPercentage": get_progress_percentage(status_info.get("state", ""))
-                    }
-                    results.append(enhanced_status)
-                else:
-                    results.append({
-                        "txId": tx_id,
-                        "state": "not_found",
-                        "statusDescription": "交易未找到",
-                        "progressPercentage": 0
-                    })
-            except Exception as e:
-                results.append({
-                    "txId": tx_id,
-                    "state": "error",
-                    "statusDescription": f"查询失败: {str(e)}",
-                    "progressPercentage": 0
-                })
+        if len(tx_id_list) > MAX_BATCH_SIZE:
+            raise HTTPException(status_code=400, detail=f"一次最多查询{MAX_BATCH_SIZE}个交易")
         
-        return results
+        return await query_batch_status(request, tx_id_list, status_tracker, status_watcher)
         
     except HTTPException:
         raise
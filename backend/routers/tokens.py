@@ -2,62 +2,106 @@
 代币信息相关API路由
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
 from typing import List, Dict, Any, Optional
+import asyncio
+import heapq
+import logging
 import sys
 import os
 
-# 加载环境变量
-try:
-    from dotenv import load_dotenv
-    # 使用绝对路径加载环境变量
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    env_path = os.path.join(current_dir, '.env.local')
-    load_dotenv(env_path)
-    load_dotenv('.env')
-except ImportError:
-    pass
-
 # 添加项目根目录到Python路径
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
 try:
-    from okx_crosschain_sdk import AssetExplorer, Config, APIError
+    from okx_crosschain_sdk import AsyncAssetExplorer, APIError
+    from services.registry import get_registry
 except ImportError:
-    AssetExplorer = None
-    Config = None
+    AsyncAssetExplorer = None
+    get_registry = None
     APIError = Exception
 
+from services.executor import SDKExecutor
+from services.token_equivalence import TokenEquivalenceIndex
+from services.token_index import TokenSearchIndex, get_token_address, normalize_address
+
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
-# 依赖注入：获取AssetExplorer实例
-def get_asset_explorer():
-    if AssetExplorer is None:
+# 依赖注入：获取AssetExplorer实例 (异步版本，不阻塞事件循环)
+def get_asset_explorer(request: Request):
+    if AsyncAssetExplorer is None:
         raise HTTPException(status_code=500, detail="OKX SDK未正确导入")
     
-    # 从环境变量获取API Key配置
-    api_key = os.getenv('OKX_API_KEY')
-    secret_key = os.getenv('OKX_SECRET_KEY')
-    passphrase = os.getenv('OKX_PASSPHRASE')
-    
-    # 如果有API Key配置，则使用认证配置，否则使用默认配置
-    if api_key and secret_key and passphrase:
-        config = Config(
-            api_key=api_key,
-            secret_key=secret_key,
-            passphrase=passphrase
-        )
+    # 应用启动时创建的共享实例 (见 services/registry.py)
+    return get_registry(request).asset_explorer
+
+# 依赖注入：获取应用的执行器 (排序等CPU密集的工作放到其线程池中执行)
+def get_sdk_executor(request: Request) -> SDKExecutor:
+    return get_registry(request).executor
+
+# 依赖注入：获取跨链代币搜索索引 (由响应缓存中的代币列表维护)
+def get_token_index(request: Request) -> TokenSearchIndex:
+    if get_registry is None:
+        raise HTTPException(status_code=500, detail="OKX SDK未正确导入")
+    return get_registry(request).token_index
+
+# 依赖注入：获取跨链代币等价关系 (由响应缓存中各链支持跨链的代币列表维护)
+def get_token_equivalence(request: Request) -> TokenEquivalenceIndex:
+    if get_registry is None:
+        raise HTTPException(status_code=500, detail="OKX SDK未正确导入")
+    return get_registry(request).token_equivalence
+
+async def find_token(asset_explorer, token_index: TokenSearchIndex, chain_id: str, address: str) -> Optional[Dict[str, Any]]:
+    """
+    按合约地址查找代币：通过代币索引的地址字典 O(1) 查找 (该链还没有索引时先加载并建立索引)。
+    索引没能及时建好 (超时或加载失败) 时退回到遍历代币列表，加载失败的错误照常抛出。
+    """
+    statuses = await token_index.load_chains(lambda chain: asset_explorer.get_token_list(chain_index=chain), [chain_id])
+    if statuses[chain_id] == "ok":
+        return token_index.get_token(chain_id, address)
+    normalized = normalize_address(address)
+    tokens = await asset_explorer.get_token_list(chain_index=chain_id)
+    return next((token for token in tokens if normalize_address(get_token_address(token)) == normalized), None)
+
+def matches_search(token: Dict[str, Any], search_lower: str) -> bool:
+    """ 代币符号或名称是否包含搜索关键词 (关键词需已转为小写)。 """
+    return (search_lower in token.get("tokenSymbol", "").lower() or
+            search_lower in token.get("tokenName", "").lower())
+
+def popularity_sort_key(token: Dict[str, Any]):
+    """ 排序键：热门代币在前，其次按符号排序。适用于原始代币和增强后的代币。 """
+    return (not is_popular_token(token.get("tokenSymbol", "")), token.get("tokenSymbol", ""))
+
+def enhance_token(token: Dict[str, Any], chain_id: str) -> Dict[str, Any]:
+    """ 为代币列表中的一个代币添加Logo、类型、热门标识和链ID。 """
+    return {
+        **token,
+        # 优先使用OKX API返回的tokenLogoUrl，如果没有则使用我们的映射
+        "logoUrl": token.get("tokenLogoUrl") or get_token_logo_url(token.get("tokenSymbol", ""), token.get("tokenAddress", "")),
+        # 添加代币类型
+        "tokenType": get_token_type(token.get("tokenAddress", "")),
+        # 添加是否为热门代币标识
+        "isPopular": is_popular_token(token.get("tokenSymbol", "")),
+        # 添加链ID
+        "chainId": chain_id
+    }
+
+def rank_and_enhance_tokens(tokens: List[Dict[str, Any]], limit: Optional[int], chain_id: str) -> List[Dict[str, Any]]:
+    """ 按热门程度和符号排序，应用数量限制，再只为保留下来的代币构建增强信息。 """
+    if limit:
+        top_tokens = heapq.nsmallest(limit, tokens, key=popularity_sort_key)
     else:
-        config = Config()
-    
-    return AssetExplorer(config)
+        top_tokens = sorted(tokens, key=popularity_sort_key)
+    return [enhance_token(token, chain_id) for token in top_tokens]
 
 @router.get("/{chain_id}", summary="获取特定链上的代币列表")
 async def get_tokens_by_chain(
     chain_id: str,
     limit: Optional[int] = Query(100, description="返回代币数量限制"),
     search: Optional[str] = Query(None, description="搜索代币符号或名称"),
-    asset_explorer: AssetExplorer = Depends(get_asset_explorer)
+    asset_explorer: AsyncAssetExplorer = Depends(get_asset_explorer),
+    executor: SDKExecutor = Depends(get_sdk_executor)
 ) -> List[Dict[str, Any]]:
     """
     获取特定区块链上支持的代币列表
@@ -71,61 +115,43 @@ async def get_tokens_by_chain(
     - 代币列表，包含符号、名称、地址、图标等信息
     """
     try:
-        print(f"📝 获取链 {chain_id} 的代币列表，限制: {limit}")
-        
-        # 调用SDK获取代币列表
-        tokens = asset_explorer.get_token_list(chain_index=chain_id)
+        logger.debug("获取链 %s 的代币列表，限制: %s", chain_id, limit)
+        
+        # 流式遍历代币列表 (未命中缓存时增量解析上游响应，并发的冷请求只有一个真正读取上游)：
+        # 在原始数据上过滤，有 limit 时候选数超过 2*limit 就只保留前 limit 个，
+        # 候选列表的大小与 limit 相关，而不是整条链的代币数
+        search_lower = search.lower() if search else None
+        token_count = 0
+        candidates = []
+        async for token in asset_explorer.iter_token_list(chain_index=chain_id):
+            token_count += 1
+            if search_lower and not matches_search(token, search_lower):
+                continue
+            candidates.append(token)
+            if limit and len(candidates) >= 2 * limit:
+                candidates = heapq.nsmallest(limit, candidates, key=popularity_sort_key)
         
-        if not tokens:
-            print(f"⚠️ 链 {chain_id} 返回空代币列表")
+        if token_count == 0:
+            logger.info("链 %s 返回空代币列表", chain_id)
             return []
         
-        print(f"✅ 链 {chain_id} 获取到 {len(tokens)} 个代币")
-        
-        # 增强代币信息
-        enhanced_tokens = []
-        for token in tokens:
-            enhanced_token = {
-                **token,
-                # 优先使用OKX API返回的tokenLogoUrl，如果没有则使用我们的映射
-                "logoUrl": token.get("tokenLogoUrl") or get_token_logo_url(token.get("tokenSymbol", ""), token.get("tokenAddress", "")),
-                # 添加代币类型
-                "tokenType": get_token_type(token.get("tokenAddress", "")),
-                # 添加是否为热门代币标识
-                "isPopular": is_popular_token(token.get("tokenSymbol", "")),
-                # 添加链ID
-                "chainId": chain_id
-            }
-            enhanced_tokens.append(enhanced_token)
-        
-        # 如果有搜索关键词，进行过滤
-        if search:
-            search_lower = search.lower()
-            enhanced_tokens = [
-                token for token in enhanced_tokens
-                if search_lower in token.get("tokenSymbol", "").lower() or
-                   search_lower in token.get("tokenName", "").lower()
-            ]
+        logger.debug("链 %s 获取到 %d 个代币", chain_id, token_count)
         
-        # 按热门程度和符号排序
-        enhanced_tokens.sort(key=lambda x: (not x.get("isPopular", False), x.get("tokenSymbol", "")))
-        
-        # 应用数量限制
-        if limit:
-            enhanced_tokens = enhanced_tokens[:limit]
+        # 最终排序和增强在线程池中执行 (不限制数量时要排序整条链的代币)，不阻塞事件循环上的其他请求
+        enhanced_tokens = await executor.run(rank_and_enhance_tokens, candidates, limit, chain_id)
             
-        print(f"✅ 链 {chain_id} 最终返回 {len(enhanced_tokens)} 个代币")
+        logger.debug("链 %s 最终返回 %d 个代币", chain_id, len(enhanced_tokens))
         return enhanced_tokens
         
     except APIError as e:
-        print(f"❌ 链 {chain_id} API错误: {str(e)}")
+        logger.warning("链 %s API错误: %s", chain_id, e)
         # 对于某些链可能不支持，返回空列表而不是抛出错误
         if "chainId error" in str(e) or "Parameter chainId error" in str(e):
-            print(f"⚠️ 链 {chain_id} 不被OKX聚合器API支持，返回空列表")
+            logger.info("链 %s 不被OKX聚合器API支持，返回空列表", chain_id)
             return []
         raise HTTPException(status_code=400, detail=f"获取代币列表失败: {str(e)}")
     except Exception as e:
-        print(f"❌ 链 {chain_id} 服务器错误: {str(e)}")
+        logger.exception("链 %s 服务器错误: %s", chain_id, e)
         # 对于未知错误，也返回空列表，避免阻塞整个应用
         return []
 
@@ -133,7 +159,8 @@ async def get_tokens_by_chain(
 async def get_token_info(
     chain_id: str,
     token_address: str,
-    asset_explorer: AssetExplorer = Depends(get_asset_explorer)
+    asset_explorer: AsyncAssetExplorer = Depends(get_asset_explorer),
+    token_index: TokenSearchIndex = Depends(get_token_index)
 ) -> Dict[str, Any]:
     """
     获取特定代币的详细信息
@@ -143,15 +170,8 @@ async def get_token_info(
     - token_address: 代币合约地址
     """
     try:
-        # 获取该链上的所有代币
-        tokens = asset_explorer.get_token_list(chain_index=chain_id)
-        
-        # 查找指定地址的代币
-        target_token = None
-        for token in tokens:
-            if token.get("tokenAddress", "").lower() == token_address.lower():
-                target_token = token
-                break
+        # 按地址查找指定代币 (代币索引中的地址字典，不遍历整条链的代币列表)
+        target_token = await find_token(asset_explorer, token_index, chain_id, token_address)
                 
         if not target_token:
             raise HTTPException(
@@ -185,58 +205,59 @@ async def search_tokens(
     query: str = Query(..., description="搜索关键词"),
     chains: Optional[str] = Query(None, description="指定链ID，多个用逗号分隔"),
     limit: Optional[int] = Query(50, description="返回结果数量限制"),
-    asset_explorer: AssetExplorer = Depends(get_asset_explorer)
-) -> List[Dict[str, Any]]:
+    timeout: Optional[float] = Query(None, gt=0, le=30, description="等待各链代币列表加载的最长时间（秒）"),
+    include_status: bool = Query(False, description="返回各链的加载状态 (结果包装为对象)"),
+    asset_explorer: AsyncAssetExplorer = Depends(get_asset_explorer),
+    token_index: TokenSearchIndex = Depends(get_token_index)
+):
     """
     跨链搜索代币
     
     参数:
-    - query: 搜索关键词
+    - query: 搜索关键词，匹配代币符号、名称和合约地址 (少于3个字符时只匹配前缀)
     - chains: 指定搜索的链ID，用逗号分隔 (如 "1,56,137")
     - limit: 返回结果数量限制
+    - timeout: 等待还没有索引的链加载代币列表的最长时间，默认 OKX_TOKEN_SEARCH_TIMEOUT (3秒)
+    - include_status: 为 true 时返回 {"data": [...], "chainStatus": {链ID: 状态}, "partial": bool}
+    
+    结果按匹配质量 (符号完全匹配、符号前缀、地址、名称前缀、子串) 和热门程度排序。
+    各链并发加载，超时的链不在本次结果中 (状态为 timeout，加载完成后出现在之后的搜索中)，
+    不支持的链状态为 unsupported。
     """
     try:
         # 确定要搜索的链
         if chains:
-            chain_ids = [chain.strip() for chain in chains.split(",")]
+            chain_ids = [chain.strip() for chain in chains.split(",") if chain.strip()]
         else:
             # 如果没有指定链，获取所有支持的链
-            supported_chains = asset_explorer.get_supported_chains()
+            supported_chains = await asset_explorer.get_supported_chains()
             chain_ids = [chain.get("chainId") for chain in supported_chains if chain.get("chainId")]
         
-        all_tokens = []
-        query_lower = query.lower()
-        
-        # 在每个链上搜索代币
-        for chain_id in chain_ids:
-            try:
-                tokens = asset_explorer.get_token_list(chain_index=chain_id)
-                for token in tokens:
-                    # 检查是否匹配搜索条件
-                    if (query_lower in token.get("tokenSymbol", "").lower() or
-                        query_lower in token.get("tokenName", "").lower()):
-                        
-                        enhanced_token = {
-                            **token,
-                            "chainId": chain_id,
-                            "logoUrl": token.get("tokenLogoUrl") or get_token_logo_url(token.get("tokenSymbol", ""), token.get("tokenAddress", "")),
-                            "isPopular": is_popular_token(token.get("tokenSymbol", "")),
-                        }
-                        all_tokens.append(enhanced_token)
-                        
-            except Exception as e:
-                # 如果某个链查询失败，继续查询其他链
-                print(f"查询链 {chain_id} 时出错: {e}")
-                continue
+        # 只有第一次搜索某条链时需要加载代币列表，之后由缓存刷新回调在后台更新索引
+        chain_status = await token_index.load_chains(
+            lambda chain_id: asset_explorer.get_token_list(chain_index=chain_id),
+            chain_ids,
+            timeout
+        )
         
-        # 按热门程度排序
-        all_tokens.sort(key=lambda x: (not x.get("isPopular", False), x.get("tokenSymbol", "")))
+        results = [
+            {
+                **token,
+                "chainId": chain_id,
+                "logoUrl": token.get("tokenLogoUrl") or get_token_logo_url(token.get("tokenSymbol", ""), token.get("tokenAddress", "")),
+                "isPopular": is_popular_token(token.get("tokenSymbol", "")),
+            }
+            for chain_id, token in token_index.search(query, chain_ids, limit)
+        ]
         
-        # 应用数量限制
-        if limit:
-            all_tokens = all_tokens[:limit]
-            
-        return all_tokens
+        if not include_status:
+            return results
+        return {
+            "success": True,
+            "data": results,
+            "chainStatus": chain_status,
+            "partial": any(status != "ok" for status in chain_status.values())
+        }
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"搜索代币时出错: {str(e)}")
@@ -245,21 +266,13 @@ async def search_tokens(
 async def get_cross_chain_tokens(
     chain_index: str,
     limit: int = Query(50, description="返回结果数量限制"),
-    offset: int = Query(0, description="偏移量")
+    offset: int = Query(0, description="偏移量"),
+    asset_explorer: AsyncAssetExplorer = Depends(get_asset_explorer)
 ):
     """获取指定链支持跨链的代币列表"""
     try:
-        # 加载环境变量
-        from dotenv import load_dotenv
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        env_path = os.path.join(current_dir, '.env.local')
-        load_dotenv(env_path)
-        
-        # 获取AssetExplorer实例
-        asset_explorer = get_asset_explorer()
-        
         # 使用跨链专用API
-        tokens = asset_explorer.get_crosschain_tokens(chain_index)
+        tokens = await asset_explorer.get_crosschain_tokens(chain_index)
         
         # 应用分页
         start = offset
@@ -289,57 +302,38 @@ async def get_cross_chain_tokens(
         }
         
     except Exception as e:
-        print(f"获取跨链代币列表失败: {str(e)}")
+        logger.warning("获取跨链代币列表失败: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/cross-chain-paths/{chain_index}/{token_address}")
 async def get_cross_chain_paths(
     chain_index: str,
-    token_address: str
+    token_address: str,
+    asset_explorer: AsyncAssetExplorer = Depends(get_asset_explorer),
+    token_equivalence: TokenEquivalenceIndex = Depends(get_token_equivalence)
 ):
     """获取指定代币的跨链目标链列表"""
     try:
-        # 加载环境变量
-        from dotenv import load_dotenv
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        env_path = os.path.join(current_dir, '.env.local')
-        load_dotenv(env_path)
-        
-        # 获取AssetExplorer实例
-        asset_explorer = get_asset_explorer()
-        
         # 获取所有支持的链
-        chains = asset_explorer.get_supported_chains()
+        chains = await asset_explorer.get_supported_chains()
         
-        # 获取该代币在所有链上的跨链支持情况
-        supported_paths = []
+        # 各链支持跨链的代币列表只在第一次使用时并发加载，之后由缓存刷新回调增量更新等价关系
+        await token_equivalence.ensure_chains(
+            asset_explorer.get_crosschain_tokens,
+            [chain["chainIndex"] for chain in chains]
+        )
         
-        for target_chain in chains:
-            if target_chain["chainIndex"] == chain_index:
-                continue  # 跳过源链
-                
-            try:
-                # 检查该代币是否在目标链上支持跨链
-                target_tokens = asset_explorer.get_crosschain_tokens(target_chain["chainIndex"])
-                
-                # 查找匹配的代币（通过symbol匹配，因为地址可能不同）
-                source_tokens = asset_explorer.get_crosschain_tokens(chain_index)
-                source_token = next((t for t in source_tokens if t["tokenContractAddress"].lower() == token_address.lower()), None)
-                
-                if source_token:
-                    # 在目标链查找相同symbol的代币
-                    target_token = next((t for t in target_tokens if t["tokenSymbol"] == source_token["tokenSymbol"]), None)
-                    
-                    if target_token:
-                        supported_paths.append({
-                            "targetChain": target_chain,
-                            "targetToken": target_token,
-                            "isSupported": True
-                        })
-                        
-            except Exception as e:
-                print(f"检查链 {target_chain['chainIndex']} 跨链支持时出错: {str(e)}")
-                continue
+        # 该代币在其他各链上的等价代币 (按资产匹配，优先符号完全相同的代币)，一次字典查询
+        equivalents = token_equivalence.get_equivalents(chain_index, token_address)
+        supported_paths = [
+            {
+                "targetChain": target_chain,
+                "targetToken": equivalents[target_chain["chainIndex"]],
+                "isSupported": True
+            }
+            for target_chain in chains
+            if target_chain["chainIndex"] != chain_index and target_chain["chainIndex"] in equivalents
+        ]
         
         return {
             "success": True,
@@ -352,7 +346,7 @@ async def get_cross_chain_paths(
         }
         
     except Exception as e:
-        print(f"获取跨链路径失败: {str(e)}")
+        logger.warning("获取跨链路径失败: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/route-info/{from_chain_id}/{to_chain_id}/{from_token_address}/{to_token_address}")
@@ -362,7 +356,8 @@ async def get_route_info(
     from_token_address: str,
     to_token_address: str,
     amount: str = Query(..., description="代币数量"),
-    asset_explorer: AssetExplorer = Depends(get_asset_explorer)
+    asset_explorer: AsyncAssetExplorer = Depends(get_asset_explorer),
+    token_index: TokenSearchIndex = Depends(get_token_index)
 ):
     """
     获取跨链路径信息
@@ -373,24 +368,22 @@ async def get_route_info(
         # 但由于SDK中可能没有实现，我们先返回基本信息
         
         # 检查源链和目标链是否支持
-        chains = asset_explorer.get_supported_chains()
+        chains = await asset_explorer.get_supported_chains()
         from_chain = next((c for c in chains if c["chainIndex"] == from_chain_id), None)
         to_chain = next((c for c in chains if c["chainIndex"] == to_chain_id), None)
         
         if not from_chain or not to_chain:
             raise HTTPException(status_code=400, detail="不支持的链")
         
-        # 获取源链代币信息
-        from_tokens = asset_explorer.get_token_list(from_chain_id)
-        from_token = next((t for t in from_tokens if t["tokenContractAddress"].lower() == from_token_address.lower()), None)
+        # 并发查找源链和目标链代币 (按地址在代币索引中查找)
+        from_token, to_token = await asyncio.gather(
+            find_token(asset_explorer, token_index, from_chain_id, from_token_address),
+            find_token(asset_explorer, token_index, to_chain_id, to_token_address)
+        )
         
         if not from_token:
             raise HTTPException(status_code=400, detail="源链代币不存在")
         
-        # 获取目标链代币信息
-        to_tokens = asset_explorer.get_token_list(to_chain_id)
-        to_token = next((t for t in to_tokens if t["tokenContractAddress"].lower() == to_token_address.lower()), None)
-        
         if not to_token:
             raise HTTPException(status_code=400, detail="目标链代币不存在")
         
@@ -2,7 +2,7 @@
 交易构建相关API路由
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
 from pydantic import BaseModel, Field
 from typing import Dict, Any, Optional
 import sys
@@ -12,10 +12,11 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
 
 try:
-    from okx_crosschain_sdk import TransactionBuilder, Config, APIError
+    from okx_crosschain_sdk import AsyncTransactionBuilder, APIError
+    from services.registry import get_registry
 except ImportError:
-    TransactionBuilder = None
-    Config = None
+    AsyncTransactionBuilder = None
+    get_registry = None
     APIError = Exception
 
 router = APIRouter()
@@ -29,16 +30,16 @@ class BuildTransactionRequest(BaseModel):
     approve_tx_id: Optional[str] = Field(None, description="授权交易哈希")
     gas_price: Optional[str] = Field(None, description="自定义Gas价格")
 
-# 依赖注入：获取TransactionBuilder实例
-def get_transaction_builder():
-    if TransactionBuilder is None:
+# 依赖注入：获取TransactionBuilder实例 (异步版本，不阻塞事件循环)
+def get_transaction_builder(request: Request):
+    if AsyncTransactionBuilder is None:
         raise HTTPException(status_code=500, detail="OKX SDK未正确导入")
-    return TransactionBuilder(Config())
+    return get_registry(request).transaction_builder
 
 @router.post("/approve", summary="获取ERC20授权交易数据")
 async def get_approve_transaction(
     request: ApproveRequest,
-    tx_builder: TransactionBuilder = Depends(get_transaction_builder)
+    tx_builder: AsyncTransactionBuilder = Depends(get_transaction_builder)
 ) -> Dict[str, Any]:
     """
     获取ERC20代币授权交易的数据
@@ -47,7 +48,7 @@ async def get_approve_transaction(
     """
     try:
         # 调用SDK获取授权交易数据
-        approve_data = tx_builder.get_approve_transaction_data(
+        approve_data = await tx_builder.get_approve_transaction_data(
             route_data=request.route_data
         )
         
@@ -77,7 +78,7 @@ async def get_approve_transaction(
 @router.post("/build", summary="构建跨链交易数据")
 async def build_transaction(
     request: BuildTransactionRequest,
-    tx_builder: TransactionBuilder = Depends(get_transaction_builder)
+    tx_builder: AsyncTransactionBuilder = Depends(get_transaction_builder)
 ) -> Dict[str, Any]:
     """
     构建实际的跨链交易数据
@@ -96,7 +97,7 @@ async def build_transaction(
         if request.gas_price:
             build_params["gas_price"] = request.gas_price
         
-        tx_data = tx_builder.get_build_transaction_data(**build_params)
+        tx_data = await tx_builder.get_build_transaction_data(**build_params)
         
         if not tx_data:
             raise HTTPException(status_code=400, detail="无法构建交易数据")
@@ -0,0 +1,3 @@
+"""
+后端服务层：路由之间共享的基础设施 (响应编码等)
+"""
@@ -0,0 +1,311 @@
+"""
+链信息注册表：上游支持的链与静态元数据 (名称、Logo、分类、优先级) 合并一次，按 chainIndex 建立索引并预先排序，
+定期在后台刷新，链列表和单条链的查询只读内存
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 静态链信息映射（使用支持CORS的图片源）
+STATIC_CHAIN_INFO = {
+    "1": {
+        "name": "Ethereum",
+        "shortName": "ETH",
+        "logoUrl": "https://assets.coingecko.com/coins/images/279/small/ethereum.png",
+        "category": "Layer 1",
+        "ecosystem": "Ethereum"
+    },
+    "56": {
+        "name": "BNB Chain", 
+        "shortName": "BNB",
+        "logoUrl": "https://assets.coingecko.com/coins/images/825/small/bnb-icon2_2x.png",
+        "category": "Layer 1",
+        "ecosystem": "BNB Chain"
+    },
+    "137": {
+        "name": "Polygon",
+        "shortName": "MATIC", 
+        "logoUrl": "https://assets.coingecko.com/coins/images/4713/small/matic-token-icon.png",
+        "category": "Layer 2",
+        "ecosystem": "Polygon"
+    },
+    "10": {
+        "name": "Optimism",
+        "shortName": "OP",
+        "logoUrl": "https://assets.coingecko.com/coins/images/25244/small/Optimism.png",
+        "category": "Layer 2", 
+        "ecosystem": "Optimism"
+    },
+    "42161": {
+        "name": "Arbitrum",
+        "shortName": "ARB",
+        "logoUrl": "https://assets.coingecko.com/coins/images/16547/small/photo_2023-03-29_21.47.00.jpeg",
+        "category": "Layer 2",
+        "ecosystem": "Arbitrum"
+    },
+    "43114": {
+        "name": "Avalanche",
+        "shortName": "AVAX",
+        "logoUrl": "https://assets.coingecko.com/coins/images/12559/small/Avalanche_Circle_RedWhite_Trans.png",
+        "category": "Layer 1",
+        "ecosystem": "Avalanche"
+    },
+    "8453": {
+        "name": "Base",
+        "shortName": "BASE",
+        "logoUrl": "https://assets.coingecko.com/coins/images/7598/small/wrapped_bitcoin_wbtc.png",
+        "category": "Layer 2",
+        "ecosystem": "Base"
+    },
+    "501": {
+        "name": "Solana",
+        "shortName": "SOL", 
+        "logoUrl": "https://assets.coingecko.com/coins/images/4128/small/solana.png",
+        "category": "Layer 1",
+        "ecosystem": "Solana"
+    },
+    "324": {
+        "name": "zkSync Era",
+        "shortName": "zkSync",
+        "logoUrl": "https://assets.coingecko.com/coins/images/24091/small/zkSync_era.png",
+        "category": "Layer 2",
+        "ecosystem": "zkSync"
+    },
+    "59144": {
+        "name": "Linea",
+        "shortName": "Linea",
+        "logoUrl": "https://assets.coingecko.com/coins/images/30724/small/linea.png",
+        "category": "Layer 2",
+        "ecosystem": "Linea"
+    },
+    "534352": {
+        "name": "Scroll",
+        "shortName": "Scroll", 
+        "logoUrl": "https://assets.coingecko.com/coins/images/26998/small/scroll.png",
+        "category": "Layer 2",
+        "ecosystem": "Scroll"
+    },
+    "195": {
+        "name": "TRON",
+        "shortName": "TRX",
+        "logoUrl": "https://assets.coingecko.com/coins/images/1094/small/tron-logo.png",
+        "category": "Layer 1",
+        "ecosystem": "TRON"
+    },
+    "637": {
+        "name": "Aptos",
+        "shortName": "APT",
+        "logoUrl": "https://assets.coingecko.com/coins/images/26455/small/aptos_round.png",
+        "category": "Layer 1", 
+        "ecosystem": "Aptos"
+    },
+    "784": {
+        "name": "SUI",
+        "shortName": "SUI",
+        "logoUrl": "https://assets.coingecko.com/coins/images/26375/small/sui_asset.jpeg",
+        "category": "Layer 1",
+        "ecosystem": "SUI"
+    },
+    "196": {
+        "name": "X Layer",
+        "shortName": "X Layer",
+        "logoUrl": "https://assets.coingecko.com/coins/images/4713/small/matic-token-icon.png", # 使用Polygon logo作为占位
+        "category": "Layer 2",
+        "ecosystem": "X Layer"
+    },
+    "169": {
+        "name": "Manta Pacific",
+        "shortName": "Manta",
+        "logoUrl": "https://assets.coingecko.com/coins/images/28286/small/manta.png",
+        "category": "Layer 2",
+        "ecosystem": "Manta"
+    },
+    "1088": {
+        "name": "Metis",
+        "shortName": "METIS",
+        "logoUrl": "https://assets.coingecko.com/coins/images/15595/small/metis.PNG",
+        "category": "Layer 2",
+        "ecosystem": "Metis"
+    },
+    "4200": {
+        "name": "Merlin",
+        "shortName": "Merlin",
+        "logoUrl": "data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMzIiIGhlaWdodD0iMzIiIHZpZXdCb3g9IjAgMCAzMiAzMiIgZmlsbD0ibm9uZSIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KPGNpcmNsZSBjeD0iMTYiIGN5PSIxNiIgcj0iMTYiIGZpbGw9IiNGRjY5MDAiLz4KPHRleHQgeD0iMTYiIHk9IjIwIiB0ZXh0LWFuY2hvcj0ibWlkZGxlIiBmaWxsPSJ3aGl0ZSIgZm9udC1zaXplPSIxNCIgZm9udC13ZWlnaHQ9ImJvbGQiPk08L3RleHQ+Cjwvc3ZnPgo=",
+        "category": "Layer 2",
+        "ecosystem": "Merlin"
+    },
+    "34443": {
+        "name": "Mode",
+        "shortName": "Mode", 
+        "logoUrl": "data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMzIiIGhlaWdodD0iMzIiIHZpZXdCb3g9IjAgMCAzMiAzMiIgZmlsbD0ibm9uZSIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KPGNpcmNsZSBjeD0iMTYiIGN5PSIxNiIgcj0iMTYiIGZpbGw9IiMwMEZGMDAiLz4KPHRleHQgeD0iMTYiIHk9IjIwIiB0ZXh0LWFuY2hvcj0ibWlkZGxlIiBmaWxsPSJ3aGl0ZSIgZm9udC1zaXplPSIxNCIgZm9udC13ZWlnaHQ9ImJvbGQiPk08L3RleHQ+Cjwvc3ZnPgo=",
+        "category": "Layer 2",
+        "ecosystem": "Mode"
+    },
+    "33139": {
+        "name": "ApeChain",
+        "shortName": "APE",
+        "logoUrl": "https://assets.coingecko.com/coins/images/18876/small/apecoin.jpg",
+        "category": "Layer 2",
+        "ecosystem": "ApeChain"
+    },
+    "146": {
+        "name": "Sonic Mainnet",
+        "shortName": "Sonic",
+        "logoUrl": "data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMzIiIGhlaWdodD0iMzIiIHZpZXdCb3g9IjAgMCAzMiAzMiIgZmlsbD0ibm9uZSIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj4KPGNpcmNsZSBjeD0iMTYiIGN5PSIxNiIgcj0iMTYiIGZpbGw9IiMwMDdCRkYiLz4KPHRleHQgeD0iMTYiIHk9IjIwIiB0ZXh0LWFuY2hvcj0ibWlkZGxlIiBmaWxsPSJ3aGl0ZSIgZm9udC1zaXplPSIxNCIgZm9udC13ZWlnaHQ9ImJvbGQiPlM8L3RleHQ+Cjwvc3ZnPgo=",
+        "category": "Layer 1",
+        "ecosystem": "Sonic"
+    }
+}
+
+# 链优先级排序
+CHAIN_PRIORITY = {
+    "1": 1,    # Ethereum - 最高优先级
+    "56": 2,   # BNB Chain
+    "137": 3,  # Polygon
+    "10": 4,   # Optimism
+    "42161": 5, # Arbitrum
+    "43114": 6, # Avalanche
+    "8453": 7,  # Base
+    "501": 8,   # Solana
+    "324": 9,   # zkSync Era
+    "59144": 10, # Linea
+    "534352": 11, # Scroll
+    "195": 12,  # TRON
+}
+
+
+def enhance_chain(chain: Dict[str, Any]) -> Dict[str, Any]:
+    """ 把OKX返回的链信息与静态信息合并为增强的链信息。 """
+    chain_index = chain.get('chainId') or chain.get('chainIndex')
+    static_info = STATIC_CHAIN_INFO.get(chain_index, {})
+    
+    return {
+        "chainIndex": chain_index,
+        "chainName": static_info.get('name', chain.get('chainName', f"Chain {chain_index}")),
+        "shortName": static_info.get('shortName', chain.get('chainName', '')),
+        "logoUrl": static_info.get('logoUrl'),
+        "category": static_info.get('category', 'Layer 1'),
+        "ecosystem": static_info.get('ecosystem', 'Unknown'),
+        # 保留原始信息
+        "originalChainInfo": chain,
+        # 添加一些有用的元数据
+        "isMainnet": True,
+        "isTestnet": False,
+        "priority": CHAIN_PRIORITY.get(chain_index, 999)
+    }
+
+
+class ChainRegistry:
+    """
+    支持的链的内存注册表。
+
+    上游链列表 (get_supported_chains) 每次加载或刷新后，合并静态信息、按优先级排序，
+    连同 {chainIndex: 链信息} 字典一起整体替换，读取不需要加锁。
+    作为 ResponseCache 的刷新回调注册 (on_cache_update)，缓存刷新后立即生效；
+    start() 启动的后台任务每 refresh_interval 秒重新读取一次 (经过响应缓存，过期时触发刷新)。
+    """
+
+    def __init__(self, base_url: str = None, refresh_interval: float = 300.0):
+        """
+        Args:
+            base_url: 只处理该 BASE_API_URL 下的缓存记录，None 表示不限制。
+            refresh_interval: 后台刷新的间隔（秒）。
+        """
+        self.base_url = base_url
+        self.refresh_interval = refresh_interval
+        # (原始列表, {chainIndex: 链信息}, 按优先级排序的链列表)，整体替换
+        self._snapshot = (None, {}, [])
+        self._loaded_at: Optional[float] = None
+        self._loading: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._stats = {"updates": 0, "refresh_errors": 0}
+
+    def on_cache_update(self, key: tuple, value: Any):
+        """ ResponseCache 的刷新回调：全部链的列表 (不带 chainIndex 参数) 更新后重建注册表。 """
+        if len(key) < 3 or key[1] != "get_supported_chains" or key[2] is not None or not isinstance(value, list):
+            return
+        if self.base_url is not None and key[0] != self.base_url:
+            return
+        self.update(value)
+
+    def update(self, chains: List[Dict[str, Any]]):
+        """ 用新的上游链列表重建注册表 (列表未变化时跳过)。 """
+        self._loaded_at = time.monotonic()
+        if self._snapshot[0] is chains:
+            return
+        enhanced = [enhance_chain(chain) for chain in chains]
+        enhanced.sort(key=lambda x: x.get('priority', 999))
+        by_index = {}
+        for chain in enhanced:
+            by_index.setdefault(chain["chainIndex"], chain)
+        self._snapshot = (chains, by_index, enhanced)
+        self._stats["updates"] += 1
+        logger.debug("链信息注册表已更新: %d 条链", len(enhanced))
+
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    async def ensure_loaded(self, loader: Callable[[], Awaitable[List[Dict[str, Any]]]]):
+        """ 注册表为空时加载一次 (并发的请求共用一个加载任务)，加载失败时抛出 loader 的异常。 """
+        if self.is_loaded():
+            return
+        if self._loading is None:
+            self._loading = asyncio.ensure_future(self._load(loader))
+            self._loading.add_done_callback(self._clear_loading)
+        await asyncio.shield(self._loading)
+
+    def _clear_loading(self, task: asyncio.Task):
+        self._loading = None
+        if not task.cancelled():
+            # 等待该任务的请求都已取消时避免 "exception was never retrieved"
+            task.exception()
+
+    async def _load(self, loader: Callable[[], Awaitable[List[Dict[str, Any]]]]):
+        self.update(await loader())
+
+    def start(self, loader: Callable[[], Awaitable[List[Dict[str, Any]]]]):
+        """ 启动后台刷新任务 (需要在事件循环中调用)：立即加载一次，之后每 refresh_interval 秒刷新。 """
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.ensure_future(self._refresh_loop(loader))
+
+    async def _refresh_loop(self, loader: Callable[[], Awaitable[List[Dict[str, Any]]]]):
+        while True:
+            try:
+                # 第一次加载与 ensure_loaded 共用同一个任务，启动后立即到达的请求不会重复请求上游
+                if self.is_loaded():
+                    await self._load(loader)
+                else:
+                    await self.ensure_loaded(loader)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 刷新失败时继续使用已有的数据，下个周期重试
+                self._stats["refresh_errors"] += 1
+                logger.warning("刷新链信息失败: %s", e)
+            await asyncio.sleep(self.refresh_interval)
+
+    def get_chains(self) -> List[Dict[str, Any]]:
+        """ 按优先级排序的增强链信息列表。返回的列表和链信息应视为只读。 """
+        return self._snapshot[2]
+
+    def get_chain(self, chain_id: str) -> Optional[Dict[str, Any]]:
+        """ chainIndex 对应的增强链信息，不支持时返回None。 """
+        return self._snapshot[1].get(chain_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "chains": len(self._snapshot[2]),
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at is not None else None,
+            **self._stats,
+        }
+
+    def shutdown(self):
+        """ 应用关闭时取消后台刷新任务。 """
+        for task in (self._refresh_task, self._loading):
+            if task is not None:
+                task.cancel()
+        self._refresh_task = None
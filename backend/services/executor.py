@@ -0,0 +1,245 @@
+"""
+路由共享的SDK执行器：按路由限制并发、统计排队深度，排队过多时拒绝请求 (503)，
+并提供一个有界线程池，把阻塞或CPU密集的工作 (同步SDK调用、大型代币列表的排序和增强) 移出事件循环
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from fastapi import HTTPException, Request
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorRejected(Exception):
+    """ 路由的并发已满且排队请求过多 (或排队超时)，请求被拒绝。 """
+
+    def __init__(self, route: str, reason: str, retry_after: float):
+        super().__init__(f"路由 {route} 繁忙: {reason}")
+        self.route = route
+        self.retry_after = retry_after
+
+
+class _RouteState:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_time_total = 0.0
+        self.max_wait_time = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        admitted = self.completed + self.active
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.wait_time_total / admitted * 1000, 2) if admitted else 0.0,
+            "max_wait_ms": round(self.max_wait_time * 1000, 2),
+        }
+
+
+class SDKExecutor:
+    """
+    路由共享的执行器。
+
+    - 每个路由 (chains / tokens / quote / transaction / status) 有独立的并发上限，一个路由上的慢请求
+      (例如拉取数万个代币的 get_token_list) 只会占满该路由的名额，不会拖慢其他路由；
+    - 名额已满时请求排队，排队数超过 max_queue 或等待超过 queue_timeout 秒时抛出 ExecutorRejected，
+      由应用返回 503 和 Retry-After，而不是让请求无限堆积；
+    - run() 在有界线程池中执行同步函数。线程池只在持有路由名额时使用，
+      因此排队的工作量也受各路由并发上限约束，线程池本身不再单独拒绝。
+
+    名额只在事件循环线程中获取和释放，路由统计不需要加锁。
+    """
+
+    def __init__(
+        self,
+        max_workers: int = None,
+        route_limits: Dict[str, int] = None,
+        default_limit: int = 32,
+        max_queue: int = 100,
+        queue_timeout: float = 10.0,
+        retry_after: float = 1.0
+    ):
+        """
+        Args:
+            max_workers: 线程池大小，默认 min(32, CPU数 + 4)。
+            route_limits: 各路由的并发上限，未列出的路由使用 default_limit。
+            default_limit: 默认的路由并发上限。
+            max_queue: 每个路由最多排队的请求数。
+            queue_timeout: 排队的最长时间（秒）。
+            retry_after: 拒绝请求时建议客户端等待的时间（秒）。
+        """
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.route_limits = dict(route_limits or {})
+        self.default_limit = default_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._routes: Dict[str, _RouteState] = {}
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="sdk-executor")
+        self._pool_lock = threading.Lock()
+        self._pool_pending = 0
+        self._pool_running = 0
+        self._pool_completed = 0
+        self._pool_max_pending = 0
+
+    def _route(self, route: str) -> _RouteState:
+        state = self._routes.get(route)
+        if state is None:
+            state = self._routes[route] = _RouteState(self.route_limits.get(route, self.default_limit))
+        return state
+
+    def _reject(self, state: _RouteState, route: str, reason: str):
+        state.rejected += 1
+        logger.warning("拒绝请求: 路由 %s %s (并发 %d/%d，排队 %d)", route, reason, state.active, state.limit, state.queued)
+        raise ExecutorRejected(route, reason, self.retry_after)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, route: str):
+        """
+        获取路由的一个并发名额，退出时释放。
+
+        Raises:
+            ExecutorRejected: 排队请求已达上限或排队超时。
+        """
+        state = self._route(route)
+        started = time.monotonic()
+        if state.semaphore.locked():
+            if state.queued >= self.max_queue:
+                self._reject(state, route, f"排队请求已达上限 {self.max_queue}")
+            state.queued += 1
+            state.max_queued = max(state.max_queued, state.queued)
+            acquire = asyncio.ensure_future(state.semaphore.acquire())
+            try:
+                await asyncio.wait({acquire}, timeout=self.queue_timeout)
+            except asyncio.CancelledError:
+                if acquire.done() and not acquire.cancelled():
+                    # 取消到达时名额已经拿到 (例如客户端断开)，必须归还，否则名额永久泄漏
+                    state.semaphore.release()
+                else:
+                    acquire.cancel()
+                raise
+            finally:
+                state.queued -= 1
+            if not acquire.done():
+                acquire.cancel()
+                self._reject(state, route, f"排队超过 {self.queue_timeout:g} 秒")
+        else:
+            # 有空闲名额时 acquire 立即返回，不会让出事件循环
+            await state.semaphore.acquire()
+
+        waited = time.monotonic() - started
+        state.wait_time_total += waited
+        state.max_wait_time = max(state.max_wait_time, waited)
+        state.active += 1
+        try:
+            yield
+        finally:
+            state.active -= 1
+            state.completed += 1
+            state.semaphore.release()
+
+    def _run_in_pool(self, func: Callable, *args, **kwargs):
+        with self._pool_lock:
+            self._pool_running += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._pool_lock:
+                self._pool_running -= 1
+                self._pool_pending -= 1
+                self._pool_completed += 1
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """ 在线程池中执行同步函数并等待结果，事件循环在此期间可以处理其他请求。 """
+        with self._pool_lock:
+            self._pool_pending += 1
+            self._pool_max_pending = max(self._pool_max_pending, self._pool_pending)
+        future = self._pool.submit(self._run_in_pool, func, *args, **kwargs)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # 还没开始执行的任务直接取消，_run_in_pool 不会运行，在这里扣除排队计数
+            if future.cancel():
+                with self._pool_lock:
+                    self._pool_pending -= 1
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """ 返回线程池和各路由的并发、排队和拒绝统计。 """
+        with self._pool_lock:
+            pool = {
+                "max_workers": self.max_workers,
+                "running": self._pool_running,
+                "queued": self._pool_pending - self._pool_running,
+                "max_pending": self._pool_max_pending,
+                "completed": self._pool_completed,
+            }
+        return {
+            "pool": pool,
+            "routes": {route: state.get_stats() for route, state in sorted(self._routes.items())},
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_route_limits(value: str) -> Dict[str, int]:
+    """ 解析 "tokens=8,quote=32" 形式的路由并发上限。 """
+    limits = {}
+    for part in (value or "").split(","):
+        route, _, limit = part.partition("=")
+        if route.strip() and limit.strip():
+            limits[route.strip()] = int(limit)
+    return limits
+
+
+def create_executor() -> SDKExecutor:
+    """
+    根据环境变量创建执行器 (每个应用的 SDKRegistry 持有一个，随 lifespan 创建和关闭)：
+
+    OKX_EXECUTOR_WORKERS (线程池大小)、OKX_EXECUTOR_ROUTE_LIMITS (如 "tokens=8,quote=32")、
+    OKX_EXECUTOR_DEFAULT_LIMIT (默认路由并发上限，32)、OKX_EXECUTOR_MAX_QUEUE (每个路由最多排队数，100)、
+    OKX_EXECUTOR_QUEUE_TIMEOUT (最长排队秒数，10)。
+    """
+    workers = os.getenv("OKX_EXECUTOR_WORKERS")
+    return SDKExecutor(
+        max_workers=int(workers) if workers else None,
+        route_limits=parse_route_limits(os.getenv("OKX_EXECUTOR_ROUTE_LIMITS", "")),
+        default_limit=int(os.getenv("OKX_EXECUTOR_DEFAULT_LIMIT", "32")),
+        max_queue=int(os.getenv("OKX_EXECUTOR_MAX_QUEUE", "100")),
+        queue_timeout=float(os.getenv("OKX_EXECUTOR_QUEUE_TIMEOUT", "10"))
+    )
+
+
+def route_slot(route: str):
+    """
+    返回一个 FastAPI 依赖：请求处理期间占用路由的一个并发名额。
+
+    在 include_router(dependencies=[Depends(route_slot("tokens"))]) 中使用，拒绝发生在路由函数之外，
+    不会被路由内部的 except Exception 吞掉，而是由应用的 ExecutorRejected 处理器返回503。
+    名额来自当前应用的 SDKRegistry 持有的执行器 (request.app.state.sdk.executor)。
+    """
+    async def acquire_route_slot(request: Request):
+        registry = getattr(request.app.state, "sdk", None)
+        if registry is None:
+            raise HTTPException(status_code=500, detail="OKX SDK未初始化")
+        async with registry.executor.slot(route):
+            yield
+    acquire_route_slot.__name__ = f"acquire_{route}_slot"
+    return acquire_route_slot
@@ -0,0 +1,129 @@
+"""
+按链并发加载数据：所有请求共享的并发上限、同一条链共用一个加载任务、整体截止时间和失败退避
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 各链的加载状态
+CHAIN_OK = "ok"
+CHAIN_TIMEOUT = "timeout"
+CHAIN_UNSUPPORTED = "unsupported"
+CHAIN_ERROR = "error"
+
+
+def classify_chain_error(error: Exception) -> str:
+    """ OKX 对不支持的链返回 "Parameter chainId error"，其他错误视为暂时失败。 """
+    return CHAIN_UNSUPPORTED if "chainId error" in str(error) else CHAIN_ERROR
+
+
+class ChainFanout:
+    """
+    按链并发执行加载任务 (例如加载各链的代币列表并建立索引)。
+
+    - 同时运行的加载任务数受 concurrency 限制，所有请求共享；
+    - 同一条链同时只有一个加载任务，多个请求共用；
+    - run() 最多等待 timeout 秒，超时的链返回 timeout，但任务不会被取消，完成后结果照常生效；
+    - 加载失败的链记住失败状态，FAILED_RETRY_INTERVAL 秒内直接返回该状态，不再重试。
+    """
+
+    FAILED_RETRY_INTERVAL = 60.0
+
+    def __init__(self, name: str, concurrency: int = 8, timeout: float = 3.0):
+        """
+        Args:
+            name: 名称，用于日志。
+            concurrency: 同时运行的加载任务数上限。
+            timeout: run() 默认的最长等待时间（秒）。
+        """
+        self.name = name
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # 加载失败的链: {链ID: (失败时间, 状态)}
+        self._failed: Dict[str, Tuple[float, str]] = {}
+
+    def mark_failed(self, chain_id: str, status: str = CHAIN_ERROR):
+        self._failed[chain_id] = (time.monotonic(), status)
+
+    def recent_failure(self, chain_id: str) -> Optional[str]:
+        """ 该链最近加载失败时返回失败状态，可以重试时返回None。 """
+        failed = self._failed.get(chain_id)
+        if failed is not None and time.monotonic() - failed[0] < self.FAILED_RETRY_INTERVAL:
+            return failed[1]
+        return None
+
+    def start(self, chain_id: str, load: Callable[[str], Awaitable[None]]) -> asyncio.Task:
+        """ 启动该链的加载任务 (已在加载时返回已有的任务)，不等待结果。 """
+        task = self._tasks.get(chain_id)
+        if task is None:
+            task = self._tasks[chain_id] = asyncio.ensure_future(self._run_one(chain_id, load))
+            task.add_done_callback(lambda _, chain_id=chain_id: self._tasks.pop(chain_id, None))
+        return task
+
+    async def _run_one(self, chain_id: str, load: Callable[[str], Awaitable[None]]) -> str:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            try:
+                await load(chain_id)
+            except Exception as e:
+                status = classify_chain_error(e)
+                logger.warning("%s: 加载链 %s 失败 (%s): %s", self.name, chain_id, status, e)
+                self.mark_failed(chain_id, status)
+                return status
+        self._failed.pop(chain_id, None)
+        return CHAIN_OK
+
+    async def run(
+        self,
+        chain_ids: Iterable[str],
+        load: Callable[[str], Awaitable[None]],
+        is_loaded: Callable[[str], bool],
+        timeout: Optional[float] = None
+    ) -> Dict[str, str]:
+        """
+        为还没有加载的链并发执行 load(链ID)，最多等待 timeout 秒 (默认 self.timeout)。
+
+        Args:
+            chain_ids: 需要的链。
+            load: 加载一条链的协程函数，失败时抛出异常。
+            is_loaded: 该链是否已经加载过 (已加载的链直接返回 ok)。
+            timeout: 最长等待时间（秒）。
+
+        Returns:
+            {链ID: 状态}，状态为 ok / timeout / unsupported / error。
+        """
+        statuses: Dict[str, str] = {}
+        waiting: Dict[str, asyncio.Task] = {}
+        for chain_id in dict.fromkeys(chain_ids):
+            if is_loaded(chain_id):
+                statuses[chain_id] = CHAIN_OK
+                continue
+            failure = self.recent_failure(chain_id)
+            if failure is not None:
+                statuses[chain_id] = failure
+                continue
+            waiting[chain_id] = self.start(chain_id, load)
+
+        if waiting:
+            done, _ = await asyncio.wait(waiting.values(), timeout=self.timeout if timeout is None else timeout)
+            for chain_id, task in waiting.items():
+                statuses[chain_id] = task.result() if task in done else CHAIN_TIMEOUT
+        return statuses
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "loading": len(self._tasks),
+            "failed_chains": {chain_id: status for chain_id, (_, status) in sorted(self._failed.items())},
+        }
+
+    def cancel(self):
+        """ 应用关闭时取消还在运行的加载任务。 """
+        for task in list(self._tasks.values()):
+            task.cancel()
@@ -0,0 +1,25 @@
+"""
+使用SDK JSON编解码器的 FastAPI 响应类
+"""
+
+import os
+import sys
+
+from fastapi.responses import JSONResponse
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+from okx_crosschain_sdk.codec import get_default_codec
+
+
+class CodecJSONResponse(JSONResponse):
+    """
+    用SDK的默认编解码器 (安装了 orjson 时使用 orjson) 编码响应体的 JSONResponse。
+
+    输出格式与 FastAPI 默认的 JSONResponse 相同 (紧凑、UTF-8、不转义非ASCII字符)，
+    但大型代币列表和路由列表的编码速度更快。
+    """
+
+    def render(self, content) -> bytes:
+        return get_default_codec().dumps(content)
@@ -0,0 +1,282 @@
+"""
+结构化日志：基于队列的非阻塞输出、JSON/文本格式、按路由采样、运行时调整日志级别和请求ID关联
+"""
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+# 当前请求的ID、路由和采样结果，由 RequestContextMiddleware 设置，日志过滤器读取
+request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="-")
+route_var: contextvars.ContextVar[str] = contextvars.ContextVar("route", default="-")
+sampled_var: contextvars.ContextVar[bool] = contextvars.ContextVar("log_sampled", default=True)
+
+ROUTE_PREFIX = "/api/v1/"
+REQUEST_ID_HEADER = "x-request-id"
+
+# LogRecord 的标准属性，其余属性 (通过 extra 传入) 作为结构化字段输出
+_RESERVED_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id", "route"}
+
+DEFAULT_LOGGER_LEVELS = {"httpx": "WARNING", "httpcore": "WARNING"}
+
+access_logger = logging.getLogger("access")
+_exception_formatter = logging.Formatter()
+
+
+def route_from_path(path: str) -> str:
+    """ /api/v1/quote/... 对应路由 quote，其他路径 (健康检查、文档等) 对应 app。 """
+    if path.startswith(ROUTE_PREFIX):
+        return path[len(ROUTE_PREFIX):].split("/", 1)[0] or "app"
+    return "app"
+
+
+def log_enabled(logger: logging.Logger, level: int = logging.DEBUG) -> bool:
+    """
+    该级别的日志是否会被输出 (同时考虑日志级别和当前请求的采样结果)。
+
+    热路径上构造日志字段本身有开销时，先用它判断，关闭或未被采样时几乎没有成本。
+    """
+    return logger.isEnabledFor(level) and (level >= logging.WARNING or sampled_var.get())
+
+
+def _extra_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    return {key: value for key, value in vars(record).items() if key not in _RESERVED_ATTRS and not key.startswith("_")}
+
+
+class JSONFormatter(logging.Formatter):
+    """ 每条日志输出为一行JSON，通过 extra 传入的字段原样输出。 """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "route": getattr(record, "route", "-"),
+            "msg": record.getMessage(),
+        }
+        entry.update(_extra_fields(record))
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """ 便于本地开发阅读的文本格式，extra 字段以 key=value 附在消息后。 """
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s [%(request_id)s] %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = _extra_fields(record)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class ContextFilter(logging.Filter):
+    """
+    在调用日志的线程中为记录添加请求ID和路由，并丢弃未被采样请求的 WARNING 以下日志
+    (WARNING 及以上总是输出)。
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING and not sampled_var.get():
+            return False
+        record.request_id = request_id_var.get()
+        record.route = route_var.get()
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """ 队列已满时丢弃日志并计数，而不是阻塞请求或向 stderr 打印错误。 """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """ 入队前合并消息参数，异常转为文本 (输出线程中不能再访问调用方的栈帧和可变参数)。 """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LoggingManager:
+    """
+    管理日志的输出线程、采样率和运行时日志级别。
+
+    日志在请求所在线程中只做过滤和入队，格式化和写 stdout 由 QueueListener 的后台线程完成，
+    stdout 变慢时不会拖慢请求；队列满时丢弃日志并计入 dropped。
+    """
+
+    def __init__(self, level: str = "INFO", fmt: str = "json", sample_rate: float = 1.0,
+                 sample_rates: Dict[str, float] = None, queue_size: int = 10000, stream=None):
+        self.sample_rate = sample_rate
+        self.sample_rates: Dict[str, float] = dict(sample_rates or {})
+        self._lock = threading.Lock()
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(TextFormatter() if fmt == "text" else JSONFormatter())
+        self.handler = NonBlockingQueueHandler(queue.Queue(maxsize=queue_size))
+        self.handler.addFilter(ContextFilter())
+        self.listener = logging.handlers.QueueListener(self.handler.queue, output, respect_handler_level=False)
+
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            if isinstance(existing, NonBlockingQueueHandler):
+                root.removeHandler(existing)
+        root.addHandler(self.handler)
+        root.setLevel(level.upper())
+        self.listener.start()
+        atexit.register(self.stop)
+
+    def should_sample(self, route: str) -> bool:
+        rate = self.sample_rates.get(route, self.sample_rate)
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+    def set_levels(self, levels: Dict[str, str]):
+        """ 运行时调整日志级别，键为 logger 名称 (root 表示根logger)，如 {"routers.quote": "DEBUG"}。 """
+        for name, level in levels.items():
+            logging.getLogger(None if name == "root" else name).setLevel(str(level).upper())
+
+    def set_sample_rates(self, rates: Dict[str, float], default: Optional[float] = None):
+        """ 运行时调整各路由的采样率 (0~1)，default 为未单独配置的路由的采样率。 """
+        with self._lock:
+            if default is not None:
+                self.sample_rate = float(default)
+            self.sample_rates.update({route: float(rate) for route, rate in rates.items()})
+
+    def get_state(self) -> Dict[str, Any]:
+        loggers = {"root": logging.getLevelName(logging.getLogger().level)}
+        for name, logger in sorted(logging.root.manager.loggerDict.items()):
+            if isinstance(logger, logging.Logger) and logger.level != logging.NOTSET:
+                loggers[name] = logging.getLevelName(logger.level)
+        return {
+            "levels": loggers,
+            "sample_rate": self.sample_rate,
+            "sample_rates": dict(self.sample_rates),
+            "queue_size": self.handler.queue.qsize(),
+            "dropped": self.handler.dropped,
+        }
+
+    def stop(self):
+        try:
+            self.listener.stop()
+        except AttributeError:
+            # 已经停止
+            pass
+
+
+_manager: Optional[LoggingManager] = None
+
+
+def parse_mapping(value: str) -> Dict[str, str]:
+    """ 解析 "quote=0.1,tokens=0.5" 形式的配置。 """
+    mapping = {}
+    for part in (value or "").split(","):
+        key, _, item = part.partition("=")
+        if key.strip() and item.strip():
+            mapping[key.strip()] = item.strip()
+    return mapping
+
+
+def configure_logging() -> LoggingManager:
+    """
+    根据环境变量配置日志 (重复调用返回同一个实例)：
+
+    LOG_LEVEL (默认 INFO)、LOG_FORMAT (json / text，默认 json)、LOG_LEVELS (如 "routers.quote=DEBUG")、
+    LOG_SAMPLE_RATE (WARNING 以下日志的默认采样率，默认 1)、LOG_SAMPLE_RATES (如 "quote=0.1,tokens=0.2")、
+    LOG_QUEUE_SIZE (日志队列长度，默认 10000)。
+    """
+    global _manager
+    if _manager is None:
+        _manager = LoggingManager(
+            level=os.getenv("LOG_LEVEL", "INFO"),
+            fmt=os.getenv("LOG_FORMAT", "json").lower(),
+            sample_rate=float(os.getenv("LOG_SAMPLE_RATE", "1")),
+            sample_rates={route: float(rate) for route, rate in parse_mapping(os.getenv("LOG_SAMPLE_RATES", "")).items()},
+            queue_size=int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+        )
+        # httpx 默认为每个上游请求记录一条 INFO 日志，热路径上默认关闭，需要时可用 LOG_LEVELS 打开
+        _manager.set_levels({**DEFAULT_LOGGER_LEVELS, **parse_mapping(os.getenv("LOG_LEVELS", ""))})
+    return _manager
+
+
+def get_logging_manager() -> Optional[LoggingManager]:
+    return _manager
+
+
+class RequestContextMiddleware:
+    """
+    ASGI中间件：为每个请求设置请求ID (沿用请求头 X-Request-ID，否则生成) 和路由，按路由采样率
+    决定该请求的调试日志是否输出 (同一请求的日志要么全部输出、要么全部丢弃)，在响应头中返回请求ID，
+    并记录一条访问日志 (5xx 以 WARNING 级别记录，不受采样影响)。
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", ()):
+            if name == REQUEST_ID_HEADER.encode():
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex[:16]
+        route = route_from_path(scope.get("path", ""))
+        manager = _manager
+        tokens = (
+            request_id_var.set(request_id),
+            route_var.set(route),
+            sampled_var.set(manager.should_sample(route) if manager is not None else True),
+        )
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = {**message, "headers": [*message.get("headers", ()), (REQUEST_ID_HEADER.encode(), request_id.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            level = logging.WARNING if status_code >= 500 else logging.INFO
+            if log_enabled(access_logger, level):
+                access_logger.log(level, "请求完成", extra={
+                    "method": scope.get("method"),
+                    "path": scope.get("path"),
+                    "status": status_code,
+                    "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+                })
+            for var, token in zip((request_id_var, route_var, sampled_var), tokens):
+                var.reset(token)
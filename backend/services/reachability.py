@@ -0,0 +1,280 @@
+"""
+跨链可达矩阵：根据各桥支持的链和各链支持跨链的代币，计算 源链 × 目标链 × 资产 的可达关系，
+以位图存储，后台定期刷新，某条链的代币列表或桥列表更新时只重新计算受影响的链对
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from services.fanout import ChainFanout
+from services.token_equivalence import canonical_asset_id
+
+logger = logging.getLogger(__name__)
+
+
+def _bit_count(mask: int) -> int:
+    return bin(mask).count("1")
+
+
+class ReachabilityMatrix:
+    """
+    源链 × 目标链 × 资产 的可达矩阵。
+
+    - 每个资产 (canonical_asset_id，如 USDC 与 USDC.e 视为同一资产) 分配一个位，
+      每条链上支持跨链的资产是一个整数位图；
+    - 每个桥分配一个位，(源链, 目标链) 的桥位图表示哪些桥同时支持这两条链；
+    - 链对有桥可用时，可跨链的资产位图为两条链的资产位图按位与。
+
+    链对的结果整体替换 (写入后不再修改)，读取不需要加锁。
+    作为 ResponseCache 的刷新回调注册 (on_cache_update)，get_crosschain_tokens / get_bridge_info 加载或刷新后
+    只重新计算涉及变化的链对；start() 启动的后台任务每 refresh_interval 秒重新读取一次 (经过响应缓存)，
+    所以请求只读内存，不会给上游带来额外的负载。
+    """
+
+    # 请求在矩阵第一次构建完成前最多等待的时间（秒），超时时由调用方使用备用数据
+    READY_TIMEOUT = 3.0
+
+    def __init__(
+        self,
+        base_url: str = None,
+        refresh_interval: float = 300.0,
+        load_concurrency: int = 8,
+        load_timeout: float = 10.0,
+        is_popular: Callable[[str], bool] = None
+    ):
+        """
+        Args:
+            base_url: 只处理该 BASE_API_URL 下的缓存记录，None 表示不限制。
+            refresh_interval: 后台刷新的间隔（秒）。
+            load_concurrency: 同时加载代币列表的链数上限。
+            load_timeout: 每次刷新等待各链代币列表的最长时间（秒），超时的链完成后通过缓存回调生效。
+            is_popular: 根据代币符号判断是否为热门代币，热门资产排在前面。
+        """
+        self.base_url = base_url
+        self.refresh_interval = refresh_interval
+        self.is_popular = is_popular or (lambda symbol: False)
+        # {资产ID: 位}，位只增不减 (资产数量有限)
+        self._asset_bits: Dict[str, int] = {}
+        self._asset_names: List[str] = []
+        # {桥名称: 位}
+        self._bridge_bits: Dict[str, int] = {}
+        self._bridge_names: List[str] = []
+        # 用于跳过未变化的列表
+        self._token_sources: Dict[str, list] = {}
+        self._bridge_source: Optional[list] = None
+        # {链ID: 资产位图}
+        self._chain_assets: Dict[str, int] = {}
+        # {链ID: 支持该链的桥位图}
+        self._chain_bridges: Dict[str, int] = {}
+        # {(源链, 目标链): (资产位图, 桥位图)}，只保存有可跨链资产的链对
+        self._pairs: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._fanout = ChainFanout("跨链可达矩阵", concurrency=load_concurrency, timeout=load_timeout)
+        self._initial: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._stats = {"updates": 0, "update_time_total": 0.0, "refresh_errors": 0}
+
+    def on_cache_update(self, key: tuple, value: Any):
+        """ ResponseCache 的刷新回调：某条链支持跨链的代币列表或桥列表更新后，重新计算受影响的链对。 """
+        if len(key) < 2 or not isinstance(value, list):
+            return
+        if self.base_url is not None and key[0] != self.base_url:
+            return
+        if key[1] == "get_crosschain_tokens" and len(key) >= 3 and key[2]:
+            self.update_chain_tokens(key[2], value)
+        elif key[1] == "get_bridge_info":
+            self.update_bridges(value)
+
+    def _bit(self, bits: Dict[str, int], names: List[str], name: str) -> int:
+        bit = bits.get(name)
+        if bit is None:
+            bit = bits[name] = len(names)
+            names.append(name)
+        return bit
+
+    def update_chain_tokens(self, chain_id: str, tokens: List[Dict[str, Any]]):
+        """ 用该链支持跨链的代币列表更新资产位图，位图变化时重新计算该链参与的链对。 """
+        with self._lock:
+            if self._token_sources.get(chain_id) is tokens:
+                return
+            self._token_sources[chain_id] = tokens
+            mask = 0
+            for token in tokens:
+                asset = canonical_asset_id(token.get("tokenSymbol"))
+                if asset:
+                    mask |= 1 << self._bit(self._asset_bits, self._asset_names, asset)
+            if self._chain_assets.get(chain_id) == mask:
+                return
+            self._chain_assets[chain_id] = mask
+            self._rebuild_pairs({chain_id})
+
+    def update_bridges(self, bridges: List[Dict[str, Any]]):
+        """ 用桥列表 (每个桥的 supportedChains) 更新各链的桥位图，重新计算桥位图变化的链参与的链对。 """
+        with self._lock:
+            if self._bridge_source is bridges:
+                return
+            self._bridge_source = bridges
+            chain_bridges: Dict[str, int] = {}
+            for bridge in bridges:
+                name = bridge.get("bridgeName") or str(bridge.get("bridgeId", ""))
+                bit = 1 << self._bit(self._bridge_bits, self._bridge_names, name)
+                for chain_id in bridge.get("supportedChains") or []:
+                    chain_id = str(chain_id)
+                    chain_bridges[chain_id] = chain_bridges.get(chain_id, 0) | bit
+            changed = {
+                chain_id for chain_id in chain_bridges.keys() | self._chain_bridges.keys()
+                if chain_bridges.get(chain_id) != self._chain_bridges.get(chain_id)
+            }
+            self._chain_bridges = chain_bridges
+            if changed:
+                self._rebuild_pairs(changed)
+
+    def _rebuild_pairs(self, changed: set):
+        """ 重新计算至少一端在 changed 中的链对 (调用方持有锁)，结果整体替换。 """
+        started = time.perf_counter()
+        pairs = {pair: value for pair, value in self._pairs.items() if pair[0] not in changed and pair[1] not in changed}
+        chains = self._chain_assets.keys() | self._chain_bridges.keys()
+        for source in chains:
+            for target in chains:
+                if source == target or (source not in changed and target not in changed):
+                    continue
+                bridges = self._chain_bridges.get(source, 0) & self._chain_bridges.get(target, 0)
+                assets = self._chain_assets.get(source, 0) & self._chain_assets.get(target, 0)
+                if bridges and assets:
+                    pairs[(source, target)] = (assets, bridges)
+        self._pairs = pairs
+        self._stats["updates"] += 1
+        self._stats["update_time_total"] += time.perf_counter() - started
+
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def start(
+        self,
+        bridge_loader: Callable[[], Awaitable[List[Dict[str, Any]]]],
+        token_loader: Callable[[str], Awaitable[List[Dict[str, Any]]]]
+    ):
+        """
+        启动后台刷新任务 (需要在事件循环中调用)：立即构建一次，之后每 refresh_interval 秒刷新。
+
+        Args:
+            bridge_loader: 加载桥列表的协程函数。
+            token_loader: 加载某条链支持跨链的代币列表的协程函数，参数为链ID。
+        """
+        if self._refresh_task is None:
+            self._initial = asyncio.ensure_future(self._refresh(bridge_loader, token_loader))
+            self._refresh_task = asyncio.ensure_future(self._refresh_loop(bridge_loader, token_loader))
+
+    async def _refresh(
+        self,
+        bridge_loader: Callable[[], Awaitable[List[Dict[str, Any]]]],
+        token_loader: Callable[[str], Awaitable[List[Dict[str, Any]]]]
+    ):
+        """ 重新读取桥列表和各桥支持的链的代币列表 (经过响应缓存，未过期时不访问上游)。 """
+        async def load(chain_id: str):
+            self.update_chain_tokens(chain_id, await token_loader(chain_id))
+
+        try:
+            self.update_bridges(await bridge_loader())
+            # 每次都重新读取 (is_loaded 始终为 False)，最近加载失败的链在退避期内跳过
+            await self._fanout.run(sorted(self._chain_bridges), load, lambda chain_id: False)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # 刷新失败时继续使用已有的数据，下个周期重试
+            self._stats["refresh_errors"] += 1
+            logger.warning("刷新跨链可达矩阵失败: %s", e)
+            return
+        self._loaded_at = time.monotonic()
+        logger.debug("跨链可达矩阵已刷新: %d 条链，%d 个链对", len(self._chain_assets), len(self._pairs))
+
+    async def _refresh_loop(
+        self,
+        bridge_loader: Callable[[], Awaitable[List[Dict[str, Any]]]],
+        token_loader: Callable[[str], Awaitable[List[Dict[str, Any]]]]
+    ):
+        await self._initial
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self._refresh(bridge_loader, token_loader)
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待第一次构建完成，最多 timeout 秒 (默认 READY_TIMEOUT)。
+        返回矩阵是否可用 (已构建且至少有一个可达的链对；桥列表没有 supportedChains 时矩阵为空)。
+        """
+        if not self.is_loaded() and self._initial is not None and not self._initial.done():
+            try:
+                await asyncio.wait_for(asyncio.shield(self._initial), self.READY_TIMEOUT if timeout is None else timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.is_loaded() and bool(self._pairs)
+
+    def _assets(self, mask: int) -> List[str]:
+        """ 位图中的资产，热门资产在前，其余按名称排序。 """
+        names = []
+        while mask:
+            low = mask & -mask
+            names.append(self._asset_names[low.bit_length() - 1])
+            mask ^= low
+        names.sort(key=lambda name: (not self.is_popular(name), name))
+        return names
+
+    def _bridges(self, mask: int) -> List[str]:
+        return [name for bit, name in enumerate(self._bridge_names) if mask >> bit & 1]
+
+    def get_targets(self, source: str) -> Dict[str, Dict[str, Any]]:
+        """ 返回 {目标链ID: {"tokens": [资产, ...], "bridges": [桥名称, ...]}}，只包含有可跨链资产的目标链。 """
+        return {
+            target: {"tokens": self._assets(assets), "bridges": self._bridges(bridges)}
+            for (from_chain, target), (assets, bridges) in self._pairs.items()
+            if from_chain == source
+        }
+
+    def get_pairs(self) -> List[Dict[str, Any]]:
+        """ 所有有可跨链资产的 (源链, 目标链)，包含资产数和桥数。 """
+        return [
+            {"from": source, "to": target, "tokenCount": _bit_count(assets), "bridgeCount": _bit_count(bridges)}
+            for (source, target), (assets, bridges) in sorted(self._pairs.items())
+        ]
+
+    def get_chain_assets(self, chain_id: str) -> List[str]:
+        """ 该链上支持跨链的资产。 """
+        return self._assets(self._chain_assets.get(chain_id, 0))
+
+    def is_reachable(self, source: str, target: str, asset: str = None) -> bool:
+        """ 源链是否可以跨链到目标链 (指定资产时要求该资产在两条链上都支持)。 """
+        pair = self._pairs.get((source, target))
+        if pair is None:
+            return False
+        if asset is None:
+            return True
+        bit = self._asset_bits.get(canonical_asset_id(asset))
+        return bit is not None and bool(pair[0] >> bit & 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            updates = self._stats["updates"]
+            return {
+                "chains": len(self._chain_assets),
+                "assets": len(self._asset_names),
+                "bridges": len(self._bridge_names),
+                "pairs": len(self._pairs),
+                "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at is not None else None,
+                "updates": updates,
+                "avg_update_ms": round(self._stats["update_time_total"] / updates * 1000, 3) if updates else 0.0,
+                "refresh_errors": self._stats["refresh_errors"],
+                **self._fanout.get_stats(),
+            }
+
+    def shutdown(self):
+        """ 应用关闭时取消后台刷新任务和还在运行的加载任务。 """
+        for task in (self._refresh_task, self._initial):
+            if task is not None:
+                task.cancel()
+        self._refresh_task = None
+        self._fanout.cancel()
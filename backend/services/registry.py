@@ -0,0 +1,167 @@
+"""
+应用生命周期内共享的SDK客户端注册表：在 FastAPI lifespan 中创建一次，路由通过轻量的依赖获取
+"""
+
+import logging
+import os
+import sys
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Request
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+from okx_crosschain_sdk import (
+    AsyncAssetExplorer,
+    AsyncQuoter,
+    AsyncStatusTracker,
+    AsyncTransactionBuilder,
+    Config,
+    HedgePolicy,
+    MetricsCollector,
+    OnChainGateway,
+)
+from okx_crosschain_sdk.instrumentation import get_default_instrumentation
+
+from services.chain_registry import ChainRegistry
+from services.executor import SDKExecutor, create_executor
+from services.reachability import ReachabilityMatrix
+from services.sdk_config import build_sdk_config
+from services.status_watcher import StatusWatcher
+from services.token_equivalence import TokenEquivalenceIndex
+from services.token_index import TokenSearchIndex
+
+logger = logging.getLogger(__name__)
+
+
+class SDKRegistry:
+    """
+    所有请求共享的SDK客户端。
+
+    SDK对象本身不保存请求级的状态，共享的连接池、响应缓存、请求合并、限流器、熔断器和凭证池
+    都由 Config 持有 (进程内单例)，因此一组客户端可以安全地被并发请求共用，
+    不必在每个请求中重新读取环境变量、构建 Config 和SDK对象。
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        quote_hedge_policy: HedgePolicy = None,
+        executor: SDKExecutor = None,
+        token_popularity: Callable[[str], bool] = None
+    ):
+        """
+        Args:
+            config: 所有客户端共用的SDK配置。
+            quote_hedge_policy: 询价的对冲策略，None 表示不对冲。
+            executor: 路由共享的执行器，默认根据环境变量创建 (由注册表持有，aclose 时关闭)。
+            token_popularity: 根据代币符号判断是否为热门代币，用于代币搜索排序。
+        """
+        self.config = config
+        self.asset_explorer = AsyncAssetExplorer(config)
+        self.quoter = AsyncQuoter(config, hedge_policy=quote_hedge_policy)
+        self.status_tracker = AsyncStatusTracker(config)
+        self.transaction_builder = AsyncTransactionBuilder(config)
+        # 执行器的路由信号量绑定在创建它的事件循环上，每个注册表 (每次 lifespan) 各自持有一个
+        self._owns_executor = executor is None
+        self.executor = executor or create_executor()
+
+        # OnChainGateway 需要API Key，未配置时为None
+        self.onchain_gateway: Optional[OnChainGateway] = None
+        if config.credential_pool is not None:
+            try:
+                self.onchain_gateway = OnChainGateway(config)
+                logger.info("OnChainGateway 初始化成功 (API Key已配置)")
+            except Exception as e:
+                logger.warning("OnChainGateway 初始化失败: %s", e)
+        else:
+            logger.info("OnChainGateway 未初始化 (未配置API Key)")
+
+        # 汇总所有上游请求的计数和各阶段耗时 (连接、TLS、服务端处理、下载等)，见 /health/upstream
+        self.http_metrics = MetricsCollector()
+        get_default_instrumentation().add_post_response_hook(self.http_metrics)
+
+        # 代币列表加载或刷新后，在后台重建该链的搜索索引；跨链搜索并发加载各链代币列表的
+        # 并发数和最长等待时间见 OKX_TOKEN_SEARCH_CONCURRENCY / OKX_TOKEN_SEARCH_TIMEOUT
+        self.token_index = TokenSearchIndex(
+            base_url=config.BASE_API_URL,
+            is_popular=token_popularity,
+            load_concurrency=int(os.getenv("OKX_TOKEN_SEARCH_CONCURRENCY", "8")),
+            load_timeout=float(os.getenv("OKX_TOKEN_SEARCH_TIMEOUT", "3"))
+        )
+        # 各链支持跨链的代币列表加载或刷新后，重新计算受影响资产的跨链等价代币
+        self.token_equivalence = TokenEquivalenceIndex(base_url=config.BASE_API_URL)
+        # 支持的链与静态元数据合并后的注册表，每 OKX_CHAIN_REFRESH_INTERVAL 秒在后台刷新 (见 start)
+        self.chain_registry = ChainRegistry(
+            base_url=config.BASE_API_URL,
+            refresh_interval=float(os.getenv("OKX_CHAIN_REFRESH_INTERVAL", "300"))
+        )
+        # 源链 × 目标链 × 资产的可达矩阵，由桥列表和各链支持跨链的代币列表构建，
+        # 每 OKX_REACHABILITY_REFRESH_INTERVAL 秒在后台刷新 (见 start)
+        self.reachability = ReachabilityMatrix(
+            base_url=config.BASE_API_URL,
+            refresh_interval=float(os.getenv("OKX_REACHABILITY_REFRESH_INTERVAL", "300")),
+            load_concurrency=int(os.getenv("OKX_TOKEN_SEARCH_CONCURRENCY", "8")),
+            is_popular=token_popularity
+        )
+        # 后台自适应轮询交易状态并推送给订阅者，同一笔交易只有一路上游轮询
+        self.status_watcher = StatusWatcher(
+            self.status_tracker.get_transaction_status,
+            concurrency=int(os.getenv("OKX_STATUS_WATCH_CONCURRENCY", "8")),
+            max_watched=int(os.getenv("OKX_STATUS_WATCH_MAX", "10000"))
+        )
+        # 批量查询交易状态时同时进行的上游查询数
+        self.status_batch_concurrency = int(os.getenv("OKX_STATUS_BATCH_CONCURRENCY", "8"))
+        if config.response_cache is not None:
+            config.response_cache.add_listener(self.token_index.on_cache_update)
+            config.response_cache.add_listener(self.token_equivalence.on_cache_update)
+            config.response_cache.add_listener(self.chain_registry.on_cache_update)
+            config.response_cache.add_listener(self.reachability.on_cache_update)
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "SDKRegistry":
+        """
+        根据环境变量创建注册表：API Key、上游地址和录制/回放见 build_sdk_config，
+        OKX_QUOTE_HEDGING=true 开启询价对冲 (OKX_QUOTE_HEDGE_PERCENTILE / OKX_QUOTE_HEDGE_BUDGET)。
+        其他参数原样传给构造函数。
+        """
+        hedge_policy = None
+        if os.getenv("OKX_QUOTE_HEDGING", "").lower() == "true":
+            # 对冲策略在所有请求之间共享，以积累延迟样本和对冲预算
+            hedge_policy = HedgePolicy(
+                percentile=float(os.getenv("OKX_QUOTE_HEDGE_PERCENTILE", "95")),
+                budget_ratio=float(os.getenv("OKX_QUOTE_HEDGE_BUDGET", "0.05"))
+            )
+        return cls(build_sdk_config(), quote_hedge_policy=hedge_policy, **kwargs)
+
+    def start(self):
+        """ 在事件循环中启动后台任务 (链信息注册表和跨链可达矩阵的定期刷新)。 """
+        self.chain_registry.start(self.asset_explorer.get_supported_chains)
+        self.reachability.start(self.asset_explorer.get_bridge_info, self.asset_explorer.get_crosschain_tokens)
+
+    async def aclose(self):
+        """ 应用关闭时释放配置的异步连接池、注册表持有的执行器线程池和索引构建线程，停止后台刷新和轮询任务。 """
+        get_default_instrumentation().remove_hook(self.http_metrics)
+        if self.config.response_cache is not None:
+            self.config.response_cache.remove_listener(self.token_index.on_cache_update)
+            self.config.response_cache.remove_listener(self.token_equivalence.on_cache_update)
+            self.config.response_cache.remove_listener(self.chain_registry.on_cache_update)
+            self.config.response_cache.remove_listener(self.reachability.on_cache_update)
+        self.token_index.shutdown()
+        self.token_equivalence.shutdown()
+        self.chain_registry.shutdown()
+        self.reachability.shutdown()
+        self.status_watcher.shutdown()
+        # 关闭配置实际使用的异步传输 (默认传输、录制回放或自定义传输)，关闭后下次请求会重新创建连接池
+        await self.config.async_transport.aclose()
+        if self._owns_executor:
+            self.executor.shutdown()
+
+
+def get_registry(request: Request) -> SDKRegistry:
+    """ FastAPI 依赖：返回应用的SDK注册表 (在 lifespan 中创建)。 """
+    registry = getattr(request.app.state, "sdk", None)
+    if registry is None:
+        raise HTTPException(status_code=500, detail="OKX SDK未初始化")
+    return registry
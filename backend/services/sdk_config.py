@@ -0,0 +1,117 @@
+"""
+从环境变量构建SDK配置 (API凭证池)，供各路由共享
+"""
+
+import logging
+import os
+import sys
+import threading
+from typing import List, Optional
+
+# 添加项目根目录到Python路径
+sys.path.append(os.path.join(os.path.dirname(__file__), '../..'))
+
+from okx_crosschain_sdk import Config, Credential, CredentialPool, RateLimiter
+from okx_crosschain_sdk.cassette import CassetteTransport, AsyncCassetteTransport
+
+logger = logging.getLogger(__name__)
+
+_credential_pool: Optional[CredentialPool] = None
+_credential_pool_loaded = False
+_lock = threading.Lock()
+
+_cassette_transports: Optional[tuple] = None
+# 关闭客户端限流时使用的不限流限流器 (对本地模拟服务器压测时，避免OKX配额成为瓶颈)
+_unlimited_rate_limiter = RateLimiter(rates={})
+
+
+def load_credentials_from_env() -> List[Credential]:
+    """
+    从环境变量读取API凭证。
+
+    OKX_API_KEY / OKX_SECRET_KEY / OKX_PASSPHRASE 为第一组凭证，
+    OKX_API_KEY_2 / OKX_SECRET_KEY_2 / OKX_PASSPHRASE_2 起为额外的凭证 (编号连续)，
+    OKX_API_WEIGHT / OKX_API_WEIGHT_N 为可选的权重 (weighted 策略使用)。
+    三项不完整的凭证会被忽略。
+    """
+    credentials = []
+    index = 1
+    while True:
+        suffix = "" if index == 1 else f"_{index}"
+        api_key = os.getenv(f"OKX_API_KEY{suffix}")
+        secret_key = os.getenv(f"OKX_SECRET_KEY{suffix}")
+        passphrase = os.getenv(f"OKX_PASSPHRASE{suffix}")
+        if index > 1 and not api_key:
+            break
+        if api_key and secret_key and passphrase:
+            weight = float(os.getenv(f"OKX_API_WEIGHT{suffix}", "1"))
+            credentials.append(Credential(api_key, secret_key, passphrase, weight=weight, name=f"key{index}"))
+        index += 1
+    return credentials
+
+
+def get_credential_pool() -> Optional[CredentialPool]:
+    """
+    获取进程内共享的API凭证池，未配置API Key时返回None。
+
+    凭证池在所有请求之间共享，被停用的凭证在冷却结束前不会被任何请求选中。
+    策略由 OKX_CREDENTIAL_POLICY 指定 (lru / weighted / quota，默认 lru)。
+    """
+    global _credential_pool, _credential_pool_loaded
+    with _lock:
+        if not _credential_pool_loaded:
+            credentials = load_credentials_from_env()
+            if credentials:
+                policy = os.getenv("OKX_CREDENTIAL_POLICY", "lru").lower()
+                _credential_pool = CredentialPool(credentials, policy=policy)
+                logger.info("已加载 %d 组API Key (策略: %s)", len(credentials), policy)
+            else:
+                logger.warning("未配置API Key，使用无认证配置")
+            _credential_pool_loaded = True
+        return _credential_pool
+
+
+def get_cassette_transports() -> tuple:
+    """
+    获取进程内共享的录制/回放传输层 (同步, 异步)，未设置 OKX_CASSETTE_DIR 时返回 (None, None)。
+
+    OKX_CASSETTE_MODE 为 replay (默认，只回放)、record (录制线上响应) 或 once (缺失时录制)，
+    OKX_CASSETTE_LATENCY=true 时回放按录制时的耗时等待。
+    """
+    global _cassette_transports
+    with _lock:
+        if _cassette_transports is None:
+            cassette_dir = os.getenv("OKX_CASSETTE_DIR")
+            if cassette_dir:
+                mode = os.getenv("OKX_CASSETTE_MODE", "replay").lower()
+                simulate_latency = os.getenv("OKX_CASSETTE_LATENCY", "").lower() == "true"
+                _cassette_transports = (
+                    CassetteTransport(cassette_dir, mode, simulate_latency=simulate_latency),
+                    AsyncCassetteTransport(cassette_dir, mode, simulate_latency=simulate_latency),
+                )
+                logger.info("OKX API 录制/回放: %s (模式: %s)", cassette_dir, mode)
+            else:
+                _cassette_transports = (None, None)
+        return _cassette_transports
+
+
+def build_sdk_config() -> Config:
+    """
+    构建SDK配置：配置了API Key时使用共享的凭证池签名，否则使用无认证的默认配置。
+
+    OKX_BASE_API_URL 可把上游指向本地模拟服务器 (mock_okx_server.py)，
+    OKX_CASSETTE_DIR 可从录制记录回放上游响应，两者都用于离线开发和压测；
+    OKX_CLIENT_RATE_LIMIT=false 关闭按OKX配额设置的客户端限流 (仅用于对模拟服务器压测)。
+    """
+    transport, async_transport = get_cassette_transports()
+    client_rate_limit = os.getenv("OKX_CLIENT_RATE_LIMIT", "true").lower() != "false"
+    config = Config(
+        credentials=get_credential_pool(),
+        transport=transport,
+        async_transport=async_transport,
+        rate_limiter=None if client_rate_limit else _unlimited_rate_limiter
+    )
+    base_api_url = os.getenv("OKX_BASE_API_URL")
+    if base_api_url:
+        config.BASE_API_URL = base_api_url.rstrip("/")
+    return config
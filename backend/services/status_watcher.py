@@ -0,0 +1,275 @@
+"""
+交易状态监视器：在后台按交易所处阶段和已等待的时间自适应地轮询上游状态，
+把状态变化推送给所有订阅者，同一笔交易不论有多少客户端在看，都只有一路上游轮询
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# 交易所处的阶段
+PHASE_SUBMITTED = "submitted"   # 已提交，等待源链确认
+PHASE_BRIDGING = "bridging"     # 源链已确认，等待跨链桥和目标链
+PHASE_FINAL = "final"           # 成功、失败或退款，不会再变化
+
+_FINAL_STATES = {"SUCCESS", "FAILURE", "FAILED", "REFUND", "COMPLETED", "CANCELLED", "TIMEOUT"}
+_BRIDGING_STATES = {"FROM_SUCCESS", "BRIDGE_PENDING", "BRIDGE_SUCCESS", "BRIDGING", "CONFIRMING"}
+
+# 推送给订阅者的事件类型
+EVENT_STATUS = "status"   # 状态变化 (订阅时先推送最近一次的状态)
+EVENT_ERROR = "error"     # 查询上游失败，监视继续
+EVENT_END = "end"         # 监视结束 (进入终态、超过最长监视时间或监视器关闭)，之后不再有事件
+
+
+def status_phase(status_info: Optional[Dict[str, Any]]) -> str:
+    """
+    根据状态信息判断交易所处的阶段，依次参考 detailStatus、status 和 state
+    (OKX 的 status 只有 PENDING / SUCCESS / FAILURE，detailStatus 更细)。
+    """
+    if not status_info:
+        return PHASE_SUBMITTED
+    for field in ("detailStatus", "status", "state"):
+        value = str(status_info.get(field) or "").upper()
+        if value in _FINAL_STATES:
+            return PHASE_FINAL
+        if value in _BRIDGING_STATES:
+            return PHASE_BRIDGING
+        if value:
+            return PHASE_SUBMITTED
+    return PHASE_SUBMITTED
+
+
+class _Watch:
+    """ 一笔被监视的交易。 """
+
+    __slots__ = ("tx_id", "started_at", "last_interest", "status", "phase", "checked_at",
+                 "polls", "errors", "subscribers", "task", "ended")
+
+    def __init__(self, tx_id: str, now: float):
+        self.tx_id = tx_id
+        self.started_at = now
+        self.last_interest = now
+        self.status: Optional[Dict[str, Any]] = None
+        self.phase = PHASE_SUBMITTED
+        self.checked_at: Optional[float] = None
+        self.polls = 0
+        self.errors = 0
+        self.subscribers: Set[asyncio.Queue] = set()
+        self.task: Optional[asyncio.Task] = None
+        self.ended: Optional[str] = None
+
+
+class StatusWatcher:
+    """
+    交易状态监视器。
+
+    每笔被监视的交易有一个后台轮询任务，轮询间隔随阶段和已等待的时间调整：
+    - 刚提交 (submitted) 时每 FAST_INTERVAL 秒查询一次，尽快发现源链确认；
+    - 跨链中 (bridging) 每 BRIDGING_INTERVAL 秒查询一次，桥通常需要几分钟；
+    - 交易每多等待 SLOWDOWN_AFTER 秒间隔翻倍，上游连续失败时也翻倍，最长 MAX_INTERVAL 秒；
+    - 进入终态后推送最后一次状态和 end 事件并停止轮询，结果再保留 RETAIN_FINISHED 秒供读取。
+
+    没有订阅者且 IDLE_TIMEOUT 秒内没有读取的交易、以及监视超过 MAX_WATCH_TIME 秒的交易停止监视。
+    所有交易的上游查询共享 concurrency 个并发名额。
+    """
+
+    FAST_INTERVAL = 2.0
+    BRIDGING_INTERVAL = 10.0
+    MAX_INTERVAL = 60.0
+    SLOWDOWN_AFTER = 300.0
+    IDLE_TIMEOUT = 600.0
+    MAX_WATCH_TIME = 7200.0
+    RETAIN_FINISHED = 600.0
+    # 每个订阅者最多缓存的事件数，客户端读取太慢时丢弃最旧的事件
+    SUBSCRIBER_QUEUE_SIZE = 16
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[Optional[Dict[str, Any]]]],
+        concurrency: int = 8,
+        max_watched: int = 10000
+    ):
+        """
+        Args:
+            fetch: 查询一笔交易状态的协程函数，参数为交易ID，未找到时返回None，失败时抛出异常。
+            concurrency: 同时进行的上游查询数上限。
+            max_watched: 同时监视的交易数上限。
+        """
+        self.fetch = fetch
+        self.concurrency = concurrency
+        self.max_watched = max_watched
+        self._watches: Dict[str, _Watch] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._stats = {"watched_total": 0, "polls": 0, "poll_errors": 0, "events": 0, "dropped_events": 0, "rejected": 0}
+
+    def next_interval(self, watch: _Watch, now: float) -> float:
+        """ 下一次查询前等待的时间（秒）。 """
+        base = self.BRIDGING_INTERVAL if watch.phase == PHASE_BRIDGING else self.FAST_INTERVAL
+        # 交易越久没有完成，越不可能马上完成；上游连续失败时同样退避
+        doublings = int((now - watch.started_at) // self.SLOWDOWN_AFTER) + watch.errors
+        return min(self.MAX_INTERVAL, base * 2 ** min(doublings, 16))
+
+    def watch(self, tx_id: str, status_info: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        开始监视一笔交易 (已在监视时只更新最近一次读取的时间)，需要在事件循环中调用。
+
+        Args:
+            tx_id: 交易ID。
+            status_info: 调用方刚查询到的状态，作为初始状态 (省去一次上游查询)。
+
+        Returns:
+            是否在监视 (达到 max_watched 时不再接受新的交易)。
+        """
+        now = time.monotonic()
+        watch = self._watches.get(tx_id)
+        if watch is not None:
+            watch.last_interest = now
+            return True
+        if len(self._watches) >= self.max_watched:
+            self._stats["rejected"] += 1
+            return False
+
+        watch = self._watches[tx_id] = _Watch(tx_id, now)
+        self._stats["watched_total"] += 1
+        if status_info is not None:
+            self._apply(watch, status_info, now)
+        if watch.phase == PHASE_FINAL:
+            watch.ended = PHASE_FINAL
+            watch.task = asyncio.ensure_future(self._expire(watch, self.RETAIN_FINISHED))
+        else:
+            watch.task = asyncio.ensure_future(self._run(watch, immediate=status_info is None))
+        return True
+
+    def get_status(self, tx_id: str) -> Optional[Dict[str, Any]]:
+        """ 被监视的交易最近一次查询到的状态 (不访问上游)，没有监视或还没有查询到时返回None。 """
+        watch = self._watches.get(tx_id)
+        if watch is None or watch.status is None:
+            return None
+        watch.last_interest = time.monotonic()
+        return watch.status
+
+    def subscribe(self, tx_id: str) -> Optional[asyncio.Queue]:
+        """
+        订阅一笔交易的状态事件 (同时开始监视)，返回事件队列，达到监视上限时返回None。
+        队列中的事件为 {"type": status / error / end, ...}，已有状态时先收到最近一次的状态。
+        用完后调用 unsubscribe。
+        """
+        if not self.watch(tx_id):
+            return None
+        watch = self._watches[tx_id]
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.SUBSCRIBER_QUEUE_SIZE)
+        if watch.status is not None:
+            queue.put_nowait(self._status_event(watch))
+        if watch.ended is not None:
+            queue.put_nowait({"type": EVENT_END, "reason": watch.ended})
+        else:
+            watch.subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, tx_id: str, queue: asyncio.Queue):
+        watch = self._watches.get(tx_id)
+        if watch is not None:
+            watch.subscribers.discard(queue)
+            watch.last_interest = time.monotonic()
+
+    def _status_event(self, watch: _Watch) -> Dict[str, Any]:
+        return {"type": EVENT_STATUS, "phase": watch.phase, "status": watch.status}
+
+    def _publish(self, watch: _Watch, event: Dict[str, Any]):
+        self._stats["events"] += 1
+        for queue in watch.subscribers:
+            if queue.full():
+                # 订阅者读取太慢：丢弃最旧的事件，保留最新的状态
+                queue.get_nowait()
+                self._stats["dropped_events"] += 1
+            queue.put_nowait(event)
+
+    def _apply(self, watch: _Watch, status_info: Optional[Dict[str, Any]], now: float) -> bool:
+        """ 记录查询结果，返回状态是否发生变化。 """
+        watch.checked_at = now
+        if status_info is None or status_info == watch.status:
+            return False
+        watch.status = status_info
+        watch.phase = status_phase(status_info)
+        return True
+
+    async def _run(self, watch: _Watch, immediate: bool):
+        """ 一笔交易的轮询任务。 """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        reason = "closed"
+        try:
+            delay = 0.0 if immediate else self.next_interval(watch, time.monotonic())
+            while True:
+                await asyncio.sleep(delay)
+                now = time.monotonic()
+                if now - watch.started_at >= self.MAX_WATCH_TIME:
+                    reason = "expired"
+                    break
+                if not watch.subscribers and now - watch.last_interest >= self.IDLE_TIMEOUT:
+                    reason = "idle"
+                    break
+
+                try:
+                    async with self._semaphore:
+                        status_info = await self.fetch(watch.tx_id)
+                except Exception as e:
+                    watch.errors += 1
+                    self._stats["poll_errors"] += 1
+                    logger.debug("查询交易 %s 状态失败: %s", watch.tx_id, e)
+                    self._publish(watch, {"type": EVENT_ERROR, "message": str(e)})
+                else:
+                    watch.errors = 0
+                    if self._apply(watch, status_info, time.monotonic()):
+                        self._publish(watch, self._status_event(watch))
+                finally:
+                    watch.polls += 1
+                    self._stats["polls"] += 1
+
+                if watch.phase == PHASE_FINAL:
+                    reason = PHASE_FINAL
+                    break
+                delay = self.next_interval(watch, time.monotonic())
+        finally:
+            watch.ended = reason
+            self._publish(watch, {"type": EVENT_END, "reason": reason})
+            watch.subscribers.clear()
+
+        if reason == PHASE_FINAL:
+            # 终态的结果再保留一段时间，供之后的读取和订阅直接返回
+            await self._expire(watch, self.RETAIN_FINISHED)
+        else:
+            self._remove(watch)
+
+    async def _expire(self, watch: _Watch, delay: float):
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self._remove(watch)
+
+    def _remove(self, watch: _Watch):
+        if self._watches.get(watch.tx_id) is watch:
+            del self._watches[watch.tx_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        phases: Dict[str, int] = {}
+        subscribers = 0
+        for watch in self._watches.values():
+            phases[watch.phase] = phases.get(watch.phase, 0) + 1
+            subscribers += len(watch.subscribers)
+        return {
+            "watched": len(self._watches),
+            "phases": phases,
+            "subscribers": subscribers,
+            **self._stats,
+        }
+
+    def shutdown(self):
+        """ 应用关闭时停止所有轮询任务 (订阅者收到 end 事件)。 """
+        for watch in list(self._watches.values()):
+            if watch.task is not None:
+                watch.task.cancel()
+        self._watches.clear()
@@ -0,0 +1,184 @@
+"""
+跨链代币等价关系：根据各链支持跨链的代币列表，预先计算每个 (链, 代币地址) 在其他链上的等价代币，
+某条链的列表刷新时只重新计算受影响的资产
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from services.fanout import ChainFanout
+from services.token_index import normalize_address
+
+logger = logging.getLogger(__name__)
+
+# 桥接版本的符号后缀，如 Avalanche 上的 USDC.e 与原生 USDC 是同一资产
+_BRIDGED_SUFFIXES = (".E",)
+
+
+def canonical_asset_id(symbol: str) -> str:
+    """ 资产的规范ID：大写的代币符号，去掉桥接版本的后缀 (USDC.e -> USDC)。 """
+    asset = (symbol or "").strip().upper()
+    for suffix in _BRIDGED_SUFFIXES:
+        if asset.endswith(suffix) and len(asset) > len(suffix):
+            return asset[:-len(suffix)]
+    return asset
+
+
+def _address(token: Dict[str, Any]) -> str:
+    return normalize_address(token.get("tokenContractAddress"))
+
+
+class TokenEquivalenceIndex:
+    """
+    跨链代币等价关系图。
+
+    节点是 (链, 代币地址)，同一资产 (canonical_asset_id 相同) 在不同链上的代币互相连边。
+    每个节点在其他各链上的等价代币预先算好，查询只需一次字典访问；目标链上有多个同资产的代币时
+    优先选择符号完全相同的 (USDC 对应 USDC 而不是 USDC.e)。
+
+    作为 ResponseCache 的刷新回调注册 (on_cache_update)，某条链的 get_crosschain_tokens 加载或刷新后，
+    只重新计算该链旧列表和新列表中出现的资产。各链的列表只有几十到几百个代币，计算在回调中直接完成。
+    """
+
+    # 已加载的链超过这段时间 (秒) 后，下次查询时在后台重新读取 (经过响应缓存，过期时触发刷新)
+    REFRESH_INTERVAL = 300.0
+
+    def __init__(self, base_url: str = None, load_concurrency: int = 8, load_timeout: float = 3.0):
+        """
+        Args:
+            base_url: 只处理该 BASE_API_URL 下的缓存记录，None 表示不限制。
+            load_concurrency: 同时加载的链数上限。
+            load_timeout: ensure_chains 默认的最长等待时间（秒）。
+        """
+        self.base_url = base_url
+        # {链ID: 原始列表}，用于跳过未变化的列表
+        self._sources: Dict[str, list] = {}
+        # {链ID: {规范化地址: 代币}}
+        self._tokens: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._loaded_at: Dict[str, float] = {}
+        # {资产ID: {链ID: [代币, ...]}}
+        self._assets: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+        # {(链ID, 规范化地址): {目标链ID: 等价代币}}，值在写入后不再修改，读取不需要加锁
+        self._paths: Dict[Tuple[str, str], Dict[str, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._fanout = ChainFanout("代币等价关系", concurrency=load_concurrency, timeout=load_timeout)
+        self._stats = {"updates": 0, "update_time_total": 0.0, "lookups": 0}
+
+    def on_cache_update(self, key: tuple, value: Any):
+        """ ResponseCache 的刷新回调：某条链支持跨链的代币列表更新后，重新计算受影响的资产。 """
+        if len(key) < 3 or key[1] != "get_crosschain_tokens" or not key[2] or not isinstance(value, list):
+            return
+        if self.base_url is not None and key[0] != self.base_url:
+            return
+        self.update_chain(key[2], value)
+
+    def update_chain(self, chain_id: str, tokens: List[Dict[str, Any]]):
+        """ 用该链的新列表替换旧列表，只重新计算新旧列表中出现的资产。 """
+        started = time.perf_counter()
+        with self._lock:
+            self._loaded_at[chain_id] = time.monotonic()
+            if self._sources.get(chain_id) is tokens:
+                return
+            self._sources[chain_id] = tokens
+
+            new_tokens: Dict[str, Dict[str, Any]] = {}
+            for token in tokens:
+                address = _address(token)
+                if address and token.get("tokenSymbol"):
+                    new_tokens.setdefault(address, token)
+            old_tokens = self._tokens.get(chain_id, {})
+            self._tokens[chain_id] = new_tokens
+
+            affected = set()
+            for token in old_tokens.values():
+                asset = canonical_asset_id(token["tokenSymbol"])
+                affected.add(asset)
+                group = self._assets.get(asset)
+                if group is not None:
+                    group.pop(chain_id, None)
+                    if not group:
+                        del self._assets[asset]
+            for address in old_tokens.keys() - new_tokens.keys():
+                self._paths.pop((chain_id, address), None)
+            for token in new_tokens.values():
+                asset = canonical_asset_id(token["tokenSymbol"])
+                affected.add(asset)
+                self._assets.setdefault(asset, {}).setdefault(chain_id, []).append(token)
+
+            for asset in affected:
+                self._link(asset)
+            elapsed = time.perf_counter() - started
+            self._stats["updates"] += 1
+            self._stats["update_time_total"] += elapsed
+        logger.debug("链 %s 跨链代币等价关系已更新: %d 个代币，%d 个资产，耗时 %.1fms",
+                     chain_id, len(new_tokens), len(affected), elapsed * 1000)
+
+    def _link(self, asset: str):
+        """ 重新计算某个资产在各链上的每个代币的等价代币。 """
+        group = self._assets.get(asset, {})
+        for chain_id, tokens in group.items():
+            for token in tokens:
+                symbol = token.get("tokenSymbol")
+                targets = {}
+                for target_chain, candidates in group.items():
+                    if target_chain != chain_id:
+                        targets[target_chain] = next((t for t in candidates if t.get("tokenSymbol") == symbol), candidates[0])
+                self._paths[(chain_id, _address(token))] = targets
+
+    async def ensure_chains(
+        self,
+        loader: Callable[[str], Awaitable[List[Dict[str, Any]]]],
+        chain_ids: Iterable[str],
+        timeout: Optional[float] = None
+    ) -> Dict[str, str]:
+        """
+        并发加载还没有加载过的链，最多等待 timeout 秒；已加载超过 REFRESH_INTERVAL 的链在后台重新读取。
+
+        Args:
+            loader: 加载某条链支持跨链的代币列表的协程函数，参数为链ID。
+            chain_ids: 需要的链。
+            timeout: 最长等待时间（秒）。
+
+        Returns:
+            {链ID: 状态}，状态为 ok / timeout / unsupported / error。
+        """
+        async def load(chain_id: str):
+            self.update_chain(chain_id, await loader(chain_id))
+
+        chain_ids = list(dict.fromkeys(chain_ids))
+        now = time.monotonic()
+        for chain_id in chain_ids:
+            loaded_at = self._loaded_at.get(chain_id)
+            if loaded_at is not None and now - loaded_at >= self.REFRESH_INTERVAL:
+                self._fanout.start(chain_id, load)
+        return await self._fanout.run(chain_ids, load, self.has_chain, timeout)
+
+    def has_chain(self, chain_id: str) -> bool:
+        return chain_id in self._tokens
+
+    def get_token(self, chain_id: str, token_address: str) -> Optional[Dict[str, Any]]:
+        """ 该链支持跨链的代币中地址对应的代币，不存在时返回None。 """
+        return self._tokens.get(chain_id, {}).get(normalize_address(token_address))
+
+    def get_equivalents(self, chain_id: str, token_address: str) -> Dict[str, Dict[str, Any]]:
+        """ 返回 {目标链ID: 等价代币}，不包含源链。返回的字典和代币应视为只读。 """
+        self._stats["lookups"] += 1
+        return self._paths.get((chain_id, normalize_address(token_address)), {})
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            updates = self._stats["updates"]
+            return {
+                "chains": len(self._tokens),
+                "tokens": len(self._paths),
+                "assets": len(self._assets),
+                "updates": updates,
+                "avg_update_ms": round(self._stats["update_time_total"] / updates * 1000, 2) if updates else 0.0,
+                "lookups": self._stats["lookups"],
+                **self._fanout.get_stats(),
+            }
+
+    def shutdown(self):
+        self._fanout.cancel()
@@ -0,0 +1,415 @@
+"""
+跨链代币搜索索引：基于响应缓存中的代币列表构建前缀索引和三元组 (trigram) 倒排索引，
+某条链的代币列表刷新时只重建该链的索引
+"""
+
+import asyncio
+import heapq
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from services.fanout import ChainFanout
+
+logger = logging.getLogger(__name__)
+
+# 匹配质量，越小越靠前
+MATCH_SYMBOL_EXACT = 0
+MATCH_SYMBOL_PREFIX = 1
+MATCH_ADDRESS_EXACT = 2
+MATCH_NAME_PREFIX = 3
+MATCH_ADDRESS_PREFIX = 4
+MATCH_SYMBOL_SUBSTRING = 5
+MATCH_NAME_SUBSTRING = 6
+
+NGRAM = 3
+# 短关键词 (少于 NGRAM 个字符) 匹配的代币最多，结果按 (关键词, limit) 缓存在各链的索引中，
+# 短关键词的组合数有限，缓存大小另设上限
+SHORT_QUERY_CACHE_SIZE = 4096
+
+_WORD_SPLIT = re.compile(r"[^0-9a-z]+")
+# 大于任何代币文本中出现的字符，query + _MAX_CHAR 是以 query 为前缀的字符串的上界
+_MAX_CHAR = "\U0010ffff"
+
+
+_HEX_ADDRESS = re.compile(r"0[xX][0-9a-fA-F]+")
+
+
+def get_token_address(token: Dict[str, Any]) -> str:
+    """ 代币的合约地址 (OKX 接口返回 tokenContractAddress，部分增强后的数据使用 tokenAddress)。 """
+    return token.get("tokenContractAddress") or token.get("tokenAddress") or ""
+
+
+def normalize_address(address: str) -> str:
+    """
+    规范化合约地址用于查找：0x 开头的十六进制地址 (EVM、Sui、Aptos 等) 不区分大小写，统一转为小写
+    (与校验和地址等价)；其他地址 (如 Solana、Tron 的 base58 地址) 区分大小写，保持原样。
+    """
+    address = (address or "").strip()
+    return address.lower() if _HEX_ADDRESS.fullmatch(address) else address
+
+
+def _ngrams(text: str) -> Iterable[str]:
+    return (text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1))
+
+
+class _PrefixIndex:
+    """ 按 (词, 代币序号) 排序的词表，二分查找以某个前缀开头的所有词。 """
+
+    __slots__ = ("terms", "docs")
+
+    def __init__(self, entries: List[Tuple[str, int]]):
+        entries.sort()
+        self.terms = [term for term, _ in entries]
+        self.docs = [doc for _, doc in entries]
+
+    def ranges(self, query: str, limit: Optional[int]) -> Tuple[List[int], List[int]]:
+        """
+        返回 (与 query 完全相同的词对应的代币序号, 以 query 为前缀但不相同的词对应的代币序号)。
+
+        同一个词的代币序号是升序的，完全匹配部分只需取前 limit 个；前缀部分包含多个词，需由调用方再取最小的。
+        """
+        terms = self.terms
+        lo = bisect_left(terms, query)
+        exact_end = bisect_right(terms, query, lo)
+        hi = bisect_left(terms, query + _MAX_CHAR, exact_end)
+        exact_stop = min(exact_end, lo + limit) if limit else exact_end
+        return self.docs[lo:exact_stop], self.docs[exact_end:hi]
+
+
+class ChainTokenIndex:
+    """
+    一条链的代币索引，构建后只读，可以在不加锁的情况下被并发查询。
+
+    代币按 (非热门, 符号长度, 符号) 预先排序后编号，序号越小排名越靠前，因此同一匹配质量内
+    取前 k 个只需要取最小的 k 个序号，倒排表也天然按排名有序。
+
+    - 地址索引：规范化的合约地址 (normalize_address) 到代币的字典，按地址查找为 O(1)；
+    - 前缀索引：代币符号、名称 (及名称中的每个单词) 和合约地址 (小写) 各一个有序词表；
+    - 三元组 (trigram) 索引：符号和名称的每个长度为3的子串到代币序号的倒排表，用于子串匹配
+      (关键词不少于3个字符时)，按排名顺序遍历最短的倒排表并校验，找够 k 个即停止。
+    """
+
+    __slots__ = ("chain_id", "source", "tokens", "symbols", "names", "rank_keys", "by_address",
+                 "symbol_prefix", "name_prefix", "address_prefix", "symbol_ngrams", "name_ngrams", "_short_queries")
+
+    def __init__(self, chain_id: str, tokens: List[Dict[str, Any]], is_popular: Callable[[str], bool] = None):
+        """
+        Args:
+            chain_id: 链ID。
+            tokens: 该链的代币列表 (响应缓存中的原始列表，不会被修改或复制)。
+            is_popular: 根据代币符号判断是否为热门代币，用于排序。
+        """
+        self.chain_id = chain_id
+        self.source = tokens
+        symbols = [(token.get("tokenSymbol") or "").lower() for token in tokens]
+        rank_keys = [
+            (not is_popular(symbol) if is_popular is not None else False, len(symbol), symbol)
+            for symbol in symbols
+        ]
+        order = sorted(range(len(tokens)), key=rank_keys.__getitem__)
+        self.tokens = [tokens[i] for i in order]
+        self.symbols = [symbols[i] for i in order]
+        self.rank_keys = [rank_keys[i] for i in order]
+        self.names = [(token.get("tokenName") or "").lower() for token in self.tokens]
+
+        by_address: Dict[str, Dict[str, Any]] = {}
+        symbol_entries, name_entries, address_entries = [], [], []
+        symbol_ngrams: Dict[str, List[int]] = defaultdict(list)
+        name_ngrams: Dict[str, List[int]] = defaultdict(list)
+        for doc, token in enumerate(self.tokens):
+            symbol, name = self.symbols[doc], self.names[doc]
+            raw_address = get_token_address(token)
+            if raw_address:
+                # 同一地址出现多次时保留排名最靠前的
+                by_address.setdefault(normalize_address(raw_address), token)
+            address = raw_address.lower()
+            if symbol:
+                symbol_entries.append((symbol, doc))
+            if name:
+                name_entries.append((name, doc))
+                name_entries.extend((word, doc) for word in set(_WORD_SPLIT.split(name)) if word and word != name)
+            if address:
+                address_entries.append((address, doc))
+            for gram in {symbol[i:i + NGRAM] for i in range(len(symbol) - NGRAM + 1)}:
+                symbol_ngrams[gram].append(doc)
+            for gram in {name[i:i + NGRAM] for i in range(len(name) - NGRAM + 1)}:
+                name_ngrams[gram].append(doc)
+
+        self.by_address = by_address
+        self.symbol_prefix = _PrefixIndex(symbol_entries)
+        self.name_prefix = _PrefixIndex(name_entries)
+        self.address_prefix = _PrefixIndex(address_entries)
+        self.symbol_ngrams = dict(symbol_ngrams)
+        self.name_ngrams = dict(name_ngrams)
+        self._short_queries: Dict[Tuple[str, Optional[int]], List[Tuple[int, int]]] = {}
+
+    def _substring_candidates(self, ngrams: Dict[str, List[int]], query: str) -> List[int]:
+        """ 包含 query 所有三元组的代币都在最短的倒排表中，返回该表 (按排名有序，需再校验)。 """
+        shortest = None
+        for gram in set(_ngrams(query)):
+            postings = ngrams.get(gram)
+            if postings is None:
+                return []
+            if shortest is None or len(postings) < len(shortest):
+                shortest = postings
+        return shortest or []
+
+    def top_matches(self, query: str, limit: Optional[int]) -> List[Tuple[int, int]]:
+        """
+        返回排名最靠前的 limit 个匹配 [(匹配质量, 代币序号), ...]，query 需已转为小写。
+
+        按匹配质量从高到低逐层收集，已经找够 limit 个时不再查看更低的层。
+        """
+        if len(query) < NGRAM:
+            key = (query, limit)
+            matches = self._short_queries.get(key)
+            if matches is None:
+                matches = self._top_matches(query, limit)
+                if len(self._short_queries) < SHORT_QUERY_CACHE_SIZE:
+                    self._short_queries[key] = matches
+            return matches
+        return self._top_matches(query, limit)
+
+    def _top_matches(self, query: str, limit: Optional[int]) -> List[Tuple[int, int]]:
+        selected: Dict[int, int] = {}
+
+        def take(quality: int, docs: List[int]):
+            # 前面的层最多占用 len(selected) 个名额，多取这么多个保证去重后仍有 limit 个
+            if limit and len(docs) > limit + len(selected):
+                docs = heapq.nsmallest(limit + len(selected), docs)
+            for doc in docs:
+                if doc not in selected:
+                    selected[doc] = quality
+
+        def enough() -> bool:
+            return bool(limit) and len(selected) >= limit
+
+        # 进入每一层时已选中的少于 limit 个，每层最多需要 2 * limit 个才能在去重后补足
+        extra = limit * 2 if limit else None
+        symbol_exact, symbol_prefix = self.symbol_prefix.ranges(query, extra)
+        address_exact, address_prefix = self.address_prefix.ranges(query, extra)
+        name_exact, name_prefix = self.name_prefix.ranges(query, extra)
+        tiers = (
+            (MATCH_SYMBOL_EXACT, symbol_exact),
+            (MATCH_SYMBOL_PREFIX, symbol_prefix),
+            (MATCH_ADDRESS_EXACT, address_exact),
+            (MATCH_NAME_PREFIX, name_exact),
+            (MATCH_NAME_PREFIX, name_prefix),
+            (MATCH_ADDRESS_PREFIX, address_prefix),
+        )
+        for quality, docs in tiers:
+            if enough():
+                break
+            take(quality, docs)
+
+        if len(query) >= NGRAM:
+            for quality, ngrams, texts in (
+                (MATCH_SYMBOL_SUBSTRING, self.symbol_ngrams, self.symbols),
+                (MATCH_NAME_SUBSTRING, self.name_ngrams, self.names),
+            ):
+                if enough():
+                    break
+                # 倒排表按排名有序，本层找够 limit 个即可停止
+                target = limit + len(selected) if limit else None
+                for doc in self._substring_candidates(ngrams, query):
+                    if doc not in selected and query in texts[doc]:
+                        selected[doc] = quality
+                        if target is not None and len(selected) >= target:
+                            break
+
+        matches = sorted((quality, doc) for doc, quality in selected.items())
+        return matches[:limit] if limit else matches
+
+
+class TokenSearchIndex:
+    """
+    所有链的代币搜索索引。
+
+    作为 ResponseCache 的刷新回调注册 (on_cache_update)，某条链的 get_token_list 加载或刷新后，
+    在后台线程中重建该链的索引并整体替换，查询始终读到某个完整版本的索引，不需要加锁。
+    查询按匹配质量 (符号完全匹配 > 符号前缀 > 地址完全匹配 > 名称前缀 > 地址前缀 > 符号子串 > 名称子串)、
+    热门程度、符号长度排序，返回前 k 个。
+    """
+
+    def __init__(
+        self,
+        base_url: str = None,
+        is_popular: Callable[[str], bool] = None,
+        load_concurrency: int = 8,
+        load_timeout: float = 3.0
+    ):
+        """
+        Args:
+            base_url: 只索引该 BASE_API_URL 下的缓存记录，None 表示不限制。
+            is_popular: 根据代币符号判断是否为热门代币，热门代币排在同一匹配质量的前面。
+            load_concurrency: load_chains 同时加载的链数上限 (所有搜索共享)。
+            load_timeout: load_chains 默认的最长等待时间（秒）。
+        """
+        self.base_url = base_url
+        self.is_popular = is_popular
+        # 加载各链代币列表的并发上限、截止时间和失败退避，所有搜索共享
+        self._fanout = ChainFanout("代币索引", concurrency=load_concurrency, timeout=load_timeout)
+        self._chains: Dict[str, ChainTokenIndex] = {}
+        # 每条链最多一个排队中的构建任务，排队期间到达的新列表替换旧列表
+        self._pending: Dict[str, list] = {}
+        self._builds: Dict[str, Future] = {}
+        # 正在构建的 (代币列表, Future)，同一个列表不重复构建
+        self._building: Dict[str, Tuple[list, Future]] = {}
+        self._lock = threading.Lock()
+        self._builder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="token-index")
+        self._stats = {"builds": 0, "build_time_total": 0.0, "searches": 0}
+
+    def on_cache_update(self, key: tuple, value: Any):
+        """ ResponseCache 的刷新回调：某条链的代币列表更新后，安排重建该链的索引。 """
+        if len(key) < 3 or key[1] != "get_token_list" or not key[2] or not isinstance(value, list):
+            return
+        if self.base_url is not None and key[0] != self.base_url:
+            return
+        self.schedule_update(key[2], value)
+
+    def schedule_update(self, chain_id: str, tokens: List[Dict[str, Any]]) -> Future:
+        """ 安排在后台线程中重建该链的索引，返回的 Future 在索引替换完成后得到新的 ChainTokenIndex。 """
+        with self._lock:
+            current = self._chains.get(chain_id)
+            if current is not None and current.source is tokens and chain_id not in self._builds:
+                return self._done(current)
+            building = self._building.get(chain_id)
+            if building is not None and building[0] is tokens and chain_id not in self._builds:
+                return building[1]
+            self._pending[chain_id] = tokens
+            future = self._builds.get(chain_id)
+            if future is None:
+                try:
+                    future = self._builds[chain_id] = self._builder.submit(self._build_pending, chain_id)
+                except RuntimeError:
+                    # 应用关闭后不再构建
+                    self._pending.pop(chain_id, None)
+                    future = Future()
+                    future.set_exception(RuntimeError("代币索引已关闭"))
+        return future
+
+    def ensure_chain(self, chain_id: str, tokens: List[Dict[str, Any]]) -> Future:
+        """ 该链还没有索引时安排构建 (已在排队的构建直接复用)，已有索引时立即完成。 """
+        current = self._chains.get(chain_id)
+        if current is not None:
+            return self._done(current)
+        return self.schedule_update(chain_id, tokens)
+
+    @staticmethod
+    def _done(index: ChainTokenIndex) -> Future:
+        future = Future()
+        future.set_result(index)
+        return future
+
+    def _build_pending(self, chain_id: str) -> ChainTokenIndex:
+        with self._lock:
+            tokens = self._pending.pop(chain_id)
+            # 构建期间到达的新列表会提交新的任务
+            self._building[chain_id] = (tokens, self._builds.pop(chain_id))
+        started = time.perf_counter()
+        try:
+            index = ChainTokenIndex(chain_id, tokens, self.is_popular)
+        except Exception:
+            with self._lock:
+                self._building.pop(chain_id, None)
+            logger.exception("链 %s 代币索引构建失败", chain_id)
+            raise
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._chains[chain_id] = index
+            self._building.pop(chain_id, None)
+            self._stats["builds"] += 1
+            self._stats["build_time_total"] += elapsed
+        logger.debug("链 %s 代币索引已更新: %d 个代币，耗时 %.1fms", chain_id, len(tokens), elapsed * 1000)
+        return index
+
+    async def load_chains(
+        self,
+        loader: Callable[[str], Awaitable[List[Dict[str, Any]]]],
+        chain_ids: Iterable[str],
+        timeout: Optional[float] = None
+    ) -> Dict[str, str]:
+        """
+        并发加载还没有索引的链的代币列表并建立索引，最多等待 timeout 秒 (默认 load_timeout)。
+
+        超时的链不会被取消，加载完成后会出现在之后的搜索中；最近加载失败的链直接返回上次的状态。
+
+        Args:
+            loader: 加载某条链代币列表的协程函数，参数为链ID。
+            chain_ids: 要搜索的链。
+            timeout: 最长等待时间（秒）。
+
+        Returns:
+            {链ID: 状态}，状态为 ok / timeout / unsupported / error。
+        """
+        async def load(chain_id: str):
+            tokens = await loader(chain_id)
+            # 索引在后台线程中构建 (与缓存刷新回调安排的构建共用)，不阻塞事件循环
+            await asyncio.wrap_future(self.ensure_chain(chain_id, tokens))
+
+        return await self._fanout.run(chain_ids, load, self.has_chain, timeout)
+
+    def search(self, query: str, chain_ids: Optional[List[str]] = None, limit: Optional[int] = 50) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        搜索代币符号、名称和合约地址。
+
+        Args:
+            query: 搜索关键词，不区分大小写。少于3个字符时只做前缀匹配。
+            chain_ids: 只搜索这些链，None 表示所有已索引的链。
+            limit: 返回数量 (前 k 个)，None 或 0 表示不限制。
+
+        Returns:
+            [(链ID, 代币), ...]，代币为缓存中的原始对象，调用方应视为只读。
+        """
+        query = query.strip().lower()
+        self._stats["searches"] += 1
+        if not query:
+            return []
+        chains = self._chains
+        if chain_ids is None:
+            targets = list(chains.values())
+        else:
+            targets = [chains[chain_id] for chain_id in dict.fromkeys(chain_ids) if chain_id in chains]
+
+        # 每条链先取各自的前 k 个，再跨链合并
+        candidates = []
+        for order, chain in enumerate(targets):
+            rank_keys = chain.rank_keys
+            candidates.extend((quality, rank_keys[doc], order, doc) for quality, doc in chain.top_matches(query, limit))
+        candidates.sort()
+        if limit:
+            candidates = candidates[:limit]
+        return [(targets[order].chain_id, targets[order].tokens[doc]) for _, _, order, doc in candidates]
+
+    def has_chain(self, chain_id: str) -> bool:
+        return chain_id in self._chains
+
+    def get_token(self, chain_id: str, address: str) -> Optional[Dict[str, Any]]:
+        """ 按合约地址查找代币 (O(1))，该链没有索引或没有该地址时返回None。 """
+        chain = self._chains.get(chain_id)
+        if chain is None:
+            return None
+        return chain.by_address.get(normalize_address(address))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            builds = self._stats["builds"]
+            return {
+                "chains": len(self._chains),
+                "tokens": sum(len(chain.tokens) for chain in self._chains.values()),
+                "pending": len(self._pending),
+                **self._fanout.get_stats(),
+                "builds": builds,
+                "avg_build_ms": round(self._stats["build_time_total"] / builds * 1000, 2) if builds else 0.0,
+                "searches": self._stats["searches"],
+            }
+
+    def shutdown(self):
+        self._fanout.cancel()
+        self._builder.shutdown(wait=False, cancel_futures=True)
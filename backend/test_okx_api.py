@@ -15,6 +15,8 @@ load_dotenv('.env.local')
 api_key = os.getenv('OKX_API_KEY')
 secret_key = os.getenv('OKX_SECRET_KEY')
 passphrase = os.getenv('OKX_PASSPHRASE')
+# 可指向本地模拟服务器 (mock_okx_server.py) 离线运行
+base_api_url = os.getenv('OKX_BASE_API_URL', 'https://web3.okx.com').rstrip('/')
 
 print(f"API Key: {api_key[:10]}..." if api_key else "API Key: None")
 print(f"Secret Key: {secret_key[:10]}..." if secret_key else "Secret Key: None")
@@ -23,7 +25,7 @@ print(f"Passphrase: {passphrase[:5]}..." if passphrase else "Passphrase: None")
 # 测试1: 不带认证的请求
 print("\n=== 测试1: 不带认证的请求 ===")
 try:
-    response = requests.get("https://web3.okx.com/api/v5/dex/cross-chain/supported/chain")
+    response = requests.get(f"{base_api_url}/api/v5/dex/cross-chain/supported/chain")
     print(f"状态码: {response.status_code}")
     print(f"响应: {response.text[:200]}...")
 except Exception as e:
@@ -57,7 +59,7 @@ if api_key and secret_key and passphrase:
     }
     
     try:
-        response = requests.get("https://web3.okx.com/api/v5/dex/cross-chain/supported/chain", headers=headers)
+        response = requests.get(f"{base_api_url}/api/v5/dex/cross-chain/supported/chain", headers=headers)
         print(f"状态码: {response.status_code}")
         print(f"响应: {response.text[:500]}...")
     except Exception as e:
@@ -9,12 +9,22 @@ __version__ = "0.0.1" # SDK 版本号
 
 # 从各个模块中导入主要的类，方便用户直接从SDK包导入
 from .config import Config, get_default_config
+from .transport import HTTPTransport, AsyncHTTPTransport
+from .cassette import CassetteTransport, AsyncCassetteTransport, CassetteMissError
 from .http_client import APIError # make_request 一般不直接暴露给SDK用户
-from .asset_explorer import AssetExplorer
-from .quoter import Quoter
-from .transaction_builder import TransactionBuilder
-from .status_tracker import StatusTracker
-from .onchain_gateway import OnChainGateway # 新增导入
+from .rate_limiter import RateLimiter, RateLimitExceeded
+from .resilience import RetryPolicy, CircuitBreaker, CircuitBreakerRegistry, CircuitOpenError
+from .single_flight import SingleFlight
+from .cache import ResponseCache
+from .codec import JSONCodec, OrjsonCodec
+from .hedging import HedgePolicy
+from .credentials import Credential, CredentialPool
+from .instrumentation import Instrumentation, RequestEvent, MetricsCollector, PrometheusCollector
+from .asset_explorer import AssetExplorer, AsyncAssetExplorer
+from .quoter import Quoter, AsyncQuoter
+from .transaction_builder import TransactionBuilder, AsyncTransactionBuilder
+from .status_tracker import StatusTracker, AsyncStatusTracker
+from .onchain_gateway import OnChainGateway, AsyncOnChainGateway # 新增导入
 
 # 未来可以添加其他模块的导入
 
@@ -23,10 +33,38 @@ from .onchain_gateway import OnChainGateway # 新增导入
 __all__ = [
     'Config',
     'get_default_config',
+    'HTTPTransport',
+    'AsyncHTTPTransport',
+    'CassetteTransport',
+    'AsyncCassetteTransport',
+    'CassetteMissError',
     'APIError',
+    'RateLimiter',
+    'RateLimitExceeded',
+    'RetryPolicy',
+    'CircuitBreaker',
+    'CircuitBreakerRegistry',
+    'CircuitOpenError',
+    'SingleFlight',
+    'ResponseCache',
+    'JSONCodec',
+    'OrjsonCodec',
+    'HedgePolicy',
+    'Credential',
+    'CredentialPool',
+    'Instrumentation',
+    'RequestEvent',
+    'MetricsCollector',
+    'PrometheusCollector',
     'AssetExplorer',
     'Quoter',
     'TransactionBuilder',
     'StatusTracker',
-    'OnChainGateway' # 新增到 __all__
+    'OnChainGateway', # 新增到 __all__
+    # asyncio 版本
+    'AsyncAssetExplorer',
+    'AsyncQuoter',
+    'AsyncTransactionBuilder',
+    'AsyncStatusTracker',
+    'AsyncOnChainGateway'
 ] 
\ No newline at end of file
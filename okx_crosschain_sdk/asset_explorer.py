@@ -1,15 +1,20 @@
+import asyncio
 from .config import Config, get_default_config
-from .http_client import make_request, APIError
-from typing import List, Dict
+from .http_client import make_request, async_make_request, stream_json_array, async_stream_json_array, APIError
+from typing import AsyncIterator, Iterator, Optional
 
 class AssetExplorer:
     """
     资产与链信息模块。
     用于查询OKX DEX支持的跨链网络、代币信息、桥信息等。
+
+    这些接口返回的几乎都是静态数据，结果默认缓存在 config.response_cache 中
+    (过期后先返回旧值并在后台刷新)。返回的列表在调用方之间共享，应视为只读。
     """
     # API 版本和基础路径，用于构建完整的endpoint
     API_VERSION_PATH = "/api/v5"
     MODULE_BASE_PATH = "/dex/cross-chain"
+    TOKEN_LIST_ENDPOINT = "/api/v5/dex/aggregator/all-tokens"
 
     def __init__(self, config: Config = None):
         """
@@ -24,6 +29,65 @@ class AssetExplorer:
         """ 构建完整的API endpoint路径，包含版本和模块基础路径。 """
         return f"{self.API_VERSION_PATH}{self.MODULE_BASE_PATH}{specific_path}"
 
+    def _chain_params(self, chain_index: str = None) -> dict:
+        """ 构建只包含可选 chainIndex 的查询参数，为空时返回None。 """
+        return {"chainIndex": chain_index} if chain_index else None
+
+    def _cached(self, method_name: str, loader, *args):
+        """
+        通过 config.response_cache 读取缓存，未配置缓存的方法直接调用 loader。
+        缓存键包含 BASE_API_URL、方法名和参数。
+        """
+        cache = self.config.response_cache
+        if cache is None or not cache.is_cached(method_name):
+            return loader()
+        return cache.get_or_load((self.config.BASE_API_URL, method_name) + args, loader)
+
+    async def _cached_async(self, method_name: str, loader, *args):
+        """ _cached 的异步版本，loader 返回一个协程。 """
+        cache = self.config.response_cache
+        if cache is None or not cache.is_cached(method_name):
+            return await loader()
+        return await cache.get_or_load_async((self.config.BASE_API_URL, method_name) + args, loader)
+
+    def _stream_token_list_plan(self, chain_index: str = None) -> Optional[str]:
+        """
+        iter_token_list 是否应以流式方式加载：get_token_list 配置了缓存且没有可用的缓存时，
+        返回流式加载的合并键 (未配置请求合并时为空字符串)，否则返回None (直接读取 get_token_list)。
+        """
+        cache = self.config.response_cache
+        if cache is None or not cache.is_cached("get_token_list"):
+            return None
+        if cache.contains((self.config.BASE_API_URL, "get_token_list", chain_index)):
+            return None
+        if self.config.single_flight is None:
+            return ""
+        from .single_flight import make_request_key
+        return make_request_key("GET", f"{self.config.BASE_API_URL}{self.TOKEN_LIST_ENDPOINT}", self._chain_params(chain_index))
+
+    def _fill_token_list_cache(self, tokens: list, chain_index: str = None):
+        """ 把流式读取到的完整代币列表写入 config.response_cache。 """
+        self.config.response_cache.put((self.config.BASE_API_URL, "get_token_list", chain_index), tokens)
+
+    def _extract_data_list(self, response_json: dict, error_message: str, allow_null: bool = True) -> list:
+        """
+        从响应中提取 `data` 列表，同步和异步版本共用。
+
+        Args:
+            response_json: API响应体。
+            error_message: 格式错误时抛出的APIError信息。
+            allow_null: `data` 为 null 且 code 为 "0" 时是否视为空列表。
+        """
+        if 'data' in response_json and isinstance(response_json['data'], list):
+            return response_json['data']
+        elif allow_null and 'data' in response_json and response_json['data'] is None and response_json.get('code') == '0':
+            return []
+        else:
+            raise APIError(
+                message=error_message,
+                response_data=response_json
+            )
+
     def get_supported_chains(self, chain_index: str = None) -> list:
         """
         获取OKX DEX跨链支持的所有链信息。
@@ -39,27 +103,22 @@ class AssetExplorer:
         Raises:
             APIError: 如果API请求失败。
         """
+        return self._cached("get_supported_chains", lambda: self._fetch_supported_chains(chain_index), chain_index)
+
+    def _fetch_supported_chains(self, chain_index: str = None) -> list:
+        """ 从上游获取 get_supported_chains 的数据，不经过缓存。 """
         endpoint = self._get_full_endpoint("/supported/chain")
-        params = {}
-        if chain_index:
-            params["chainIndex"] = chain_index
-            
-        try:
-            response_json = make_request(
-                method='GET',
-                endpoint=endpoint,
-                params=params if params else None,
-                config=self.config
-            )
-            if 'data' in response_json and isinstance(response_json['data'], list):
-                return response_json['data']
-            else:
-                raise APIError(
-                    message=f"API响应格式错误: 未找到'data'列表在 {endpoint}", 
-                    response_data=response_json
-                )
-        except APIError as e:
-            raise
+        response_json = make_request(
+            method='GET',
+            endpoint=endpoint,
+            params=self._chain_params(chain_index),
+            config=self.config
+        )
+        return self._extract_data_list(
+            response_json,
+            f"API响应格式错误: 未找到'data'列表在 {endpoint}",
+            allow_null=False
+        )
 
     def get_token_list(self, chain_index: str = None) -> list:
         """
@@ -75,29 +134,65 @@ class AssetExplorer:
         Raises:
             APIError: 如果API请求失败。
         """
-        endpoint = "/api/v5/dex/aggregator/all-tokens"
-        params = {}
-        if chain_index:
-            params["chainIndex"] = chain_index
-        
+        return self._cached("get_token_list", lambda: self._fetch_token_list(chain_index), chain_index)
+
+    def _fetch_token_list(self, chain_index: str = None) -> list:
+        """ 从上游获取 get_token_list 的数据，不经过缓存。 """
+        endpoint = self.TOKEN_LIST_ENDPOINT
+        response_json = make_request(
+            method='GET',
+            endpoint=endpoint,
+            params=self._chain_params(chain_index),
+            config=self.config
+        )
+        return self._extract_data_list(
+            response_json,
+            f"API响应格式错误或未找到对应 chainIndex 的代币列表: {endpoint} with chainIndex {chain_index}"
+        )
+
+    def iter_token_list(self, chain_index: str = None) -> Iterator[dict]:
+        """
+        以生成器方式逐个返回 get_token_list 的代币，便于调用方边遍历边过滤。
+
+        已有缓存时直接遍历缓存的列表。未命中缓存时以流式方式请求 all-tokens 接口并增量解析
+        `data` 数组，不在内存中保留完整的响应体，第一个代币不必等待整个响应；完整遍历后列表写入缓存。
+        并发的冷加载通过 config.single_flight 合并：只有一个调用方流式读取，其余调用方等待它写入缓存后
+        读取缓存 (它失败或提前停止时照常通过 get_token_list 加载)，只占用一个限流名额。
+        未给 get_token_list 配置缓存时直接遍历 get_token_list 的结果。
+
+        Args:
+            chain_index: 可选，链的唯一标识 (例如 "1" 代表 Ethereum)。
+
+        Raises:
+            APIError: 如果API请求失败。
+        """
+        flight_key = self._stream_token_list_plan(chain_index)
+        single_flight = self.config.single_flight if flight_key else None
+        pending = single_flight.claim(flight_key) if single_flight is not None else None
+        if pending is not None:
+            pending.wait(self.config.TIMEOUT)
+        if flight_key is None or pending is not None:
+            yield from self.get_token_list(chain_index)
+            return
+
         try:
-            response_json = make_request(
+            if self._stream_token_list_plan(chain_index) is None:
+                # 在成为领头者之前，上一次流式加载刚刚写入了缓存
+                yield from self.get_token_list(chain_index)
+                return
+            tokens = []
+            for token in stream_json_array(
                 method='GET',
-                endpoint=endpoint,
-                params=params if params else None,
+                endpoint=self.TOKEN_LIST_ENDPOINT,
+                params=self._chain_params(chain_index),
                 config=self.config
-            )
-            if 'data' in response_json and isinstance(response_json['data'], list):
-                return response_json['data']
-            elif 'data' in response_json and response_json['data'] is None and response_json.get('code') == '0':
-                return []
-            else:
-                raise APIError(
-                    message=f"API响应格式错误或未找到对应 chainIndex 的代币列表: {endpoint} with chainIndex {chain_index}",
-                    response_data=response_json
-                )
-        except APIError as e:
-            raise
+            ):
+                tokens.append(token)
+                yield token
+            self._fill_token_list_cache(tokens, chain_index)
+        finally:
+            if single_flight is not None:
+                single_flight.release(flight_key)
 
     def get_crosschain_tokens(self, chain_index: str = None) -> list:
         """
@@ -113,74 +208,165 @@ class AssetExplorer:
         Raises:
             APIError: 如果API请求失败。
         """
+        return self._cached("get_crosschain_tokens", lambda: self._fetch_crosschain_tokens(chain_index), chain_index)
+
+    def _fetch_crosschain_tokens(self, chain_index: str = None) -> list:
+        """ 从上游获取 get_crosschain_tokens 的数据，不经过缓存。 """
         endpoint = self._get_full_endpoint("/supported/tokens")
-        params = {}
-        if chain_index:
-            params["chainIndex"] = chain_index
-            
-        try:
-            response_json = make_request(
-                method='GET',
-                endpoint=endpoint,
-                params=params if params else None,
-                config=self.config
-            )
-            if 'data' in response_json and isinstance(response_json['data'], list):
-                return response_json['data']
-            elif 'data' in response_json and response_json['data'] is None and response_json.get('code') == '0':
-                return []
-            else:
-                raise APIError(
-                    message=f"API响应格式错误: 未找到'data'列表在 {endpoint}", 
-                    response_data=response_json
-                )
-        except APIError as e:
-            raise
+        response_json = make_request(
+            method='GET',
+            endpoint=endpoint,
+            params=self._chain_params(chain_index),
+            config=self.config
+        )
+        return self._extract_data_list(response_json, f"API响应格式错误: 未找到'data'列表在 {endpoint}")
 
     def get_configured_token_list(self) -> list:
         """
         获取项目方在DEX聚合器配置的币种列表。
         对应API: /api/v5/dex/cross-chain/configured-token-list
         """
+        return self._cached("get_configured_token_list", self._fetch_configured_token_list)
+
+    def _fetch_configured_token_list(self) -> list:
+        """ 从上游获取 get_configured_token_list 的数据，不经过缓存。 """
         endpoint = self._get_full_endpoint("/configured-token-list")
-        try:
-            response_json = make_request(
-                method='GET',
-                endpoint=endpoint,
-                config=self.config
-            )
-            if 'data' in response_json and isinstance(response_json['data'], list):
-                return response_json['data']
-            elif 'data' in response_json and response_json['data'] is None and response_json.get('code') == '0':
-                return []
-            else:
-                raise APIError(
-                    message=f"API响应格式错误: 未找到'data'列表在 {endpoint}", 
-                    response_data=response_json
-                )
-        except APIError as e:
-            raise
+        response_json = make_request(
+            method='GET',
+            endpoint=endpoint,
+            config=self.config
+        )
+        return self._extract_data_list(response_json, f"API响应格式错误: 未找到'data'列表在 {endpoint}")
 
     def get_bridge_info(self) -> list:
         """
         获取支持的桥信息。
         对应API: /api/v5/dex/cross-chain/supported/bridges
         """
+        return self._cached("get_bridge_info", self._fetch_bridge_info)
+
+    def _fetch_bridge_info(self) -> list:
+        """ 从上游获取 get_bridge_info 的数据，不经过缓存。 """
         endpoint = self._get_full_endpoint("/supported/bridges")
+        response_json = make_request(
+            method='GET',
+            endpoint=endpoint,
+            config=self.config
+        )
+        return self._extract_data_list(response_json, f"API响应格式错误: 未找到'data'列表在 {endpoint}")
+
+
+class AsyncAssetExplorer(AssetExplorer):
+    """
+    异步资产与链信息模块，是 AssetExplorer 的 asyncio 版本。
+    各方法的参数、返回值、异常和缓存行为与 AssetExplorer 一致。
+    """
+
+    async def get_supported_chains(self, chain_index: str = None) -> list:
+        """ 异步获取OKX DEX跨链支持的所有链信息。对应API: /api/v5/dex/cross-chain/supported/chain """
+        return await self._cached_async("get_supported_chains", lambda: self._fetch_supported_chains(chain_index), chain_index)
+
+    async def _fetch_supported_chains(self, chain_index: str = None) -> list:
+        endpoint = self._get_full_endpoint("/supported/chain")
+        response_json = await async_make_request(
+            method='GET',
+            endpoint=endpoint,
+            params=self._chain_params(chain_index),
+            config=self.config
+        )
+        return self._extract_data_list(
+            response_json,
+            f"API响应格式错误: 未找到'data'列表在 {endpoint}",
+            allow_null=False
+        )
+
+    async def get_token_list(self, chain_index: str = None) -> list:
+        """ 异步获取聚合器支持兑换的币种列表。对应API: /api/v5/dex/aggregator/all-tokens """
+        return await self._cached_async("get_token_list", lambda: self._fetch_token_list(chain_index), chain_index)
+
+    async def _fetch_token_list(self, chain_index: str = None) -> list:
+        endpoint = self.TOKEN_LIST_ENDPOINT
+        response_json = await async_make_request(
+            method='GET',
+            endpoint=endpoint,
+            params=self._chain_params(chain_index),
+            config=self.config
+        )
+        return self._extract_data_list(
+            response_json,
+            f"API响应格式错误或未找到对应 chainIndex 的代币列表: {endpoint} with chainIndex {chain_index}"
+        )
+
+    async def iter_token_list(self, chain_index: str = None) -> AsyncIterator[dict]:
+        """ 以异步生成器方式逐个返回代币，流式加载和合并的行为与 AssetExplorer.iter_token_list 一致。 """
+        flight_key = self._stream_token_list_plan(chain_index)
+        single_flight = self.config.single_flight if flight_key else None
+        pending = single_flight.claim_async(flight_key) if single_flight is not None else None
+        if pending is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(pending), self.config.TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+        if flight_key is None or pending is not None:
+            for token in await self.get_token_list(chain_index):
+                yield token
+            return
+
         try:
-            response_json = make_request(
+            if self._stream_token_list_plan(chain_index) is None:
+                for token in await self.get_token_list(chain_index):
+                    yield token
+                return
+            tokens = []
+            async for token in async_stream_json_array(
                 method='GET',
-                endpoint=endpoint,
+                endpoint=self.TOKEN_LIST_ENDPOINT,
+                params=self._chain_params(chain_index),
                 config=self.config
-            )
-            if 'data' in response_json and isinstance(response_json['data'], list):
-                return response_json['data']
-            elif 'data' in response_json and response_json['data'] is None and response_json.get('code') == '0':
-                return []
-            else:
-                raise APIError(
-                    message=f"API响应格式错误: 未找到'data'列表在 {endpoint}", 
-                    response_data=response_json
-                )
-        except APIError as e:
-            raise 
\ No newline at end of file
+            ):
+                tokens.append(token)
+                yield token
+            self._fill_token_list_cache(tokens, chain_index)
+        finally:
+            if single_flight is not None:
+                single_flight.release_async(flight_key)
+
+    async def get_crosschain_tokens(self, chain_index: str = None) -> list:
+        """ 异步获取仅通过跨链桥交易的币种列表。对应API: /api/v5/dex/cross-chain/supported/tokens """
+        return await self._cached_async("get_crosschain_tokens", lambda: self._fetch_crosschain_tokens(chain_index), chain_index)
+
+    async def _fetch_crosschain_tokens(self, chain_index: str = None) -> list:
+        endpoint = self._get_full_endpoint("/supported/tokens")
+        response_json = await async_make_request(
+            method='GET',
+            endpoint=endpoint,
+            params=self._chain_params(chain_index),
+            config=self.config
+        )
+        return self._extract_data_list(response_json, f"API响应格式错误: 未找到'data'列表在 {endpoint}")
+
+    async def get_configured_token_list(self) -> list:
+        """ 异步获取项目方在DEX聚合器配置的币种列表。对应API: /api/v5/dex/cross-chain/configured-token-list """
+        return await self._cached_async("get_configured_token_list", self._fetch_configured_token_list)
+
+    async def _fetch_configured_token_list(self) -> list:
+        endpoint = self._get_full_endpoint("/configured-token-list")
+        response_json = await async_make_request(
+            method='GET',
+            endpoint=endpoint,
+            config=self.config
+        )
+        return self._extract_data_list(response_json, f"API响应格式错误: 未找到'data'列表在 {endpoint}")
+
+    async def get_bridge_info(self) -> list:
+        """ 异步获取支持的桥信息。对应API: /api/v5/dex/cross-chain/supported/bridges """
+        return await self._cached_async("get_bridge_info", self._fetch_bridge_info)
+
+    async def _fetch_bridge_info(self) -> list:
+        endpoint = self._get_full_endpoint("/supported/bridges")
+        response_json = await async_make_request(
+            method='GET',
+            endpoint=endpoint,
+            config=self.config
+        )
+        return self._extract_data_list(response_json, f"API响应格式错误: 未找到'data'列表在 {endpoint}")
@@ -0,0 +1,242 @@
+# okx_crosschain_sdk/cache.py
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 各方法的默认缓存时间（秒）: {方法名: (新鲜期, 过期后仍可返回旧值的时间)}
+# 这些接口返回的都是几乎不变的静态数据
+DEFAULT_CACHE_TTLS: Dict[str, Tuple[float, float]] = {
+    "get_supported_chains": (300.0, 3600.0),
+    "get_token_list": (300.0, 3600.0),
+    "get_crosschain_tokens": (300.0, 3600.0),
+    "get_configured_token_list": (300.0, 3600.0),
+    "get_bridge_info": (600.0, 3600.0),
+}
+
+
+class _Entry:
+    """ 一条缓存记录。 """
+
+    __slots__ = ("value", "fetched_at", "ttl", "stale_ttl", "refreshing")
+
+    def __init__(self, value: Any, ttl: float, stale_ttl: float):
+        self.value = value
+        self.fetched_at = time.monotonic()
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.refreshing = False
+
+    def age(self, now: float) -> float:
+        return now - self.fetched_at
+
+
+class ResponseCache:
+    """
+    带 stale-while-revalidate 的 TTL + LRU 响应缓存。
+
+    每条记录有三个阶段：
+    - 新鲜 (age < ttl): 直接返回；
+    - 陈旧 (ttl <= age < ttl + stale_ttl): 立即返回旧值，并在后台刷新一次
+      (同步调用用后台线程，异步调用用事件循环中的 Task)，刷新失败时保留旧值；
+    - 过期: 当作未命中，同步加载。
+    条目数超过 max_entries 时淘汰最久未使用的记录。
+
+    注意：缓存的值在所有调用方之间共享，调用方应视为只读，需要修改时请先复制。
+    """
+
+    def __init__(self, ttls: Dict[str, Tuple[float, float]] = None, max_entries: int = 512):
+        """
+        Args:
+            ttls: {方法名: (新鲜期, 陈旧期)}，默认为 DEFAULT_CACHE_TTLS。
+                  未配置的方法不缓存。
+            max_entries: 最大缓存条目数。
+        """
+        self.ttls = dict(DEFAULT_CACHE_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[tuple, Any], None]] = []
+        # 持有后台刷新 Task 的引用，避免被垃圾回收
+        self._tasks = set()
+        self._stats = {"hits": 0, "stale_hits": 0, "misses": 0, "evictions": 0, "refresh_errors": 0}
+
+    def add_listener(self, callback: Callable[[tuple, Any], None]):
+        """
+        注册一个刷新回调，每次从上游加载到新值 (包括首次加载和后台刷新) 后调用，
+        参数为 (key, value)。key 的格式为 (base_url, 方法名, 参数...)。
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[tuple, Any], None]):
+        """ 移除通过 add_listener 注册的回调，未注册时忽略。 """
+        try:
+            self._listeners.remove(callback)
+        except ValueError:
+            pass
+
+    def _notify(self, key: tuple, value: Any):
+        for callback in list(self._listeners):
+            try:
+                callback(key, value)
+            except Exception as e:
+                logger.warning("缓存刷新回调出错: %s", e)
+
+    def _lookup(self, key: tuple) -> Tuple[Optional[_Entry], bool]:
+        """
+        查找缓存，返回 (可用的记录, 是否需要后台刷新)。
+        需要后台刷新时会把记录标记为刷新中，保证同一条记录只有一个刷新任务。
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None, False
+            age = entry.age(now)
+            if age < entry.ttl:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry, False
+            if age < entry.ttl + entry.stale_ttl:
+                self._entries.move_to_end(key)
+                self._stats["stale_hits"] += 1
+                refresh = not entry.refreshing
+                entry.refreshing = True
+                return entry, refresh
+            del self._entries[key]
+            self._stats["misses"] += 1
+            return None, False
+
+    def _store(self, key: tuple, value: Any):
+        ttl, stale_ttl = self.ttls[key[1]]
+        with self._lock:
+            self._entries[key] = _Entry(value, ttl, stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        self._notify(key, value)
+
+    def put(self, key: tuple, value: Any):
+        """ 直接写入一条缓存记录 (例如流式读取完整个列表之后)，同样会触发刷新回调。 """
+        if self.is_cached(key[1]):
+            self._store(key, value)
+
+    def _refresh_failed(self, key: tuple, error: Exception):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refreshing = False
+            self._stats["refresh_errors"] += 1
+        logger.warning("缓存后台刷新失败 %s: %s", key, error)
+
+    def contains(self, key: tuple) -> bool:
+        """ 是否有可用 (新鲜或陈旧) 的缓存记录，不影响统计和LRU顺序。 """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.age(now) < entry.ttl + entry.stale_ttl
+
+    def is_cached(self, method_name: str) -> bool:
+        """ 该方法是否配置了缓存。 """
+        return method_name in self.ttls
+
+    def get_or_load(self, key: tuple, loader: Callable[[], Any]) -> Any:
+        """
+        读取缓存，未命中时调用 loader 加载并写入缓存。
+
+        Args:
+            key: 缓存键，第二个元素必须是方法名 (用于查找TTL)。
+            loader: 从上游加载数据的函数。
+
+        Raises:
+            loader 抛出的异常 (未命中时)。
+        """
+        entry, refresh = self._lookup(key)
+        if entry is None:
+            value = loader()
+            self._store(key, value)
+            return value
+        if refresh:
+            threading.Thread(target=self._refresh, args=(key, loader), daemon=True).start()
+        return entry.value
+
+    def _refresh(self, key: tuple, loader: Callable[[], Any]):
+        try:
+            self._store(key, loader())
+        except Exception as e:
+            self._refresh_failed(key, e)
+
+    async def get_or_load_async(self, key: tuple, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """ get_or_load 的异步版本，loader 返回一个协程。 """
+        entry, refresh = self._lookup(key)
+        if entry is None:
+            value = await loader()
+            self._store(key, value)
+            return value
+        if refresh:
+            task = asyncio.get_running_loop().create_task(self._refresh_async(key, loader))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return entry.value
+
+    async def _refresh_async(self, key: tuple, loader: Callable[[], Awaitable[Any]]):
+        try:
+            self._store(key, await loader())
+        except Exception as e:
+            self._refresh_failed(key, e)
+
+    def invalidate(self, method_name: str = None, *args) -> int:
+        """
+        显式失效缓存。
+
+        Args:
+            method_name: 只失效该方法的缓存，为None时清空全部。
+            args: 进一步限定方法参数 (例如 chain_index)，只失效参数完全匹配的记录。
+
+        Returns:
+            失效的记录数。
+        """
+        with self._lock:
+            if method_name is None:
+                keys = list(self._entries)
+            else:
+                keys = [
+                    key for key in self._entries
+                    if key[1] == method_name and (not args or key[2:] == args)
+                ]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self):
+        """ 清空全部缓存。 """
+        self.invalidate()
+
+    def get_stats(self) -> Dict[str, int]:
+        """ 返回命中、陈旧命中、未命中、淘汰和后台刷新失败的次数，以及当前条目数。 """
+        with self._lock:
+            return {**self._stats, "size": len(self._entries)}
+
+
+_default_response_cache: Optional[ResponseCache] = None
+_default_response_cache_lock = threading.Lock()
+
+
+def get_default_response_cache() -> ResponseCache:
+    """
+    获取进程内共享的默认 ResponseCache。
+
+    缓存键包含 BASE_API_URL，因此不同环境的 Config 可以安全地共享它。
+    """
+    global _default_response_cache
+    with _default_response_cache_lock:
+        if _default_response_cache is None:
+            _default_response_cache = ResponseCache()
+        return _default_response_cache
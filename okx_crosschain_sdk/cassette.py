@@ -0,0 +1,289 @@
+# okx_crosschain_sdk/cassette.py
+
+import asyncio
+import datetime
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .transport import HTTPTransport, AsyncHTTPTransport, httpx
+
+
+class CassetteMissError(LookupError):
+    """ 回放模式下没有找到与请求匹配的录制记录。 """
+
+
+class CassetteTransport:
+    """
+    可录制/回放的HTTP传输层，接口与 HTTPTransport 相同，可直接作为 Config(transport=...) 使用。
+
+    每个请求按 (方法, 路径, 排序后的查询参数, 请求体) 匹配一条录制记录，每条记录保存为
+    cassette_dir 下的一个JSON文件。匹配时不考虑主机名和签名相关的请求头，因此对线上API
+    录制的记录可以在任何 BASE_API_URL 下回放，也可以手工编辑。
+
+    模式:
+    - "replay": 只从录制记录返回响应，找不到时抛出 CassetteMissError (不会被重试)；
+    - "record": 总是请求上游，并用响应覆盖录制记录；
+    - "once": 有录制记录时回放，否则请求上游并录制。
+    网络错误不会被录制。
+    """
+
+    MODES = ("replay", "record", "once")
+
+    def __init__(self, cassette_dir: str, mode: str = "replay", inner: HTTPTransport = None, simulate_latency: bool = False):
+        """
+        Args:
+            cassette_dir: 录制记录所在目录，录制时自动创建。
+            mode: "replay"、"record" 或 "once"。
+            inner: 录制时实际发送请求的传输层，默认创建一个新的 HTTPTransport。
+            simulate_latency: 回放时是否按录制时的耗时等待，用于离线复现延迟。
+
+        Raises:
+            ValueError: 如果模式无效。
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"无效的录制模式: {mode}，可选: {', '.join(self.MODES)}")
+        self.cassette_dir = cassette_dir
+        self.mode = mode
+        self.simulate_latency = simulate_latency
+        self._inner = inner
+        self._lock = threading.Lock()
+        self._stats = {"replayed": 0, "recorded": 0, "misses": 0}
+
+    @property
+    def inner(self):
+        if self._inner is None:
+            self._inner = self._new_inner()
+        return self._inner
+
+    def _new_inner(self):
+        return HTTPTransport()
+
+    def _key(self, method: str, url: str, params: dict = None, data: bytes = None) -> Tuple[dict, str]:
+        """ 返回 (请求的匹配信息, 录制文件路径)。 """
+        parsed = urlparse(url)
+        query = parse_qsl(parsed.query, keep_blank_values=True)
+        if params:
+            query.extend((str(k), str(v)) for k, v in params.items())
+        query_string = urlencode(sorted(query))
+        body = data.decode("utf-8") if isinstance(data, bytes) else (data or "")
+        match = {"method": method.upper(), "path": parsed.path, "query": query_string, "body": body}
+        digest = hashlib.sha1(json.dumps(match, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+        slug = parsed.path.strip("/").replace("/", "_") or "root"
+        return match, os.path.join(self.cassette_dir, f"{method.upper()}_{slug}_{digest}.json")
+
+    def _load(self, path: str) -> Optional[dict]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _save(self, path: str, match: dict, status_code: int, reason: str, headers, content: bytes, elapsed: float):
+        """ 原子地写入一条录制记录 (先写临时文件再替换)。 """
+        record = {
+            "request": match,
+            "response": {
+                "status_code": status_code,
+                "reason": reason,
+                "headers": {k: v for k, v in headers.items() if k.lower() not in ("content-encoding", "transfer-encoding", "content-length")},
+                "body": content.decode("utf-8", errors="replace"),
+                "elapsed": elapsed,
+            },
+        }
+        os.makedirs(self.cassette_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+        self._count("recorded")
+
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _lookup(self, method: str, url: str, params: dict = None, data: bytes = None) -> Tuple[dict, str, Optional[dict]]:
+        """ 查找录制记录，返回 (匹配信息, 文件路径, 记录)，需要请求上游时记录为None。 """
+        match, path = self._key(method, url, params, data)
+        record = None if self.mode == "record" else self._load(path)
+        if record is None and self.mode == "replay":
+            self._count("misses")
+            raise CassetteMissError(
+                f"没有与请求匹配的录制记录: {match['method']} {match['path']}?{match['query']} ({path})"
+            )
+        if record is not None:
+            self._count("replayed")
+        return match, path, record
+
+    def _build_response(self, url: str, record: dict) -> requests.Response:
+        """ 根据录制记录构造 requests.Response。 """
+        recorded = record["response"]
+        response = requests.Response()
+        response.status_code = recorded["status_code"]
+        response.reason = recorded.get("reason") or ""
+        response.headers = CaseInsensitiveDict(recorded.get("headers") or {})
+        response._content = recorded["body"].encode("utf-8")
+        response._content_consumed = True
+        response.url = url
+        response.encoding = "utf-8"
+        response.elapsed = datetime.timedelta(seconds=recorded.get("elapsed") or 0.0)
+        return response
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        json: dict = None,
+        data: bytes = None,
+        timeout: float = None,
+        stream: bool = False
+    ) -> requests.Response:
+        """
+        回放或录制一个HTTP请求，参数与 HTTPTransport.request 相同。
+
+        Raises:
+            CassetteMissError: 回放模式下没有匹配的录制记录。
+            requests.exceptions.RequestException: 录制时的网络层错误。
+        """
+        match, path, record = self._lookup(method, url, params, data)
+        if record is not None:
+            if self.simulate_latency:
+                time.sleep(record["response"].get("elapsed") or 0.0)
+            return self._build_response(url, record)
+
+        started = time.monotonic()
+        response = self.inner.request(
+            method=method, url=url, headers=headers, params=params,
+            json=json, data=data, timeout=timeout, stream=stream
+        )
+        # 流式请求也在这里读完响应体，之后 iter_content 从已读取的内容中切块
+        content = response.content
+        self._save(path, match, response.status_code, response.reason, response.headers, content, time.monotonic() - started)
+        return response
+
+    def get_stats(self) -> Dict[str, int]:
+        """ 返回回放、录制和未命中的次数。 """
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self):
+        if self._inner is not None:
+            self._inner.close()
+
+
+class _ReplayStream:
+    """ 回放时 AsyncCassetteTransport.stream 返回的异步上下文管理器。 """
+
+    def __init__(self, response):
+        self._response = response
+
+    async def __aenter__(self):
+        return self._response
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class AsyncCassetteTransport(CassetteTransport):
+    """
+    CassetteTransport 的异步版本，接口与 AsyncHTTPTransport 相同，可直接作为
+    Config(async_transport=...) 使用。录制文件格式与同步版本相同，两者可以共用同一个目录。
+    """
+
+    def __init__(self, cassette_dir: str, mode: str = "replay", inner: AsyncHTTPTransport = None, simulate_latency: bool = False):
+        """
+        参数同 CassetteTransport，inner 默认创建一个新的 AsyncHTTPTransport。
+
+        Raises:
+            ImportError: 如果未安装 httpx。
+        """
+        if httpx is None:
+            raise ImportError("AsyncCassetteTransport 需要安装 httpx: pip install httpx")
+        super().__init__(cassette_dir, mode, inner, simulate_latency)
+
+    def _new_inner(self):
+        return AsyncHTTPTransport()
+
+    def _build_response(self, url: str, record: dict):
+        """ 根据录制记录构造 httpx.Response。 """
+        recorded = record["response"]
+        return httpx.Response(
+            recorded["status_code"],
+            headers=recorded.get("headers") or {},
+            content=recorded["body"].encode("utf-8"),
+            request=httpx.Request(record["request"]["method"], url)
+        )
+
+    async def _replay(self, url: str, record: dict):
+        if self.simulate_latency:
+            await asyncio.sleep(record["response"].get("elapsed") or 0.0)
+        return self._build_response(url, record)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        json: dict = None,
+        data: bytes = None,
+        timeout: float = None,
+        extensions: dict = None
+    ):
+        """
+        回放或录制一个异步HTTP请求，参数与 AsyncHTTPTransport.request 相同。
+
+        Raises:
+            CassetteMissError: 回放模式下没有匹配的录制记录。
+            httpx.RequestError: 录制时的网络层错误。
+        """
+        match, path, record = self._lookup(method, url, params, data)
+        if record is not None:
+            return await self._replay(url, record)
+
+        started = time.monotonic()
+        response = await self.inner.request(
+            method=method, url=url, headers=headers, params=params,
+            json=json, data=data, timeout=timeout, extensions=extensions
+        )
+        self._save(path, match, response.status_code, response.reason_phrase, response.headers, response.content, time.monotonic() - started)
+        return response
+
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        timeout: float = None,
+        extensions: dict = None
+    ):
+        """ 流式请求的回放或录制。录制时先读完整个响应体，再以回放的方式返回。 """
+        match, path, record = self._lookup(method, url, params)
+        if record is not None:
+            return _ReplayStream(await self._replay(url, record))
+
+        started = time.monotonic()
+        async with await self.inner.stream(
+            method=method, url=url, headers=headers, params=params,
+            timeout=timeout, extensions=extensions
+        ) as response:
+            content = await response.aread()
+        self._save(path, match, response.status_code, response.reason_phrase, response.headers, content, time.monotonic() - started)
+        return _ReplayStream(self._build_response(url, self._load(path)))
+
+    def close(self):
+        pass
+
+    async def aclose(self):
+        if self._inner is not None:
+            await self._inner.aclose()
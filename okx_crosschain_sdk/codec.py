@@ -0,0 +1,77 @@
+# okx_crosschain_sdk/codec.py
+
+import json
+import threading
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONCodec:
+    """
+    JSON编解码器 (标准库实现)。
+
+    dumps 输出紧凑的 UTF-8 字节，make_request 用同一份字节进行签名和发送，
+    保证签名内容与实际请求体完全一致。解析失败时抛出 json.JSONDecodeError。
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        """ 把对象序列化为紧凑的 UTF-8 JSON 字节。 """
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        解析JSON字节或字符串。
+
+        Raises:
+            json.JSONDecodeError: 如果不是合法的JSON。
+        """
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    基于 orjson 的JSON编解码器，输出格式与 JSONCodec 相同 (紧凑、UTF-8)。
+
+    orjson 不支持的对象 (例如非字符串键、Decimal) 会回退到标准库实现。
+    orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，异常语义不变。
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        """
+        Raises:
+            ImportError: 如果未安装 orjson。
+        """
+        if orjson is None:
+            raise ImportError("OrjsonCodec 需要安装 orjson: pip install orjson")
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            return super().dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+_default_codec: Optional[JSONCodec] = None
+_default_codec_lock = threading.Lock()
+
+
+def get_default_codec() -> JSONCodec:
+    """
+    获取进程内共享的默认编解码器：安装了 orjson 时使用 OrjsonCodec，否则使用 JSONCodec。
+    """
+    global _default_codec
+    with _default_codec_lock:
+        if _default_codec is None:
+            _default_codec = OrjsonCodec() if orjson is not None else JSONCodec()
+        return _default_codec
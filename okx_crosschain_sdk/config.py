@@ -1,5 +1,14 @@
 # okx_crosschain_sdk/config.py
 
+from .transport import (
+    HTTPTransport,
+    AsyncHTTPTransport,
+    get_default_transport,
+    get_default_async_transport
+)
+from .codec import JSONCodec, get_default_codec
+from .credentials import Credential, CredentialPool
+
 class Config:
     """
     SDK配置类，用于存储和管理SDK的全局设置。
@@ -18,7 +27,44 @@ class Config:
     # 请求超时时间 (秒)
     TIMEOUT: int = 30
 
-    def __init__(self, api_key: str = None, secret_key: str = None, passphrase: str = None, timeout: int = 30):
+    # HTTP传输层 (连接池)，为None时使用进程内共享的默认传输层
+    _transport: HTTPTransport = None
+    # 异步HTTP传输层，供 async_make_request 和 Async* 模块使用
+    _async_transport: AsyncHTTPTransport = None
+    # 客户端限流器，为None时使用进程内共享的默认限流器
+    _rate_limiter: "RateLimiter" = None
+    # 重试策略，为None时使用默认的 RetryPolicy()
+    _retry_policy: "RetryPolicy" = None
+    # 熔断器注册表，为None时使用进程内共享的默认注册表
+    _circuit_breakers: "CircuitBreakerRegistry" = None
+    # 相同GET请求的合并器，为None时使用进程内共享的默认合并器，为False时关闭合并
+    _single_flight: "SingleFlight" = None
+    # AssetExplorer 的响应缓存，为None时使用进程内共享的默认缓存，为False时关闭缓存
+    _response_cache: "ResponseCache" = None
+    # JSON编解码器，为None时使用默认编解码器 (安装了 orjson 时使用 orjson)
+    _codec: JSONCodec = None
+    # API凭证池，为None时所有请求使用 API_KEY / SECRET_KEY / PASSPHRASE
+    _credential_pool: CredentialPool = None
+    # 请求插桩钩子，为None时使用进程内共享的默认注册表
+    _instrumentation: "Instrumentation" = None
+
+    def __init__(
+        self,
+        api_key: str = None,
+        secret_key: str = None,
+        passphrase: str = None,
+        timeout: int = 30,
+        transport: HTTPTransport = None,
+        async_transport: AsyncHTTPTransport = None,
+        rate_limiter: "RateLimiter" = None,
+        retry_policy: "RetryPolicy" = None,
+        circuit_breakers: "CircuitBreakerRegistry" = None,
+        single_flight: "SingleFlight" = None,
+        response_cache: "ResponseCache" = None,
+        codec: JSONCodec = None,
+        credentials: "CredentialPool | list[Credential]" = None,
+        instrumentation: "Instrumentation" = None
+    ):
         """
         初始化Config对象。
 
@@ -27,6 +73,25 @@ class Config:
             secret_key: 您的OKX API Secret Key。
             passphrase: 您的OKX API Passphrase。
             timeout: 请求超时时间（秒）。
+            transport: 可选，自定义的 HTTPTransport (例如调整连接池大小)。
+                       不传时所有Config共享同一个默认连接池。
+            async_transport: 可选，自定义的 AsyncHTTPTransport，语义同 transport。
+            rate_limiter: 可选，自定义的 RateLimiter (例如调整各endpoint家族的速率)。
+                          不传时所有Config共享同一个默认限流器。
+            retry_policy: 可选，自定义的 RetryPolicy (重试次数、退避时间等)。
+                          传入 RetryPolicy(max_retries=0) 可关闭重试。
+            circuit_breakers: 可选，自定义的 CircuitBreakerRegistry (熔断阈值、恢复时间等)。
+                              不传时所有Config共享同一个默认注册表。
+            single_flight: 可选，自定义的 SingleFlight，传入 False 关闭相同GET请求的合并。
+                           不传时所有Config共享同一个默认合并器。
+            response_cache: 可选，自定义的 ResponseCache (各方法的TTL、最大条目数)，
+                            传入 False 关闭缓存。不传时所有Config共享同一个默认缓存。
+            codec: 可选，自定义的 JSONCodec，用于序列化请求体和解析响应。
+            credentials: 可选，多组API凭证，可以是 CredentialPool 或 Credential 列表
+                         (列表使用默认的 "lru" 策略)。设置后每次请求从池中选择凭证，
+                         api_key / secret_key / passphrase 不再用于签名。
+            instrumentation: 可选，自定义的 Instrumentation (请求前/响应后钩子)。
+                             不传时所有Config共享同一个默认注册表。
         """
         if api_key:
             self.API_KEY = api_key
@@ -35,6 +100,107 @@ class Config:
         if passphrase:
             self.PASSPHRASE = passphrase
         self.TIMEOUT = timeout
+        if transport:
+            self._transport = transport
+        if async_transport:
+            self._async_transport = async_transport
+        if rate_limiter:
+            self._rate_limiter = rate_limiter
+        if retry_policy:
+            self._retry_policy = retry_policy
+        if circuit_breakers:
+            self._circuit_breakers = circuit_breakers
+        if single_flight is not None:
+            self._single_flight = single_flight
+        if response_cache is not None:
+            self._response_cache = response_cache
+        if codec:
+            self._codec = codec
+        if credentials:
+            self._credential_pool = credentials if isinstance(credentials, CredentialPool) else CredentialPool(credentials)
+        if instrumentation:
+            self._instrumentation = instrumentation
+
+    @property
+    def transport(self) -> HTTPTransport:
+        """ 当前配置使用的HTTP传输层，所有SDK模块通过它复用连接。 """
+        if self._transport is None:
+            self._transport = get_default_transport()
+        return self._transport
+
+    @property
+    def async_transport(self) -> AsyncHTTPTransport:
+        """ 当前配置使用的异步HTTP传输层。 """
+        if self._async_transport is None:
+            self._async_transport = get_default_async_transport()
+        return self._async_transport
+
+    @property
+    def rate_limiter(self) -> "RateLimiter":
+        """ 当前配置使用的客户端限流器，make_request 在发送请求前通过它获取令牌。 """
+        if self._rate_limiter is None:
+            # 延迟导入: rate_limiter 依赖 http_client，而 http_client 依赖本模块
+            from .rate_limiter import get_default_rate_limiter
+            self._rate_limiter = get_default_rate_limiter()
+        return self._rate_limiter
+
+    @property
+    def retry_policy(self) -> "RetryPolicy":
+        """ 当前配置使用的重试策略。 """
+        if self._retry_policy is None:
+            from .resilience import RetryPolicy
+            self._retry_policy = RetryPolicy()
+        return self._retry_policy
+
+    @property
+    def circuit_breakers(self) -> "CircuitBreakerRegistry":
+        """ 当前配置使用的熔断器注册表，按 (endpoint, chainIndex) 提供熔断器。 """
+        if self._circuit_breakers is None:
+            # 延迟导入，原因同 rate_limiter
+            from .resilience import get_default_circuit_breakers
+            self._circuit_breakers = get_default_circuit_breakers()
+        return self._circuit_breakers
+
+    @property
+    def single_flight(self) -> "SingleFlight":
+        """ 当前配置使用的请求合并器，关闭合并时为None。 """
+        if self._single_flight is None:
+            from .single_flight import get_default_single_flight
+            self._single_flight = get_default_single_flight()
+        return self._single_flight or None
+
+    @property
+    def response_cache(self) -> "ResponseCache":
+        """ 当前配置使用的响应缓存，关闭缓存时为None。 """
+        if self._response_cache is None:
+            from .cache import get_default_response_cache
+            self._response_cache = get_default_response_cache()
+        return self._response_cache or None
+
+    @property
+    def codec(self) -> JSONCodec:
+        """ 当前配置使用的JSON编解码器。 """
+        if self._codec is None:
+            self._codec = get_default_codec()
+        return self._codec
+
+    @property
+    def instrumentation(self) -> "Instrumentation":
+        """ 当前配置使用的请求插桩钩子注册表。 """
+        if self._instrumentation is None:
+            from .instrumentation import get_default_instrumentation
+            self._instrumentation = get_default_instrumentation()
+        return self._instrumentation
+
+    @property
+    def credential_pool(self) -> CredentialPool:
+        """ 当前配置使用的API凭证池，未配置多组凭证时为None。 """
+        return self._credential_pool
+
+    @property
+    def credential(self) -> Credential:
+        """ 由 API_KEY / SECRET_KEY / PASSPHRASE 组成的单组凭证，未配置凭证池时使用。 """
+        return Credential(self.API_KEY, self.SECRET_KEY, self.PASSPHRASE)
 
 def get_default_config():
     """
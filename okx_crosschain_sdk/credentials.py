@@ -0,0 +1,152 @@
+# okx_crosschain_sdk/credentials.py
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# OKX 表示 API Key 被冻结、不匹配，或签名、Passphrase 无效的业务错误码
+AUTH_ERROR_CODES = {"50100", "50101", "50103", "50104", "50105", "50111", "50113", "50114"}
+# OKX 表示请求过于频繁的业务错误码
+RATE_LIMIT_ERROR_CODES = {"50011"}
+
+
+class Credential:
+    """ 一组OKX API凭证。 """
+
+    def __init__(self, api_key: str, secret_key: str, passphrase: str, weight: float = 1.0, name: str = None):
+        """
+        Args:
+            api_key / secret_key / passphrase: OKX API凭证。
+            weight: 在 weighted 策略下的权重。
+            name: 可选，用于日志和统计的名称，默认为 API Key 的前8位。
+        """
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.passphrase = passphrase
+        self.weight = weight
+        self.name = name or (api_key[:8] if api_key else "anonymous")
+
+        self.last_used = 0.0
+        self.unhealthy_until = 0.0
+        self.requests = 0
+        self.failures = 0
+        # weighted 策略 (平滑加权轮询) 的当前权重
+        self._current_weight = 0.0
+
+    def is_healthy(self, now: float) -> bool:
+        return now >= self.unhealthy_until
+
+    def __repr__(self):
+        return f"Credential(name={self.name!r}, weight={self.weight})"
+
+
+class CredentialPool:
+    """
+    API凭证池，make_request 每次请求 (包括每次重试) 从中选择一组凭证进行签名。
+
+    选择策略:
+    - "lru": 选择最久未使用的凭证，使请求均匀分布；
+    - "weighted": 按 weight 进行平滑加权轮询；
+    - "quota": 选择客户端限流器中对该 endpoint 剩余令牌最多的凭证。
+    返回认证错误或 429 的凭证会被暂时标记为不健康 (cooldown 秒)，期间不会被选中；
+    所有凭证都不健康时，选择最早恢复的那一个，而不是直接失败。
+    """
+
+    POLICIES = ("lru", "weighted", "quota")
+
+    def __init__(self, credentials: List[Credential], policy: str = "lru", cooldown: float = 30.0):
+        """
+        Args:
+            credentials: 凭证列表，至少包含一组。
+            policy: 选择策略，"lru"、"weighted" 或 "quota"。
+            cooldown: 凭证被标记为不健康后的默认冷却时间（秒）。
+
+        Raises:
+            ValueError: 如果凭证列表为空或策略无效。
+        """
+        if not credentials:
+            raise ValueError("CredentialPool 至少需要一组凭证")
+        if policy not in self.POLICIES:
+            raise ValueError(f"无效的凭证选择策略: {policy}，可选: {', '.join(self.POLICIES)}")
+        self.credentials = list(credentials)
+        self.policy = policy
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+
+    def acquire(self, endpoint: str = None, available_tokens: Callable[[str, str], float] = None) -> Credential:
+        """
+        为一次请求选择凭证。
+
+        Args:
+            endpoint: 请求的 endpoint，quota 策略使用。
+            available_tokens: quota 策略使用的函数 (endpoint, api_key) -> 剩余令牌数，
+                              通常为 RateLimiter.available。
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [c for c in self.credentials if c.is_healthy(now)]
+            if not candidates:
+                credential = min(self.credentials, key=lambda c: c.unhealthy_until)
+            elif self.policy == "weighted":
+                credential = self._select_weighted(candidates)
+            elif self.policy == "quota" and available_tokens is not None:
+                # 剩余令牌相同时退化为 LRU
+                credential = max(candidates, key=lambda c: (available_tokens(endpoint, c.api_key), -c.last_used))
+            else:
+                credential = min(candidates, key=lambda c: c.last_used)
+            credential.last_used = now
+            credential.requests += 1
+            return credential
+
+    def has_capacity(self, endpoint: str, available_tokens: Callable[[str, str], float]) -> bool:
+        """
+        是否至少有一组健康的凭证此刻对 endpoint 还有可立即使用的令牌 (不选择凭证、不消耗令牌)。
+
+        Args:
+            endpoint: 请求的 endpoint。
+            available_tokens: 函数 (endpoint, api_key) -> 剩余令牌数，通常为 RateLimiter.available。
+        """
+        now = time.monotonic()
+        with self._lock:
+            keys = [c.api_key for c in self.credentials if c.is_healthy(now)]
+        return any(available_tokens(endpoint, key) >= 1 for key in keys)
+
+    def _select_weighted(self, candidates: List[Credential]) -> Credential:
+        """ 平滑加权轮询 (调用方需持有锁)。 """
+        total = sum(c.weight for c in candidates)
+        for c in candidates:
+            c._current_weight += c.weight
+        selected = max(candidates, key=lambda c: c._current_weight)
+        selected._current_weight -= total
+        return selected
+
+    def mark_unhealthy(self, credential: Credential, cooldown: float = None):
+        """ 把凭证标记为不健康，cooldown 秒内不再选择它 (默认使用池的 cooldown)。 """
+        if cooldown is None:
+            cooldown = self.cooldown
+        with self._lock:
+            credential.failures += 1
+            credential.unhealthy_until = max(credential.unhealthy_until, time.monotonic() + cooldown)
+        logger.warning("凭证 %s 暂时停用 %.1fs", credential.name, cooldown)
+
+    def get_stats(self) -> List[Dict[str, object]]:
+        """ 返回每组凭证的请求数、失败数和健康状态 (不包含密钥)。 """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "name": c.name,
+                    "weight": c.weight,
+                    "requests": c.requests,
+                    "failures": c.failures,
+                    "healthy": c.is_healthy(now),
+                    "cooldown_remaining": max(0.0, c.unhealthy_until - now),
+                }
+                for c in self.credentials
+            ]
+
+    def __len__(self):
+        return len(self.credentials)
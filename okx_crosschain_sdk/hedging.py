@@ -0,0 +1,216 @@
+# okx_crosschain_sdk/hedging.py
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class HedgePolicy:
+    """
+    对冲请求策略。
+
+    第一次请求在 "最近延迟的第 percentile 百分位" 时间内没有返回时，再发送一个相同的请求，
+    取先成功返回的结果。对冲请求受预算限制：每次调用积累 budget_ratio 个对冲额度，
+    每次对冲消耗一个，因此对冲流量长期不会超过调用量的 budget_ratio (突发上限为 max_burst)。
+
+    同一个 HedgePolicy 应在多次调用之间共享，才能积累延迟样本和预算。
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget_ratio: float = 0.05,
+        min_delay: float = 0.05,
+        max_delay: float = 3.0,
+        default_delay: float = 1.0,
+        min_samples: int = 20,
+        window: int = 200,
+        max_burst: float = 3.0
+    ):
+        """
+        Args:
+            percentile: 触发对冲的延迟百分位 (0-100)。
+            budget_ratio: 对冲请求占调用量的最大比例，例如 0.05 表示 5%。
+            min_delay / max_delay: 对冲等待时间的下限和上限（秒）。
+            default_delay: 延迟样本不足 min_samples 个时使用的等待时间（秒）。
+            min_samples: 开始使用百分位之前需要的最少延迟样本数。
+            window: 用于计算百分位的最近延迟样本数。
+            max_burst: 最多可积累的对冲额度。
+        """
+        self.percentile = percentile
+        self.budget_ratio = budget_ratio
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.default_delay = default_delay
+        self.min_samples = min_samples
+        self.max_burst = max_burst
+
+        self._latencies = deque(maxlen=window)
+        self._budget = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "hedges": 0, "hedge_wins": 0, "budget_denied": 0}
+
+    def record_latency(self, latency: float):
+        """
+        记录一次调用的延迟（秒），从第一次请求开始计时。
+        第一次请求落败或被取消时记录的是已等待的时间 (真实延迟的下限)，避免样本只保留较快的请求。
+        """
+        with self._lock:
+            self._latencies.append(latency)
+
+    def get_delay(self) -> float:
+        """ 返回发送对冲请求前应等待的时间（秒）。 """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.default_delay
+            samples = sorted(self._latencies)
+        index = min(len(samples) - 1, max(0, math.ceil(self.percentile / 100 * len(samples)) - 1))
+        return min(self.max_delay, max(self.min_delay, samples[index]))
+
+    def record_call(self):
+        """ 记录一次调用，并为其积累对冲额度。 """
+        with self._lock:
+            self._stats["calls"] += 1
+            self._budget = min(self.max_burst, self._budget + self.budget_ratio)
+
+    def try_hedge(self) -> bool:
+        """ 尝试消耗一个对冲额度，预算不足时返回False。 """
+        with self._lock:
+            if self._budget < 1:
+                self._stats["budget_denied"] += 1
+                return False
+            self._budget -= 1
+            self._stats["hedges"] += 1
+            return True
+
+    def record_hedge_win(self):
+        """ 记录一次对冲请求先于第一次请求成功返回。 """
+        with self._lock:
+            self._stats["hedge_wins"] += 1
+
+    def get_stats(self) -> Dict[str, float]:
+        """ 返回调用数、对冲数、对冲胜出数、因预算不足未对冲的次数和当前对冲等待时间。 """
+        with self._lock:
+            stats = dict(self._stats)
+        stats["hedge_delay"] = self.get_delay()
+        return stats
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """ 同步对冲请求使用的共享线程池。 """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="okx-hedge")
+        return _executor
+
+
+def run_hedged(
+    policy: HedgePolicy,
+    call: Callable[[bool], T],
+    can_hedge: Callable[[], bool] = None
+) -> T:
+    """
+    以对冲方式执行同步调用。
+
+    Args:
+        policy: 对冲策略。
+        call: 执行一次请求的函数，参数表示本次是否为对冲请求。
+        can_hedge: 可选，发送对冲请求前的额外检查 (例如客户端限流是否还有余量)。
+
+    Returns:
+        先成功返回的结果。两次请求都失败时抛出第一次请求的异常。
+        同步请求无法被中途取消，落败的请求会在后台执行完毕，其结果被丢弃。
+    """
+    started = time.monotonic()
+    hedge_won = False
+
+    def timed_primary() -> T:
+        result = call(False)
+        # 对冲胜出时已按胜出时间记录过，落败的第一次请求不再重复记录
+        if not hedge_won:
+            policy.record_latency(time.monotonic() - started)
+        return result
+
+    policy.record_call()
+    executor = _get_executor()
+    primary = executor.submit(timed_primary)
+    done, _ = wait([primary], timeout=policy.get_delay())
+    if done or (can_hedge is not None and not can_hedge()) or not policy.try_hedge():
+        return primary.result()
+
+    hedge = executor.submit(call, True)
+    pending = {primary, hedge}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if future is hedge:
+                    # 从第一次请求开始计时：调用方实际等待的时间
+                    hedge_won = True
+                    policy.record_latency(time.monotonic() - started)
+                    policy.record_hedge_win()
+                return future.result()
+    return primary.result()
+
+
+async def run_hedged_async(
+    policy: HedgePolicy,
+    call: Callable[[bool], Awaitable[T]],
+    can_hedge: Callable[[], bool] = None
+) -> T:
+    """ run_hedged 的异步版本，先成功的请求返回后会取消落败的请求。 """
+    started = time.monotonic()
+    hedge_won = False
+
+    async def timed_primary() -> T:
+        try:
+            result = await call(False)
+        except asyncio.CancelledError:
+            # 调用方取消：记录已等待的时间 (对冲胜出时已按胜出时间记录过)
+            if not hedge_won:
+                policy.record_latency(time.monotonic() - started)
+            raise
+        policy.record_latency(time.monotonic() - started)
+        return result
+
+    policy.record_call()
+    primary = asyncio.ensure_future(timed_primary())
+    try:
+        done, _ = await asyncio.wait([primary], timeout=policy.get_delay())
+        if done or (can_hedge is not None and not can_hedge()) or not policy.try_hedge():
+            return await primary
+
+        hedge = asyncio.ensure_future(call(True))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            # 从第一次请求开始计时，第一次请求随后被取消
+                            hedge_won = True
+                            policy.record_latency(time.monotonic() - started)
+                            policy.record_hedge_win()
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if hedge.done() and not hedge.cancelled():
+                # 第一次请求先成功时，读取对冲请求的异常，避免 "exception was never retrieved" 警告
+                hedge.exception()
+    finally:
+        if not primary.done():
+            primary.cancel()
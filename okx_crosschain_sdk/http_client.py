@@ -1,4 +1,5 @@
 # okx_crosschain_sdk/http_client.py
+import asyncio
 import requests
 import json
 import time
@@ -9,6 +10,13 @@ from urllib.parse import urlparse, urlencode # Added urlencode for GET params in
 from datetime import datetime
 
 from .config import Config, get_default_config
+from .credentials import Credential, AUTH_ERROR_CODES, RATE_LIMIT_ERROR_CODES
+from .instrumentation import RequestEvent
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
 class APIError(Exception):
     """自定义API错误异常，用于封装API请求中发生的错误。"""
@@ -33,42 +41,28 @@ def _generate_signature(config: Config, method: str, request_path: str, body_str
     
     return signature, timestamp
 
-def make_request(
+def _prepare_request(
     method: str,
-    # endpoint 现在是API的路径部分，例如 /dex/cross-chain/quote 或 /dex/pre-transaction/gas-price
-    # 它不包含主机名，但应包含 /api/v5 (如果适用，或者由config.API_VERSION_PATH提供)
     endpoint: str,
-    config: Config = None,
+    config: Config,
     params: dict = None,
     json_data: dict = None,
     headers: dict = None,
-    extra_headers: dict = None  # 新增：额外的头部，用于特殊API如钱包API
-):
-    """
-    发送HTTP请求到OKX API。
+    extra_headers: dict = None,
+    credential: Credential = None
+) -> tuple[str, bytes, dict]:
     """
-    if config is None:
-        config = get_default_config()
-
-    # 构建完整的URL和用于签名的request_path
-    # config.BASE_API_URL = "https://web3.okx.com"
-    # config.API_VERSION_PATH = "/api/v5"
-    # endpoint 应该是类似 "/dex/cross-chain/quote" 或 "/dex/pre-transaction/gas-price"
-    
-    # request_path_for_sign 需要包含 API_VERSION_PATH 和 endpoint
-    # full_url 也需要它们
-    
-    # 确保 endpoint 不以 / 开头，如果 API_VERSION_PATH 已经是 /api/v5
-    # 或者确保两者拼接时不会出现 //
-    # 为了简单和明确，我们约定传给 make_request 的 endpoint 就已经是 /api/v5/dex/... 这样的形式
-    # 这样 config 中就不再需要 API_VERSION_PATH 了。
-    # 我将回退 Config 的修改，并让调用方负责传入完整的 /api/v5/... 路径作为 endpoint。
+    构建请求的完整URL、请求体和请求头 (包括签名)，同步和异步请求共用。
+    credential 为本次请求使用的凭证，为None时使用 config 中的 API Key。
 
-    # --- 修正思路：make_request 的 endpoint 参数应该是从 /api/v5 开始的完整路径 ---
+    Returns:
+        (full_url_for_request, body, merged_headers)，body 为序列化后的请求体字节 (无请求体时为None)，
+        必须原样发送，否则签名会不匹配。
+    """
+    # 约定传给 make_request 的 endpoint 就已经是 /api/v5/dex/... 这样的形式
     # 例如: "/api/v5/dex/cross-chain/quote"
     #       "/api/v5/dex/pre-transaction/gas-price"
     # config.BASE_API_URL 只是 "https://web3.okx.com"
-    
     full_url_for_request = f"{config.BASE_API_URL}{endpoint}"
     request_path_for_sign = endpoint # endpoint 已经是 /api/v5/...
 
@@ -78,9 +72,11 @@ def make_request(
         request_path_for_sign += f"?{query_string}" # GET的参数是requestPath的一部分
 
     body_str_for_sign = ""
+    body = None
     if method.upper() == 'POST' and json_data:
-        # 对于POST，原始请求体参与签名
-        body_str_for_sign = json.dumps(json_data)
+        # 对于POST，原始请求体参与签名。只序列化一次，签名和发送使用同一份字节
+        body = config.codec.dumps(json_data)
+        body_str_for_sign = body.decode('utf-8')
 
 
     merged_headers = {
@@ -93,7 +89,10 @@ def make_request(
     if extra_headers:
         merged_headers.update(extra_headers)
 
-    needs_auth = (config.API_KEY and config.SECRET_KEY and config.PASSPHRASE and
+    if credential is None:
+        credential = config.credential
+
+    needs_auth = (credential.api_key and credential.secret_key and credential.passphrase and
                   ("/dex/pre-transaction/" in endpoint or 
                    "/dex/post-transaction/" in endpoint or
                    "/dex/cross-chain/" in endpoint or
@@ -101,7 +100,7 @@ def make_request(
                    "/wallet/" in endpoint))  # 添加钱包API认证
 
     if needs_auth:
-        if not config.SECRET_KEY:
+        if not credential.secret_key:
              raise ValueError("SECRET_KEY is required for authenticated requests.")
         
         timestamp_iso = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
@@ -109,70 +108,521 @@ def make_request(
         # 预签名字符串: timestamp + method + requestPath + body
         prehash_str = timestamp_iso + method.upper() + request_path_for_sign + body_str_for_sign
 
-        hmac_obj = hmac.new(config.SECRET_KEY.encode('utf-8'), prehash_str.encode('utf-8'), hashlib.sha256)
+        hmac_obj = hmac.new(credential.secret_key.encode('utf-8'), prehash_str.encode('utf-8'), hashlib.sha256)
         signature = base64.b64encode(hmac_obj.digest()).decode('utf-8')
 
-        merged_headers['OK-ACCESS-KEY'] = config.API_KEY
+        merged_headers['OK-ACCESS-KEY'] = credential.api_key
         merged_headers['OK-ACCESS-SIGN'] = signature
         merged_headers['OK-ACCESS-TIMESTAMP'] = timestamp_iso
-        merged_headers['OK-ACCESS-PASSPHRASE'] = config.PASSPHRASE
+        merged_headers['OK-ACCESS-PASSPHRASE'] = credential.passphrase
+
+    return full_url_for_request, body, merged_headers
 
+def _check_business_error(response_json: dict, status_code: int) -> dict:
+    """
+    检查OKX响应体中的业务错误码，同步和异步请求共用。
+
+    Raises:
+        APIError: 如果响应表示业务错误。
+    """
+    if 'code' in response_json and response_json['code'] != '0':
+        error_msg = response_json.get('msg', '未知API业务错误')
+        if not error_msg and 'detailMsg' in response_json: # 有些接口detailMsg更详细
+            error_msg = response_json['detailMsg']
+        elif not error_msg and 'sMsg' in response_json: # 比如 /quote 接口用 sMsg
+             error_msg = response_json['sMsg']
+        
+        # 特殊处理 /quote 接口返回的 {"code":"0", "sCode":"51008", "sMsg":"...", "data":null} 情况
+        # 它的外层code是"0"，但内部sCode非"0"表示错误
+        if response_json['code'] == '0' and 'sCode' in response_json and response_json['sCode'] != '0':
+             error_msg_quote = response_json.get('sMsg', '未知 /quote API 业务错误')
+             raise APIError(
+                message=f"API业务错误 (from /quote): {error_msg_quote} (API sCode: {response_json['sCode']})",
+                status_code=status_code,
+                response_data=response_json
+            )
+        elif response_json['code'] != '0': # 其他接口的标准错误判断
+            raise APIError(
+                message=f"API业务错误: {error_msg} (API Code: {response_json['code']})",
+                status_code=status_code,
+                response_data=response_json
+            )
+
+    return response_json
+
+def _get_chain_index(params: dict = None, json_data: dict = None) -> str:
+    """ 从请求参数中提取链标识，用于按 (endpoint, chainIndex) 划分熔断器。 """
+    for source in (params, json_data):
+        if source:
+            for key in ("chainIndex", "fromChainId", "chainId"):
+                if source.get(key):
+                    return str(source[key])
+    return None
+
+def _select_credential(config: Config, endpoint: str) -> Credential:
+    """ 为一次请求选择凭证：配置了凭证池时按池的策略选择，否则使用 config 中的 API Key。 """
+    pool = config.credential_pool
+    if pool is None:
+        return config.credential
+    return pool.acquire(endpoint, config.rate_limiter.available)
+
+def _report_credential_error(config: Config, credential: Credential, status_code: int, response_data=None, retry_after: float = None):
+    """ 凭证返回认证错误或被限流时，把它在凭证池中暂时标记为不健康，后续请求改用其它凭证。 """
+    pool = config.credential_pool
+    if pool is None:
+        return
+    code = response_data.get('code') if isinstance(response_data, dict) else None
+    if status_code == 429 or code in RATE_LIMIT_ERROR_CODES:
+        pool.mark_unhealthy(credential, retry_after or None)
+    elif status_code in (401, 403) or code in AUTH_ERROR_CODES:
+        pool.mark_unhealthy(credential)
+
+def _begin_event(
+    config: Config,
+    method: str,
+    endpoint: str,
+    chain_index: str,
+    attempt: int,
+    credential: Credential,
+    body: bytes = None,
+    queue_time: float = 0.0
+) -> RequestEvent:
+    """ 创建本次尝试的插桩事件并调用请求前钩子，没有注册钩子时返回None。 """
+    instrumentation = config.instrumentation
+    if not instrumentation.enabled:
+        return None
+    event = RequestEvent(method.upper(), endpoint, chain_index, attempt, credential.name, len(body) if body else 0)
+    if queue_time:
+        event.timings["queue"] = queue_time
+    instrumentation.on_request(event)
+    return event
+
+def _finish_event(config: Config, event: RequestEvent, started: float, response=None, error=None, bytes_in: int = None):
+    """ 填充插桩事件的状态码、收到的字节数和各阶段耗时，然后调用响应后钩子。 """
+    if event is None:
+        return
+    elapsed = None
+    if response is not None:
+        event.status_code = response.status_code
+        event.bytes_in = len(response.content) if bytes_in is None else bytes_in
+        if isinstance(response, requests.Response):
+            elapsed = response.elapsed.total_seconds()
+    if error is not None:
+        event.error = str(error)
+    event.finish(started, elapsed)
+    config.instrumentation.on_response(event)
+
+def _http_error(response, config: Config, reason) -> APIError:
+    """ 把HTTP错误响应 (requests 或 httpx 的 Response) 转换为 APIError，同步和异步请求共用。 """
     try:
-        response = requests.request(
-            method=method.upper(),
-            url=full_url_for_request, 
-            params=None if method.upper() == 'GET' else params, 
-            json=json_data if method.upper() == 'POST' else None,
-            headers=merged_headers,
-            timeout=config.TIMEOUT
+        error_response_json = config.codec.loads(response.content)
+    except json.JSONDecodeError:
+        error_response_json = response.text or 'No response body'
+    return APIError(
+        message=f"HTTP错误: {response.status_code} {reason}",
+        status_code=response.status_code,
+        response_data=error_response_json
+    )
+
+def _parse_response(response, config: Config) -> dict:
+    """ 用 config.codec 解析成功响应的JSON并检查业务错误码，同步和异步请求共用。 """
+    try:
+        response_json = config.codec.loads(response.content)
+    except json.JSONDecodeError as e:
+        raise APIError(
+            message=f"无法解析JSON响应: {e}", 
+            status_code=response.status_code, 
+            response_data=response.text
         )
+    return _check_business_error(response_json, response.status_code)
 
-        response.raise_for_status()
+def _coalesce_key(method: str, endpoint: str, config: Config, params: dict, headers: dict, extra_headers: dict, coalesce: bool):
+    """ 返回请求合并的键；不应合并 (非GET、自定义头部、已关闭合并) 时返回None。 """
+    if not coalesce or method.upper() != 'GET' or headers or extra_headers:
+        return None
+    if config.single_flight is None:
+        return None
+    from .single_flight import make_request_key
+    return make_request_key(method, f"{config.BASE_API_URL}{endpoint}", params)
 
+def make_request(
+    method: str,
+    # endpoint 是从 /api/v5 开始的完整API路径，例如 /api/v5/dex/cross-chain/quote
+    # 它不包含主机名，主机名由 config.BASE_API_URL 提供
+    endpoint: str,
+    config: Config = None,
+    params: dict = None,
+    json_data: dict = None,
+    headers: dict = None,
+    extra_headers: dict = None,  # 新增：额外的头部，用于特殊API如钱包API
+    coalesce: bool = True
+):
+    """
+    发送HTTP请求到OKX API。
+
+    并发的相同GET请求 (方法、路径和排序后的查询参数相同) 通过 config.single_flight 合并为
+    一次上游调用，所有调用方共享同一个结果对象或异常，因此返回值应视为只读。
+    coalesce=False 时跳过合并 (例如对冲请求需要真正发出第二个请求)。
+    """
+    if config is None:
+        config = get_default_config()
+
+    key = _coalesce_key(method, endpoint, config, params, headers, extra_headers, coalesce)
+    if key is None:
+        return _send_request(method, endpoint, config, params, json_data, headers, extra_headers)
+    return config.single_flight.do(
+        key, lambda: _send_request(method, endpoint, config, params, json_data, headers, extra_headers)
+    )
+
+def _send_request(
+    method: str,
+    endpoint: str,
+    config: Config,
+    params: dict = None,
+    json_data: dict = None,
+    headers: dict = None,
+    extra_headers: dict = None
+):
+    """
+    实际发送一次 (含重试的) 请求。
+
+    每次尝试依次经过：熔断检查 -> 客户端限流 -> 签名 -> 发送。
+    幂等请求的网络错误、5xx 和 429 按 config.retry_policy 退避重试 (429 遵循 Retry-After)；
+    网络错误和 5xx 会计入 (endpoint, chainIndex) 对应熔断器的失败次数，
+    熔断器打开期间请求直接抛出 CircuitOpenError，而不是等待 config.TIMEOUT 超时。
+    """
+    # 延迟导入: resilience 依赖本模块中的 APIError
+    from .resilience import parse_retry_after
+
+    retry_policy = config.retry_policy
+    chain_index = _get_chain_index(params, json_data)
+    breaker = config.circuit_breakers.get(endpoint, chain_index)
+    attempt = 0
+
+    while True:
+        breaker.before_request()
+        # 每次尝试重新选择凭证，被限流或认证失败的凭证会被跳过
+        credential = _select_credential(config, endpoint)
         try:
-            response_json = response.json()
-        except json.JSONDecodeError as e:
-            raise APIError(
-                message=f"无法解析JSON响应: {e}", 
-                status_code=response.status_code, 
-                response_data=response.text
+            # 客户端限流：在配额内排队，超过最长排队时间则抛出 RateLimitExceeded
+            queue_time = config.rate_limiter.acquire(endpoint, credential.api_key)
+        except APIError:
+            breaker.release()
+            raise
+
+        # 排队结束后再签名，避免签名时间戳过期
+        full_url_for_request, body, merged_headers = _prepare_request(
+            method, endpoint, config, params, json_data, headers, extra_headers, credential
+        )
+
+        event = _begin_event(config, method, endpoint, chain_index, attempt, credential, body, queue_time)
+        started = time.monotonic()
+        try:
+            response = config.transport.request(
+                method=method.upper(),
+                url=full_url_for_request, 
+                params=None if method.upper() == 'GET' else params, 
+                data=body,
+                headers=merged_headers,
+                timeout=config.TIMEOUT
             )
-        
-        if 'code' in response_json and response_json['code'] != '0':
-            error_msg = response_json.get('msg', '未知API业务错误')
-            if not error_msg and 'detailMsg' in response_json: # 有些接口detailMsg更详细
-                error_msg = response_json['detailMsg']
-            elif not error_msg and 'sMsg' in response_json: # 比如 /quote 接口用 sMsg
-                 error_msg = response_json['sMsg']
-            
-            # 特殊处理 /quote 接口返回的 {"code":"0", "sCode":"51008", "sMsg":"...", "data":null} 情况
-            # 它的外层code是"0"，但内部sCode非"0"表示错误
-            if response_json['code'] == '0' and 'sCode' in response_json and response_json['sCode'] != '0':
-                 error_msg_quote = response_json.get('sMsg', '未知 /quote API 业务错误')
-                 raise APIError(
-                    message=f"API业务错误 (from /quote): {error_msg_quote} (API sCode: {response_json['sCode']})",
-                    status_code=response.status_code,
-                    response_data=response_json
-                )
-            elif response_json['code'] != '0': # 其他接口的标准错误判断
-                raise APIError(
-                    message=f"API业务错误: {error_msg} (API Code: {response_json['code']})",
-                    status_code=response.status_code,
-                    response_data=response_json
-                )
-
-        return response_json
-
-    except requests.exceptions.HTTPError as e:
-        error_response_text = e.response.text if e.response else 'No response body'
+        except requests.exceptions.RequestException as e:
+            _finish_event(config, event, started, error=e)
+            breaker.record_failure()
+            if retry_policy.should_retry(method, attempt):
+                time.sleep(retry_policy.get_delay(attempt))
+                attempt += 1
+                continue
+            raise APIError(message=f"网络请求错误: {e}")
+
+        _finish_event(config, event, started, response)
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+        if response.status_code >= 400:
+            retry_after = parse_retry_after(response.headers.get('Retry-After')) if response.status_code == 429 else None
+            _report_credential_error(config, credential, response.status_code, retry_after=retry_after)
+            if retry_policy.should_retry(method, attempt, response.status_code, retry_after):
+                time.sleep(retry_policy.get_delay(attempt, retry_after))
+                attempt += 1
+                continue
+            raise _http_error(response, config, response.reason)
+
         try:
-            error_response_json = e.response.json() if e.response else None
-        except json.JSONDecodeError:
-            error_response_json = error_response_text
-        raise APIError(
-            message=f"HTTP错误: {e}", 
-            status_code=e.response.status_code if e.response else None, 
-            response_data=error_response_json
+            return _parse_response(response, config)
+        except APIError as e:
+            _report_credential_error(config, credential, response.status_code, e.response_data)
+            raise
+
+async def async_make_request(
+    method: str,
+    endpoint: str,
+    config: Config = None,
+    params: dict = None,
+    json_data: dict = None,
+    headers: dict = None,
+    extra_headers: dict = None,
+    coalesce: bool = True
+):
+    """
+    异步发送HTTP请求到OKX API，是 make_request 的非阻塞版本。
+
+    请求合并、签名、限流、重试、熔断、业务错误检查和异常语义与 make_request 完全一致，
+    底层使用 config.async_transport (httpx.AsyncClient 连接池)。
+    """
+    if config is None:
+        config = get_default_config()
+
+    key = _coalesce_key(method, endpoint, config, params, headers, extra_headers, coalesce)
+    if key is None:
+        return await _async_send_request(method, endpoint, config, params, json_data, headers, extra_headers)
+    return await config.single_flight.do_async(
+        key, lambda: _async_send_request(method, endpoint, config, params, json_data, headers, extra_headers)
+    )
+
+async def _async_send_request(
+    method: str,
+    endpoint: str,
+    config: Config,
+    params: dict = None,
+    json_data: dict = None,
+    headers: dict = None,
+    extra_headers: dict = None
+):
+    """ _send_request 的异步版本。 """
+    # 延迟导入: resilience 依赖本模块中的 APIError
+    from .resilience import parse_retry_after
+
+    retry_policy = config.retry_policy
+    chain_index = _get_chain_index(params, json_data)
+    breaker = config.circuit_breakers.get(endpoint, chain_index)
+    attempt = 0
+
+    while True:
+        breaker.before_request()
+        credential = _select_credential(config, endpoint)
+        try:
+            queue_time = await config.rate_limiter.acquire_async(endpoint, credential.api_key)
+        except APIError:
+            breaker.release()
+            raise
+
+        # 排队结束后再签名，避免签名时间戳过期
+        full_url_for_request, body, merged_headers = _prepare_request(
+            method, endpoint, config, params, json_data, headers, extra_headers, credential
+        )
+
+        event = _begin_event(config, method, endpoint, chain_index, attempt, credential, body, queue_time)
+        started = time.monotonic()
+        try:
+            response = await config.async_transport.request(
+                method=method.upper(),
+                url=full_url_for_request,
+                params=None if method.upper() == 'GET' else params,
+                data=body,
+                headers=merged_headers,
+                timeout=config.TIMEOUT,
+                extensions={"trace": event.trace} if event is not None else None
+            )
+        except httpx.RequestError as e:
+            _finish_event(config, event, started, error=e)
+            breaker.record_failure()
+            if retry_policy.should_retry(method, attempt):
+                await asyncio.sleep(retry_policy.get_delay(attempt))
+                attempt += 1
+                continue
+            raise APIError(message=f"网络请求错误: {e}")
+
+        _finish_event(config, event, started, response)
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+        if response.status_code >= 400:
+            retry_after = parse_retry_after(response.headers.get('Retry-After')) if response.status_code == 429 else None
+            _report_credential_error(config, credential, response.status_code, retry_after=retry_after)
+            if retry_policy.should_retry(method, attempt, response.status_code, retry_after):
+                await asyncio.sleep(retry_policy.get_delay(attempt, retry_after))
+                attempt += 1
+                continue
+            raise _http_error(response, config, response.reason_phrase)
+
+        try:
+            return _parse_response(response, config)
+        except APIError as e:
+            _report_credential_error(config, credential, response.status_code, e.response_data)
+            raise
+
+def _feed_stream_parser(
+    parser,
+    chunk: bytes,
+    status_code: int,
+    config: Config,
+    credential: Credential,
+    final: bool = False
+) -> list:
+    """
+    向流式解析器喂入一块数据并检查业务错误码，同步和异步流式请求共用。
+    业务错误与 _send_request 一样报告给凭证池 (认证错误或限流的凭证暂时停用)。
+    """
+    try:
+        items = parser.feed(chunk, final)
+    except json.JSONDecodeError as e:
+        raise APIError(message=f"无法解析JSON响应: {e}", status_code=status_code)
+    # code 一般位于 data 之前，出错时在产出第一个元素前就能发现
+    try:
+        _check_business_error(parser.envelope, status_code)
+    except APIError as e:
+        _report_credential_error(config, credential, status_code, e.response_data)
+        raise
+    if final and not parser.saw_array:
+        data = parser.envelope.get(parser.array_key, "missing")
+        if data is not None:
+            raise APIError(
+                message=f"API响应格式错误: 未找到'{parser.array_key}'列表",
+                status_code=status_code,
+                response_data=parser.envelope
+            )
+    return items
+
+def stream_json_array(
+    method: str,
+    endpoint: str,
+    config: Config = None,
+    params: dict = None,
+    array_key: str = "data",
+    chunk_size: int = 65536
+):
+    """
+    以流式方式请求OKX API，并逐个产出响应中 `array_key` 数组的元素。
+
+    响应体按块读取并增量解析，不会在内存中构建完整的响应，适合数万条记录的代币列表。
+    与 make_request 一样经过熔断检查、客户端限流和签名，但不重试也不合并请求
+    (元素可能已经交给调用方，无法安全地重放)。`data` 为 null 时不产出任何元素。
+
+    Raises:
+        APIError: 如果请求失败、响应格式错误或返回业务错误。
+    """
+    from .streaming import JSONArrayStreamParser
+
+    if config is None:
+        config = get_default_config()
+
+    chain_index = _get_chain_index(params)
+    breaker = config.circuit_breakers.get(endpoint, chain_index)
+    breaker.before_request()
+    credential = _select_credential(config, endpoint)
+    try:
+        queue_time = config.rate_limiter.acquire(endpoint, credential.api_key)
+    except APIError:
+        breaker.release()
+        raise
+
+    full_url_for_request, _, merged_headers = _prepare_request(method, endpoint, config, params, credential=credential)
+
+    event = _begin_event(config, method, endpoint, chain_index, 0, credential, queue_time=queue_time)
+    started = time.monotonic()
+    try:
+        response = config.transport.request(
+            method=method.upper(),
+            url=full_url_for_request,
+            headers=merged_headers,
+            timeout=config.TIMEOUT,
+            stream=True
         )
     except requests.exceptions.RequestException as e:
-        raise APIError(message=f"网络请求错误: {e}") 
\ No newline at end of file
+        _finish_event(config, event, started, error=e)
+        breaker.record_failure()
+        raise APIError(message=f"网络请求错误: {e}")
+
+    bytes_in = 0
+    error = None
+    try:
+        with response:
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if response.status_code >= 400:
+                bytes_in = len(response.content)
+                _report_credential_error(config, credential, response.status_code)
+                raise _http_error(response, config, response.reason)
+
+            parser = JSONArrayStreamParser(array_key)
+            try:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    bytes_in += len(chunk)
+                    yield from _feed_stream_parser(parser, chunk, response.status_code, config, credential)
+            except requests.exceptions.RequestException as e:
+                error = e
+                breaker.record_failure()
+                raise APIError(message=f"网络请求错误: {e}")
+            yield from _feed_stream_parser(parser, b"", response.status_code, config, credential, final=True)
+    finally:
+        # 调用方提前停止迭代时也会执行，耗时和字节数只统计到停止为止
+        _finish_event(config, event, started, response, error, bytes_in)
+
+async def async_stream_json_array(
+    method: str,
+    endpoint: str,
+    config: Config = None,
+    params: dict = None,
+    array_key: str = "data"
+):
+    """ stream_json_array 的异步版本 (异步生成器)，底层使用 config.async_transport。 """
+    from .streaming import JSONArrayStreamParser
+
+    if config is None:
+        config = get_default_config()
+
+    chain_index = _get_chain_index(params)
+    breaker = config.circuit_breakers.get(endpoint, chain_index)
+    breaker.before_request()
+    credential = _select_credential(config, endpoint)
+    try:
+        queue_time = await config.rate_limiter.acquire_async(endpoint, credential.api_key)
+    except APIError:
+        breaker.release()
+        raise
+
+    full_url_for_request, _, merged_headers = _prepare_request(method, endpoint, config, params, credential=credential)
+
+    event = _begin_event(config, method, endpoint, chain_index, 0, credential, queue_time=queue_time)
+    started = time.monotonic()
+    response = None
+    bytes_in = 0
+    error = None
+    try:
+        stream = await config.async_transport.stream(
+            method=method.upper(),
+            url=full_url_for_request,
+            headers=merged_headers,
+            timeout=config.TIMEOUT,
+            extensions={"trace": event.trace} if event is not None else None
+        )
+        async with stream as response:
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if response.status_code >= 400:
+                bytes_in = len(await response.aread())
+                _report_credential_error(config, credential, response.status_code)
+                raise _http_error(response, config, response.reason_phrase)
+
+            parser = JSONArrayStreamParser(array_key)
+            async for chunk in response.aiter_bytes():
+                bytes_in += len(chunk)
+                for item in _feed_stream_parser(parser, chunk, response.status_code, config, credential):
+                    yield item
+            for item in _feed_stream_parser(parser, b"", response.status_code, config, credential, final=True):
+                yield item
+    except httpx.RequestError as e:
+        error = e
+        breaker.record_failure()
+        raise APIError(message=f"网络请求错误: {e}")
+    finally:
+        _finish_event(config, event, started, response, error, bytes_in)
@@ -0,0 +1,320 @@
+# okx_crosschain_sdk/instrumentation.py
+
+import bisect
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import prometheus_client
+except ImportError:
+    prometheus_client = None
+
+# 各阶段耗时的名称 (秒):
+# - queue: 在客户端限流器中排队的时间；
+# - connect: 建立TCP连接 (包括DNS解析)，复用连接时没有该阶段；
+# - tls: TLS握手，复用连接时没有该阶段；
+# - send: 发送请求头和请求体；
+# - wait: 请求发送完毕到收到响应头，即服务端处理时间 (TTFB)；
+# - download: 读取响应体；
+# - total: 从发送请求到读完响应体的总时间 (不包括 queue)。
+# 同步请求 (requests) 无法观察连接建立过程，connect / tls / send 都计入 wait。
+PHASES = ("queue", "connect", "tls", "send", "wait", "download", "total")
+
+
+class RequestEvent:
+    """
+    一次HTTP尝试 (每次重试都是一个新的事件) 的信息，传给请求前和响应后的钩子。
+
+    请求前钩子只能看到请求相关的字段，status_code / bytes_in / timings / error
+    在响应后 (或网络错误后) 才会填充。
+    """
+
+    __slots__ = (
+        "method", "endpoint", "chain_index", "attempt", "credential", "bytes_out",
+        "status_code", "bytes_in", "timings", "error", "_marks"
+    )
+
+    def __init__(
+        self,
+        method: str,
+        endpoint: str,
+        chain_index: str = None,
+        attempt: int = 0,
+        credential: str = None,
+        bytes_out: int = 0
+    ):
+        self.method = method
+        self.endpoint = endpoint
+        self.chain_index = chain_index
+        # 第几次重试，首次请求为 0
+        self.attempt = attempt
+        # 使用的凭证名称 (不包含密钥)
+        self.credential = credential
+        self.bytes_out = bytes_out
+        self.status_code: Optional[int] = None
+        self.bytes_in = 0
+        self.timings: Dict[str, float] = {}
+        # 网络错误的描述，收到响应 (包括4xx/5xx) 时为None
+        self.error: Optional[str] = None
+        self._marks: Dict[str, float] = {}
+
+    async def trace(self, name: str, info: dict):
+        """ httpx 的 trace 扩展回调，记录每个连接/收发事件的时间点。 """
+        # 例如 "connection.connect_tcp.started"、"http11.receive_response_headers.complete"
+        self._marks[name.split(".", 1)[1]] = time.monotonic()
+
+    def _phase(self, start: str, end: str) -> Optional[float]:
+        if start in self._marks and end in self._marks:
+            return self._marks[end] - self._marks[start]
+        return None
+
+    def finish(self, started: float, elapsed: float = None):
+        """
+        计算各阶段耗时。异步请求根据 trace 记录的时间点计算；同步请求只能根据
+        requests 的 response.elapsed (发送请求到解析完响应头) 区分 wait 和 download。
+        """
+        total = time.monotonic() - started
+        self.timings["total"] = total
+        if self._marks:
+            phases = {
+                "connect": self._phase("connect_tcp.started", "connect_tcp.complete"),
+                "tls": self._phase("start_tls.started", "start_tls.complete"),
+                "send": self._phase("send_request_headers.started", "send_request_body.complete"),
+                "wait": self._phase("send_request_body.complete", "receive_response_headers.complete"),
+                "download": self._phase("receive_response_body.started", "receive_response_body.complete"),
+            }
+            self.timings.update((name, value) for name, value in phases.items() if value is not None)
+        elif elapsed is not None:
+            self.timings["wait"] = elapsed
+            self.timings["download"] = max(0.0, total - elapsed)
+
+    def __repr__(self):
+        return (f"RequestEvent({self.method} {self.endpoint}, chain={self.chain_index}, "
+                f"attempt={self.attempt}, status={self.status_code}, timings={self.timings})")
+
+
+class Instrumentation:
+    """
+    make_request 的插桩钩子注册表。
+
+    - 请求前钩子 on_request(event)：签名完成、即将发送时调用；
+    - 响应后钩子 on_response(event)：收到响应或发生网络错误后调用，event 中包含状态码、
+      收发字节数和各阶段耗时 (见 PHASES)。
+    钩子在发送请求的线程 (或事件循环) 中同步执行，应尽量轻量；钩子抛出的异常会被忽略。
+    没有注册任何钩子时 make_request 不会收集耗时，没有额外开销。
+    """
+
+    def __init__(self):
+        self._pre_request_hooks: List[Callable[[RequestEvent], None]] = []
+        self._post_response_hooks: List[Callable[[RequestEvent], None]] = []
+
+    def add_pre_request_hook(self, callback: Callable[[RequestEvent], None]):
+        """ 注册一个请求前钩子。 """
+        self._pre_request_hooks.append(callback)
+
+    def add_post_response_hook(self, callback: Callable[[RequestEvent], None]):
+        """ 注册一个响应后钩子，例如 MetricsCollector 或 PrometheusCollector 实例。 """
+        self._post_response_hooks.append(callback)
+
+    def remove_hook(self, callback: Callable[[RequestEvent], None]):
+        """ 移除一个已注册的钩子 (请求前或响应后)。 """
+        for hooks in (self._pre_request_hooks, self._post_response_hooks):
+            if callback in hooks:
+                hooks.remove(callback)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._pre_request_hooks or self._post_response_hooks)
+
+    def _run(self, hooks: list, event: RequestEvent):
+        for callback in list(hooks):
+            try:
+                callback(event)
+            except Exception as e:
+                logger.warning("请求插桩钩子出错: %s", e)
+
+    def on_request(self, event: RequestEvent):
+        self._run(self._pre_request_hooks, event)
+
+    def on_response(self, event: RequestEvent):
+        self._run(self._post_response_hooks, event)
+
+
+# 默认的耗时直方图桶边界（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """ 固定桶边界的直方图 (线程安全)，按桶内线性插值估算分位数。 """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # 最后一个桶为 +Inf
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sum += value
+            self._count += 1
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        """ 估算第 percentile 百分位 (0-100)，没有样本时返回None。 """
+        with self._lock:
+            counts = list(self._counts)
+            count = self._count
+        if count == 0:
+            return None
+        rank = percentile / 100 * count
+        cumulative = 0
+        for index, bucket_count in enumerate(counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                if index == len(self.buckets):
+                    # +Inf 桶没有上界，返回最后一个有限边界
+                    return lower
+                upper = self.buckets[index]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+    def get_stats(self) -> Dict[str, object]:
+        """ 返回样本数、总和、平均值、p50/p95/p99 估算值和各桶计数。 """
+        with self._lock:
+            count, total, counts = self._count, self._sum, list(self._counts)
+        return {
+            "count": count,
+            "sum": total,
+            "avg": total / count if count else None,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+            "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], counts)),
+        }
+
+
+class MetricsCollector:
+    """
+    把请求事件汇总为内存中的计数器和直方图的响应后钩子。
+
+    计数器按 endpoint 统计请求数、各状态码次数、重试次数、网络错误次数和收发字节数，
+    直方图按 (endpoint, 阶段) 统计耗时。用法:
+
+        metrics = MetricsCollector()
+        config.instrumentation.add_post_response_hook(metrics)
+        metrics.get_stats()
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: RequestEvent):
+        status = str(event.status_code) if event.status_code is not None else "error"
+        with self._lock:
+            counters = self._counters.setdefault(event.endpoint, {
+                "requests": 0, "retries": 0, "network_errors": 0, "bytes_out": 0, "bytes_in": 0
+            })
+            counters["requests"] += 1
+            counters[f"status_{status}"] = counters.get(f"status_{status}", 0) + 1
+            if event.attempt:
+                counters["retries"] += 1
+            if event.error is not None:
+                counters["network_errors"] += 1
+            counters["bytes_out"] += event.bytes_out
+            counters["bytes_in"] += event.bytes_in
+            histograms = []
+            for phase, value in event.timings.items():
+                histogram = self._histograms.get((event.endpoint, phase))
+                if histogram is None:
+                    histogram = self._histograms[(event.endpoint, phase)] = Histogram(self.buckets)
+                histograms.append((histogram, value))
+        for histogram, value in histograms:
+            histogram.observe(value)
+
+    def get_stats(self) -> Dict[str, Dict[str, object]]:
+        """ 返回 {endpoint: {"counters": {...}, "timings": {阶段: 直方图统计}}}。 """
+        with self._lock:
+            counters = {endpoint: dict(values) for endpoint, values in self._counters.items()}
+            histograms = dict(self._histograms)
+        stats = {endpoint: {"counters": values, "timings": {}} for endpoint, values in counters.items()}
+        for (endpoint, phase), histogram in histograms.items():
+            stats.setdefault(endpoint, {"counters": {}, "timings": {}})["timings"][phase] = histogram.get_stats()
+        return stats
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+class PrometheusCollector:
+    """
+    把请求事件导出为 prometheus_client 指标的响应后钩子 (需要安装 prometheus_client)。
+
+    指标:
+    - okx_http_requests_total{endpoint, status}: 请求数 (网络错误的 status 为 "error")；
+    - okx_http_retries_total{endpoint}: 重试次数；
+    - okx_http_bytes_total{endpoint, direction}: 收发字节数；
+    - okx_http_phase_seconds{endpoint, phase}: 各阶段耗时直方图。
+    """
+
+    def __init__(self, registry=None, namespace: str = "okx", buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Args:
+            registry: prometheus_client 的 CollectorRegistry，默认使用全局注册表。
+            namespace: 指标名前缀。
+            buckets: 耗时直方图的桶边界（秒）。
+
+        Raises:
+            ImportError: 如果未安装 prometheus_client。
+        """
+        if prometheus_client is None:
+            raise ImportError("PrometheusCollector 需要安装 prometheus_client: pip install prometheus-client")
+        kwargs = {"namespace": namespace}
+        if registry is not None:
+            kwargs["registry"] = registry
+        self._requests = prometheus_client.Counter(
+            "http_requests_total", "OKX API请求数", ["endpoint", "status"], **kwargs)
+        self._retries = prometheus_client.Counter(
+            "http_retries_total", "OKX API重试次数", ["endpoint"], **kwargs)
+        self._bytes = prometheus_client.Counter(
+            "http_bytes_total", "OKX API收发字节数", ["endpoint", "direction"], **kwargs)
+        self._phases = prometheus_client.Histogram(
+            "http_phase_seconds", "OKX API请求各阶段耗时", ["endpoint", "phase"], buckets=buckets, **kwargs)
+
+    def __call__(self, event: RequestEvent):
+        status = str(event.status_code) if event.status_code is not None else "error"
+        self._requests.labels(event.endpoint, status).inc()
+        if event.attempt:
+            self._retries.labels(event.endpoint).inc()
+        self._bytes.labels(event.endpoint, "out").inc(event.bytes_out)
+        self._bytes.labels(event.endpoint, "in").inc(event.bytes_in)
+        for phase, value in event.timings.items():
+            self._phases.labels(event.endpoint, phase).observe(value)
+
+
+_default_instrumentation: Optional[Instrumentation] = None
+_default_instrumentation_lock = threading.Lock()
+
+
+def get_default_instrumentation() -> Instrumentation:
+    """
+    获取进程内共享的默认插桩钩子注册表。
+
+    未显式传入 instrumentation 的 Config 都会使用它，因此在这里注册的钩子能观察到所有请求。
+    """
+    global _default_instrumentation
+    with _default_instrumentation_lock:
+        if _default_instrumentation is None:
+            _default_instrumentation = Instrumentation()
+        return _default_instrumentation
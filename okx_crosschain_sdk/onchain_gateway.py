@@ -1,6 +1,6 @@
 from typing import Optional, Dict, Any, List
 from .config import Config, get_default_config
-from .http_client import make_request, APIError
+from .http_client import make_request, async_make_request, APIError
 
 class OnChainGateway:
     """
@@ -18,11 +18,12 @@ class OnChainGateway:
         初始化 OnChainGateway。
 
         Args:
-            config: SDK的配置实例。必须包含 API_KEY, SECRET_KEY, PASSPHRASE。
+            config: SDK的配置实例。必须包含 API_KEY, SECRET_KEY, PASSPHRASE，或配置了凭证池。
         Raises:
             ValueError: 如果配置中缺少API认证信息。
         """
-        if not (config and config.API_KEY and config.SECRET_KEY and config.PASSPHRASE):
+        if not (config and (config.credential_pool is not None or
+                            (config.API_KEY and config.SECRET_KEY and config.PASSPHRASE))):
             raise ValueError("OnChainGateway 需要 Config 对象提供 API_KEY, SECRET_KEY, 和 PASSPHRASE。")
         self.config = config
 
@@ -37,13 +38,70 @@ class OnChainGateway:
             raise ValueError(f"未知的 base_path_type: {base_path_type}")
         return f"{self.API_VERSION_PATH}{actual_base_path}{specific_path}"
 
+    # 以下 _*_request 方法负责参数校验并构建 make_request 的参数，同步和异步版本共用
+
+    def _supported_chains_request(self) -> Dict[str, Any]:
+        endpoint = self._get_full_endpoint("pre_transaction", "/supported/chain")
+        return {"method": "GET", "endpoint": endpoint}
+
+    def _gas_price_request(self, chain_index: str) -> Dict[str, Any]:
+        if not chain_index:
+            raise ValueError("chain_index 不能为空")
+        endpoint = self._get_full_endpoint("pre_transaction", "/gas-price")
+        params = {"chainIndex": chain_index}
+        return {"method": "GET", "endpoint": endpoint, "params": params}
+
+    def _gas_limit_request(
+        self,
+        chain_index: str,
+        from_address: str,
+        to_address: str,
+        tx_amount: Optional[str] = None,
+        input_data: Optional[str] = None
+    ) -> Dict[str, Any]:
+        if not all([chain_index, from_address, to_address]):
+            raise ValueError("chain_index, from_address, to_address 不能为空")
+        
+        endpoint = self._get_full_endpoint("pre_transaction", "/gas-limit")
+        json_body: Dict[str, Any] = {
+            "chainIndex": chain_index,
+            "fromAddr": from_address, # 注意API文档参数名 fromAddr, toAddr
+            "toAddr": to_address
+        }
+        if tx_amount is not None: # API说默认"0", 如果不传会怎样？为安全起见，用户不传我们也不传
+            json_body["txAmount"] = tx_amount
+        if input_data is not None:
+            json_body["extJson"] = {"inputData": input_data}
+        return {"method": "POST", "endpoint": endpoint, "json_data": json_body}
+
+    def _broadcast_request(self, signed_tx: str, chain_index: str, address: str) -> Dict[str, Any]:
+        if not all([signed_tx, chain_index, address]):
+            raise ValueError("signed_tx, chain_index, address 不能为空")
+            
+        endpoint = self._get_full_endpoint("pre_transaction", "/broadcast-transaction")
+        json_body = {
+            "signedTx": signed_tx,
+            "chainIndex": chain_index,
+            "address": address
+        }
+        return {"method": "POST", "endpoint": endpoint, "json_data": json_body}
+
+    def _broadcast_orders_request(self, address: str, chain_index: str, cursor: Optional[str] = None) -> Dict[str, Any]:
+        if not all([address, chain_index]):
+            raise ValueError("address, chain_index 不能为空")
+
+        endpoint = self._get_full_endpoint("post_transaction", "/orders")
+        params: Dict[str, Any] = {"address": address, "chainIndex": chain_index}
+        if cursor:
+            params["cursor"] = cursor
+        return {"method": "GET", "endpoint": endpoint, "params": params}
+
     def get_supported_chains(self) -> List[Dict[str, Any]]:
         """
         获取交易上链 API 支持的链信息。
         对应API: GET /api/v5/dex/pre-transaction/supported/chain
         """
-        endpoint = self._get_full_endpoint("pre_transaction", "/supported/chain")
-        response = make_request(method="GET", endpoint=endpoint, config=self.config)
+        response = make_request(**self._supported_chains_request(), config=self.config)
         return response.get('data', [])
 
     def get_gas_price(self, chain_index: str) -> List[Dict[str, Any]]: # 文档显示data是list
@@ -53,11 +111,7 @@ class OnChainGateway:
         Args:
             chain_index: 链的唯一标识。
         """
-        if not chain_index:
-            raise ValueError("chain_index 不能为空")
-        endpoint = self._get_full_endpoint("pre_transaction", "/gas-price")
-        params = {"chainIndex": chain_index}
-        response = make_request(method="GET", endpoint=endpoint, params=params, config=self.config)
+        response = make_request(**self._gas_price_request(chain_index), config=self.config)
         return response.get('data', [])
 
     def get_gas_limit(
@@ -72,21 +126,8 @@ class OnChainGateway:
         通过交易信息的预执行，获取预估消耗的 Gaslimit (交易模拟)。
         对应API: POST /api/v5/dex/pre-transaction/gas-limit
         """
-        if not all([chain_index, from_address, to_address]):
-            raise ValueError("chain_index, from_address, to_address 不能为空")
-        
-        endpoint = self._get_full_endpoint("pre_transaction", "/gas-limit")
-        json_body: Dict[str, Any] = {
-            "chainIndex": chain_index,
-            "fromAddr": from_address, # 注意API文档参数名 fromAddr, toAddr
-            "toAddr": to_address
-        }
-        if tx_amount is not None: # API说默认"0", 如果不传会怎样？为安全起见，用户不传我们也不传
-            json_body["txAmount"] = tx_amount
-        if input_data is not None:
-            json_body["extJson"] = {"inputData": input_data}
-        
-        response = make_request(method="POST", endpoint=endpoint, json_data=json_body, config=self.config)
+        request = self._gas_limit_request(chain_index, from_address, to_address, tx_amount, input_data)
+        response = make_request(**request, config=self.config)
         return response.get('data', [])
 
     def broadcast_transaction(
@@ -100,16 +141,7 @@ class OnChainGateway:
         注意: 此API可能仅向企业客户提供。
         对应API: POST /api/v5/dex/pre-transaction/broadcast-transaction
         """
-        if not all([signed_tx, chain_index, address]):
-            raise ValueError("signed_tx, chain_index, address 不能为空")
-            
-        endpoint = self._get_full_endpoint("pre_transaction", "/broadcast-transaction")
-        json_body = {
-            "signedTx": signed_tx,
-            "chainIndex": chain_index,
-            "address": address
-        }
-        response = make_request(method="POST", endpoint=endpoint, json_data=json_body, config=self.config)
+        response = make_request(**self._broadcast_request(signed_tx, chain_index, address), config=self.config)
         return response.get('data', [])
 
     def get_broadcast_orders(
@@ -122,13 +154,52 @@ class OnChainGateway:
         查询指定地址和链的已广播交易订单列表。
         对应API: GET /api/v5/dex/post-transaction/orders
         """
-        if not all([address, chain_index]):
-            raise ValueError("address, chain_index 不能为空")
+        response = make_request(**self._broadcast_orders_request(address, chain_index, cursor), config=self.config)
+        return response.get('data', [])
 
-        endpoint = self._get_full_endpoint("post_transaction", "/orders")
-        params: Dict[str, Any] = {"address": address, "chainIndex": chain_index}
-        if cursor:
-            params["cursor"] = cursor
-        
-        response = make_request(method="GET", endpoint=endpoint, params=params, config=self.config)
-        return response.get('data', []) 
\ No newline at end of file
+
+class AsyncOnChainGateway(OnChainGateway):
+    """
+    异步交易上链网关，是 OnChainGateway 的 asyncio 版本。
+    各方法的参数、返回值和异常与 OnChainGateway 一致，同样要求 Config 提供API认证信息。
+    """
+
+    async def get_supported_chains(self) -> List[Dict[str, Any]]:
+        """ 异步获取交易上链 API 支持的链信息。 """
+        response = await async_make_request(**self._supported_chains_request(), config=self.config)
+        return response.get('data', [])
+
+    async def get_gas_price(self, chain_index: str) -> List[Dict[str, Any]]:
+        """ 异步获取指定链的预估 gasPrice。 """
+        response = await async_make_request(**self._gas_price_request(chain_index), config=self.config)
+        return response.get('data', [])
+
+    async def get_gas_limit(
+        self,
+        chain_index: str,
+        from_address: str,
+        to_address: str,
+        tx_amount: Optional[str] = None,
+        input_data: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """ 异步预估交易的 Gaslimit (交易模拟)。 """
+        request = self._gas_limit_request(chain_index, from_address, to_address, tx_amount, input_data)
+        response = await async_make_request(**request, config=self.config)
+        return response.get('data', [])
+
+    async def broadcast_transaction(self, signed_tx: str, chain_index: str, address: str) -> List[Dict[str, Any]]:
+        """ 异步广播已签名的交易。 """
+        request = self._broadcast_request(signed_tx, chain_index, address)
+        response = await async_make_request(**request, config=self.config)
+        return response.get('data', [])
+
+    async def get_broadcast_orders(
+        self,
+        address: str,
+        chain_index: str,
+        cursor: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """ 异步查询已广播交易订单列表。 """
+        request = self._broadcast_orders_request(address, chain_index, cursor)
+        response = await async_make_request(**request, config=self.config)
+        return response.get('data', [])
@@ -1,23 +1,29 @@
 from typing import Optional, Literal, List, Dict, Any # For type hinting
 from .config import Config, get_default_config
-from .http_client import make_request, APIError
+from .http_client import make_request, async_make_request, APIError
+from .hedging import HedgePolicy, run_hedged, run_hedged_async
 
 class Quoter:
     """
     跨链询价模块。
     用于根据用户输入获取OKX DEX跨链交易的最佳路径和报价。
+
+    传入 hedge_policy 后启用对冲请求：第一次请求超过最近延迟的百分位仍未返回时，
+    再发送一个相同的请求并取先返回的结果，用于降低询价的尾延迟。
     """
     API_VERSION_PATH = "/api/v5"
     MODULE_BASE_PATH = "/dex/cross-chain"
 
-    def __init__(self, config: Config = None):
+    def __init__(self, config: Config = None, hedge_policy: HedgePolicy = None):
         """
         初始化 Quoter。
 
         Args:
             config: SDK的配置实例。如果为None，则使用默认配置。
+            hedge_policy: 可选，对冲策略，为None时不对冲。应在多个 Quoter 之间共享同一个实例。
         """
         self.config = config if config else get_default_config()
+        self.hedge_policy = hedge_policy
 
     def _get_full_endpoint(self, specific_path: str) -> str:
         """ 构建完整的API endpoint路径，包含版本和模块基础路径。 """
@@ -81,6 +87,47 @@ class Quoter:
             ValueError: 如果必填参数缺失。
             APIError: 如果API请求失败。
         """
+        endpoint, params = self._build_quote_request(
+            from_chain_id, to_chain_id, from_token_address, to_token_address, amount,
+            user_address, slippage, receiver, gas_price, quote_type, auto_slippage, preference, sort
+        )
+        
+        def request(is_hedge: bool = False):
+            return make_request(
+                method='GET', # /quote 是 GET 请求
+                endpoint=endpoint,
+                params=params,
+                config=self.config,
+                coalesce=not is_hedge  # 对冲请求必须真正发出，不能与第一次请求合并
+            )
+
+        try:
+            if self.hedge_policy is None:
+                response_json = request()
+            else:
+                response_json = run_hedged(self.hedge_policy, request, lambda: self._can_hedge(endpoint))
+            return self._parse_quote_response(endpoint, response_json)
+        except APIError as e:
+            # print(f"获取报价时发生错误: {e}")
+            raise
+
+    def _can_hedge(self, endpoint: str) -> bool:
+        """
+        客户端限流还有余量时才发送对冲请求，避免对冲流量挤占配额。
+        配置了凭证池时，要求至少有一组健康的凭证对该 endpoint 还有令牌 (按凭证各自的令牌桶判断)。
+        """
+        rate_limiter = self.config.rate_limiter
+        pool = self.config.credential_pool
+        if pool is not None:
+            return pool.has_capacity(endpoint, rate_limiter.available)
+        return not rate_limiter.would_exceed(endpoint, self.config.API_KEY)
+
+    def _build_quote_request(
+        self,
+        from_chain_id, to_chain_id, from_token_address, to_token_address, amount,
+        user_address, slippage, receiver, gas_price, quote_type, auto_slippage, preference, sort
+    ) -> tuple[str, Dict[str, Any]]:
+        """ 校验参数并构建 /quote 请求的 endpoint 和查询参数，同步和异步版本共用。 """
         if not all([from_chain_id, to_chain_id, from_token_address, to_token_address, amount]):
             raise ValueError("参数 from_chain_id, to_chain_id, from_token_address, to_token_address, amount 不能为空")
 
@@ -104,35 +151,74 @@ class Quoter:
         if preference: params["preference"] = preference
         if sort is not None: params["sort"] = str(sort)  # 确保sort为0时也能传递
         
-        try:
-            response_json = make_request(
-                method='GET', # /quote 是 GET 请求
+        return endpoint, params
+
+    def _parse_quote_response(self, endpoint: str, response_json: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """ 从 /quote 响应中提取路由列表，同步和异步版本共用。 """
+        # API成功时，`data` 字段应包含一个路由对象列表
+        if 'data' in response_json and isinstance(response_json['data'], list):
+            return response_json['data']
+        # 如果 data 是 null 但 code 是 0，表示没有找到路由
+        elif 'data' in response_json and response_json['data'] is None and response_json.get('code') == '0' and response_json.get('sCode') == '0': # 正常无路由也可能是sCode 0
+            return [] # 返回空列表表示没有找到路径/报价
+        else:
+            # 对于 /quote, 我们在 http_client 中增加了对 sCode != '0' 的特殊错误处理，所以这里可以简化
+            # 如果 http_client 那里没有因 sCode 抛出错误，且 data 不是 list，则认为是格式问题
+            if not ('data' in response_json and isinstance(response_json['data'], list)):
+                # 如果 code 为 '0' 但 data 格式不符 (例如 data 为 null 但 sCode 也为 0，或者 data 为其他非 list 类型)
+                if response_json.get('code') == '0' and response_json.get('sCode') == '0' and response_json.get('data') is None:
+                    return [] # 明确处理无有效路由但API未报错的情况
+            raise APIError(
+                message=f"API响应格式错误或未找到报价信息: {endpoint}",
+                response_data=response_json
+            )
+
+
+class AsyncQuoter(Quoter):
+    """
+    异步跨链询价模块，是 Quoter 的 asyncio 版本。
+    参数、返回值、异常和对冲行为与 Quoter.get_quote 完全一致，但不会阻塞事件循环，
+    并且对冲时会取消落败的请求。
+    """
+
+    async def get_quote(
+        self,
+        from_chain_id: str,
+        to_chain_id: str,
+        from_token_address: str,
+        to_token_address: str,
+        amount: str,
+        user_address: Optional[str] = None,
+        slippage: Optional[str] = None,
+        receiver: Optional[str] = None,
+        gas_price: Optional[str] = None,
+        quote_type: Optional[Literal["exactIn", "exactOut"]] = "exactIn",
+        auto_slippage: Optional[bool] = False,
+        preference: Optional[Literal["price", "speed"]] = None,
+        sort: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        异步获取跨链交易的路径和报价信息。
+        对应API: /api/v5/dex/cross-chain/quote，参数说明见 Quoter.get_quote。
+        """
+        endpoint, params = self._build_quote_request(
+            from_chain_id, to_chain_id, from_token_address, to_token_address, amount,
+            user_address, slippage, receiver, gas_price, quote_type, auto_slippage, preference, sort
+        )
+        async def request(is_hedge: bool = False):
+            return await async_make_request(
+                method='GET',
                 endpoint=endpoint,
                 params=params,
-                config=self.config
+                config=self.config,
+                coalesce=not is_hedge
             )
-            
-            # API成功时，`data` 字段应包含一个路由对象列表
-            if 'data' in response_json and isinstance(response_json['data'], list):
-                return response_json['data']
-            # 如果 data 是 null 但 code 是 0，表示没有找到路由
-            elif 'data' in response_json and response_json['data'] is None and response_json.get('code') == '0' and response_json.get('sCode') == '0': # 正常无路由也可能是sCode 0
-                return [] # 返回空列表表示没有找到路径/报价
-            else:
-                # 对于 /quote, 我们在 http_client 中增加了对 sCode != '0' 的特殊错误处理，所以这里可以简化
-                # 如果 http_client 那里没有因 sCode 抛出错误，且 data 不是 list，则认为是格式问题
-                if not ('data' in response_json and isinstance(response_json['data'], list)):
-                    # 如果 code 为 '0' 但 data 格式不符 (例如 data 为 null 但 sCode 也为 0，或者 data 为其他非 list 类型)
-                    if response_json.get('code') == '0' and response_json.get('sCode') == '0' and response_json.get('data') is None:
-                        return [] # 明确处理无有效路由但API未报错的情况
-                raise APIError(
-                    message=f"API响应格式错误或未找到报价信息: {endpoint}",
-                    response_data=response_json
-                )
-                return response_json['data'] # Fallback, 应该被前面的条件覆盖
-        except APIError as e:
-            # print(f"获取报价时发生错误: {e}")
-            raise
+
+        if self.hedge_policy is None:
+            response_json = await request()
+        else:
+            response_json = await run_hedged_async(self.hedge_policy, request, lambda: self._can_hedge(endpoint))
+        return self._parse_quote_response(endpoint, response_json)
 
 # 简单使用示例 (用于测试)
 # if __name__ == '__main__':
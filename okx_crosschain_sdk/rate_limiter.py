@@ -0,0 +1,189 @@
+# okx_crosschain_sdk/rate_limiter.py
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from .http_client import APIError
+
+# 按 endpoint 家族配置的默认限流速率: {路径片段: (每秒请求数, 突发容量)}
+# 路径片段按顺序与 endpoint 做子串匹配，未匹配到的 endpoint 使用 "*" (如果配置了的话)，否则不限流
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[float, float]] = {
+    "/dex/cross-chain/quote": (2.0, 2.0),
+    "/dex/aggregator/all-tokens": (1.0, 2.0),
+    "/dex/cross-chain/status": (5.0, 5.0),
+    "/dex/pre-transaction/": (2.0, 2.0),
+}
+
+
+class RateLimitExceeded(APIError):
+    """客户端限流异常：请求在允许的最长排队时间内无法获得令牌。"""
+    def __init__(self, message, retry_after: float = None):
+        super().__init__(message, status_code=429)
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    令牌桶。
+
+    采用"预约"方式实现排队：令牌不足时直接预支一个令牌 (令牌数可以为负)，
+    并返回需要等待的时间，调用方在锁外睡眠即可。后到的请求看到的欠账更多，
+    需要等待的时间也更长，因此天然按先来后到的顺序排队。
+    本类本身不加锁，由 RateLimiter 负责并发保护。
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: 每秒补充的令牌数。
+            capacity: 桶容量 (允许的突发请求数)。
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def reserve(self, now: float, max_wait: float) -> Optional[float]:
+        """
+        预约一个令牌。
+
+        Returns:
+            需要等待的秒数 (0 表示立即可用)；如果等待时间超过 max_wait 则不预约并返回None。
+        """
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        wait = (1 - self.tokens) / self.rate
+        if wait > max_wait:
+            return None
+        self.tokens -= 1
+        return wait
+
+    def would_exceed(self, now: float) -> bool:
+        """ 当前是否没有可立即使用的令牌。 """
+        self._refill(now)
+        return self.tokens < 1
+
+
+class RateLimiter:
+    """
+    客户端限流器，按 (API Key, endpoint家族) 维护独立的令牌桶。
+
+    make_request / async_make_request 在发送请求前都会调用它，使整个进程对
+    OKX 的请求速率保持在配额以内，而不是触发 429 后再重试。
+    """
+
+    def __init__(self, rates: Dict[str, Tuple[float, float]] = None, max_wait: float = 5.0):
+        """
+        Args:
+            rates: {路径片段: (每秒请求数, 突发容量)}，默认为 DEFAULT_RATE_LIMITS。
+            max_wait: 默认的最长排队时间（秒），超过则抛出 RateLimitExceeded。
+                      为 0 时不排队，令牌不足立即拒绝。
+        """
+        self.rates = dict(DEFAULT_RATE_LIMITS if rates is None else rates)
+        self.max_wait = max_wait
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def get_family(self, endpoint: str) -> Optional[str]:
+        """ 返回 endpoint 所属的限流家族，不受限流时返回None。 """
+        for family in self.rates:
+            if family != "*" and family in endpoint:
+                return family
+        return "*" if "*" in self.rates else None
+
+    def _get_bucket(self, family: str, api_key: Optional[str]) -> TokenBucket:
+        key = (api_key or "anonymous", family)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rate, capacity = self.rates[family]
+            bucket = TokenBucket(rate, capacity)
+            self._buckets[key] = bucket
+        return bucket
+
+    def _reserve(self, endpoint: str, api_key: Optional[str], max_wait: Optional[float]) -> float:
+        """ 预约令牌并返回需要等待的时间，超出最长排队时间时抛出 RateLimitExceeded。 """
+        family = self.get_family(endpoint)
+        if family is None:
+            return 0.0
+        if max_wait is None:
+            max_wait = self.max_wait
+        with self._lock:
+            bucket = self._get_bucket(family, api_key)
+            wait = bucket.reserve(time.monotonic(), max_wait)
+            # 在锁内读取令牌数，锁外其它线程可能正在修改它
+            tokens = bucket.tokens
+        if wait is None:
+            raise RateLimitExceeded(
+                f"客户端限流: {family} 的请求速率超过配额 ({bucket.rate}/s)，排队时间将超过 {max_wait}s",
+                retry_after=(1 - tokens) / bucket.rate
+            )
+        return wait
+
+    def acquire(self, endpoint: str, api_key: str = None, max_wait: float = None) -> float:
+        """
+        为一次请求获取令牌，令牌不足时阻塞排队。
+
+        Returns:
+            实际等待的秒数。
+
+        Raises:
+            RateLimitExceeded: 如果需要排队的时间超过 max_wait。
+        """
+        wait = self._reserve(endpoint, api_key, max_wait)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, endpoint: str, api_key: str = None, max_wait: float = None) -> float:
+        """ acquire 的异步版本，排队时不阻塞事件循环。 """
+        wait = self._reserve(endpoint, api_key, max_wait)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def available(self, endpoint: str, api_key: str = None) -> float:
+        """ 此刻该 API Key 对 endpoint 可立即使用的令牌数，不受限流的 endpoint 返回无穷大。 """
+        family = self.get_family(endpoint)
+        if family is None:
+            return float("inf")
+        with self._lock:
+            bucket = self._get_bucket(family, api_key)
+            bucket._refill(time.monotonic())
+            return bucket.tokens
+
+    def would_exceed(self, endpoint: str, api_key: str = None) -> bool:
+        """
+        快速判断此刻发送请求是否会超出配额 (不消耗令牌)。
+        调用方可以据此直接拒绝或降级，而不是排队等待。
+        """
+        family = self.get_family(endpoint)
+        if family is None:
+            return False
+        with self._lock:
+            return self._get_bucket(family, api_key).would_exceed(time.monotonic())
+
+
+_default_rate_limiter: Optional[RateLimiter] = None
+_default_rate_limiter_lock = threading.Lock()
+
+
+def get_default_rate_limiter() -> RateLimiter:
+    """
+    获取进程内共享的默认 RateLimiter。
+
+    OKX 的配额是按 API Key 在全局计算的，因此未显式传入 rate_limiter 的
+    Config 都共享同一组令牌桶。
+    """
+    global _default_rate_limiter
+    with _default_rate_limiter_lock:
+        if _default_rate_limiter is None:
+            _default_rate_limiter = RateLimiter()
+        return _default_rate_limiter
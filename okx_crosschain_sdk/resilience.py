@@ -0,0 +1,273 @@
+# okx_crosschain_sdk/resilience.py
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .http_client import APIError
+
+
+class CircuitOpenError(APIError):
+    """熔断异常：对应 endpoint/链 的熔断器处于打开状态，请求被快速拒绝。"""
+    def __init__(self, message, retry_after: float = None):
+        super().__init__(message, status_code=503)
+        self.retry_after = retry_after
+
+
+class RetryPolicy:
+    """
+    重试策略：指数退避 + 随机抖动 (full jitter)。
+
+    只对幂等方法 (默认仅GET) 的网络错误和可重试状态码进行重试。
+    429 响应如果带有 Retry-After 头，会按其指定的时间等待 (不超过 max_retry_after)。
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 2,
+        backoff_base: float = 0.2,
+        backoff_max: float = 5.0,
+        jitter: bool = True,
+        retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504),
+        retry_methods: Tuple[str, ...] = ("GET",),
+        max_retry_after: float = 10.0
+    ):
+        """
+        Args:
+            max_retries: 最大重试次数 (不含第一次请求)，为0时不重试。
+            backoff_base: 第一次重试的基础退避时间（秒），之后每次翻倍。
+            backoff_max: 单次退避时间上限（秒）。
+            jitter: 是否在 [0, 退避时间] 内随机取值，避免大量客户端同时重试。
+            retry_statuses: 可重试的HTTP状态码。
+            retry_methods: 可重试的HTTP方法 (应只包含幂等方法)。
+            max_retry_after: 允许遵循的 Retry-After 上限（秒），超过则不再重试。
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.retry_statuses = retry_statuses
+        self.retry_methods = retry_methods
+        self.max_retry_after = max_retry_after
+
+    def should_retry(self, method: str, attempt: int, status_code: int = None, retry_after: float = None) -> bool:
+        """
+        判断第 attempt 次请求 (从0开始) 失败后是否应该重试。
+
+        Args:
+            method: HTTP方法。
+            attempt: 已完成的请求序号。
+            status_code: 响应状态码，网络错误时为None。
+            retry_after: 服务端通过 Retry-After 要求的等待时间。
+        """
+        if attempt >= self.max_retries or method.upper() not in self.retry_methods:
+            return False
+        if retry_after is not None and retry_after > self.max_retry_after:
+            return False
+        return status_code is None or status_code in self.retry_statuses
+
+    def get_delay(self, attempt: int, retry_after: float = None) -> float:
+        """ 计算第 attempt 次请求失败后的等待时间，Retry-After 优先。 """
+        if retry_after is not None:
+            return retry_after
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """ 解析 Retry-After 头 (秒数或HTTP日期)，无法解析时返回None。 """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """
+    熔断器。
+
+    - closed: 正常放行，连续失败达到 failure_threshold 次后进入 open；
+    - open: 直接拒绝请求 (抛出 CircuitOpenError)，经过 recovery_timeout 秒后进入 half_open；
+    - half_open: 最多放行 half_open_max_calls 个探测请求，成功则回到 closed，失败则重新 open。
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        on_state_change: Callable[[str, str, str], None] = None
+    ):
+        """
+        Args:
+            name: 熔断器名称，用于日志和回调。
+            failure_threshold: 触发熔断的连续失败次数。
+            recovery_timeout: 熔断打开后多久进入半开状态（秒）。
+            half_open_max_calls: 半开状态下允许同时进行的探测请求数。
+            on_state_change: 状态变化回调，参数为 (name, old_state, new_state)。
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.on_state_change = on_state_change
+
+        self.state = self.CLOSED
+        self.failure_count = 0
+        self.opened_at = 0.0
+        self._half_open_calls = 0
+        self._lock = threading.Lock()
+
+    def _transition(self, new_state: str):
+        """ 切换状态 (调用方需持有锁)，返回需要在锁外触发的回调参数。 """
+        old_state = self.state
+        self.state = new_state
+        if new_state == self.OPEN:
+            self.opened_at = time.monotonic()
+        if new_state != self.HALF_OPEN:
+            self._half_open_calls = 0
+        if new_state == self.CLOSED:
+            self.failure_count = 0
+        return (self.name, old_state, new_state) if old_state != new_state else None
+
+    def _notify(self, change):
+        if change and self.on_state_change:
+            self.on_state_change(*change)
+
+    def before_request(self):
+        """
+        请求前检查熔断状态。
+
+        Raises:
+            CircuitOpenError: 熔断器打开，或半开状态下探测名额已用完。
+        """
+        change = None
+        with self._lock:
+            if self.state == self.OPEN:
+                remaining = self.recovery_timeout - (time.monotonic() - self.opened_at)
+                if remaining > 0:
+                    raise CircuitOpenError(f"熔断器 {self.name} 已打开，上游暂不可用", retry_after=remaining)
+                change = self._transition(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN:
+                if self._half_open_calls >= self.half_open_max_calls:
+                    raise CircuitOpenError(f"熔断器 {self.name} 正在探测上游是否恢复", retry_after=self.recovery_timeout)
+                self._half_open_calls += 1
+        self._notify(change)
+
+    def release(self):
+        """ 请求在发出前被放弃 (例如被客户端限流拒绝) 时调用，归还半开状态下的探测名额。 """
+        with self._lock:
+            if self.state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record_success(self):
+        """ 记录一次成功的请求。 """
+        change = None
+        with self._lock:
+            self.failure_count = 0
+            if self.state != self.CLOSED:
+                change = self._transition(self.CLOSED)
+        self._notify(change)
+
+    def record_failure(self):
+        """ 记录一次失败的请求 (网络错误或5xx)。 """
+        change = None
+        with self._lock:
+            self.failure_count += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failure_count >= self.failure_threshold
+            ):
+                change = self._transition(self.OPEN)
+        self._notify(change)
+
+
+class CircuitBreakerRegistry:
+    """
+    熔断器注册表，按 (endpoint, chainIndex) 维护独立的熔断器，
+    使某条链或某个接口的故障不会影响其它链和接口。
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        on_state_change: Callable[[str, str, str], None] = None
+    ):
+        """
+        Args:
+            failure_threshold / recovery_timeout / half_open_max_calls: 见 CircuitBreaker。
+            on_state_change: 任意熔断器状态变化时的回调，参数为 (name, old_state, new_state)。
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._listeners: List[Callable[[str, str, str], None]] = []
+        if on_state_change:
+            self._listeners.append(on_state_change)
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback: Callable[[str, str, str], None]):
+        """ 注册一个状态变化回调，参数为 (name, old_state, new_state)。 """
+        self._listeners.append(callback)
+
+    def _on_state_change(self, name: str, old_state: str, new_state: str):
+        for callback in list(self._listeners):
+            callback(name, old_state, new_state)
+
+    def get(self, endpoint: str, chain_index: str = None) -> CircuitBreaker:
+        """ 获取 (endpoint, chainIndex) 对应的熔断器，不存在时创建。 """
+        key = (endpoint, chain_index or "")
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                name = f"{endpoint}[{chain_index}]" if chain_index else endpoint
+                breaker = CircuitBreaker(
+                    name,
+                    failure_threshold=self.failure_threshold,
+                    recovery_timeout=self.recovery_timeout,
+                    half_open_max_calls=self.half_open_max_calls,
+                    on_state_change=self._on_state_change
+                )
+                self._breakers[key] = breaker
+            return breaker
+
+    def get_states(self) -> Dict[str, str]:
+        """ 返回所有熔断器的当前状态，便于健康检查和监控。 """
+        with self._lock:
+            return {breaker.name: breaker.state for breaker in self._breakers.values()}
+
+
+_default_registry: Optional[CircuitBreakerRegistry] = None
+_default_registry_lock = threading.Lock()
+
+
+def get_default_circuit_breakers() -> CircuitBreakerRegistry:
+    """
+    获取进程内共享的默认熔断器注册表。
+
+    上游的健康状况与调用方无关，因此未显式传入 circuit_breakers 的 Config 都共享它。
+    """
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = CircuitBreakerRegistry()
+        return _default_registry
@@ -0,0 +1,191 @@
+# okx_crosschain_sdk/single_flight.py
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+
+def make_request_key(method: str, url: str, params: dict = None) -> str:
+    """
+    生成用于合并请求的键: 方法 + 完整路径 + 排序后的查询参数。
+
+    参数顺序不同但内容相同的请求会得到相同的键。
+    """
+    query = urlencode(sorted((params or {}).items()))
+    return f"{method.upper()} {url}?{query}"
+
+
+class _Call:
+    """ 一次进行中的同步上游调用，等待者通过 event 获取其结果或异常。 """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    请求合并 (single-flight)。
+
+    相同键的并发调用只会真正执行一次，其余调用者等待并共享同一个结果或异常。
+    只在调用进行期间合并，调用结束后不会缓存结果。
+
+    注意：共享的结果是同一个对象，调用方必须把它当作只读数据，
+    需要修改时请先复制 (例如 {**token, ...})。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self._tasks: Dict[Tuple[int, str], asyncio.Task] = {}
+        # 流式调用 (claim / release)：领头者边读取边把结果交给自己的调用方，等待者只等待其完成
+        self._streams: Dict[str, threading.Event] = {}
+        self._async_streams: Dict[Tuple[int, str], asyncio.Future] = {}
+        self._requests = 0
+        self._upstream_calls = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        执行 fn，如果相同键的调用已在进行中，则等待并返回它的结果。
+
+        Raises:
+            fn 抛出的异常 (所有等待者都会收到同一个异常)。
+        """
+        with self._lock:
+            self._requests += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._upstream_calls += 1
+
+        if not leader:
+            call.event.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                with self._lock:
+                    self._calls.pop(key, None)
+                call.event.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        do 的异步版本。
+
+        上游调用在独立的 Task 中执行，某个调用方被取消不会影响其它等待者。
+        """
+        loop = asyncio.get_running_loop()
+        # Task 与事件循环绑定，不同事件循环之间不合并
+        task_key = (id(loop), key)
+        with self._lock:
+            self._requests += 1
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = loop.create_task(fn())
+                self._tasks[task_key] = task
+                self._upstream_calls += 1
+                task.add_done_callback(lambda _: self._forget_task(task_key, task))
+        return await asyncio.shield(task)
+
+    def _forget_task(self, task_key: Tuple[int, str], task: asyncio.Task):
+        with self._lock:
+            if self._tasks.get(task_key) is task:
+                del self._tasks[task_key]
+        if not task.cancelled():
+            # 标记异常已被读取，避免没有等待者时出现 "exception was never retrieved" 警告
+            task.exception()
+
+    def claim(self, key: str) -> Optional[threading.Event]:
+        """
+        合并无法共享返回值的流式调用 (例如边解析边产出的列表，结果由领头者写入缓存)。
+
+        Returns:
+            None 表示调用方成为领头者，执行完毕 (包括失败或提前停止) 后必须调用 release；
+            否则返回进行中调用的完成事件，等待者在它被设置后读取领头者留下的结果 (例如缓存)。
+        """
+        with self._lock:
+            self._requests += 1
+            event = self._streams.get(key)
+            if event is None:
+                self._streams[key] = threading.Event()
+                self._upstream_calls += 1
+            return event
+
+    def release(self, key: str):
+        """ 结束 claim 成为领头者的流式调用，唤醒所有等待者。 """
+        with self._lock:
+            event = self._streams.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def claim_async(self, key: str) -> Optional[asyncio.Future]:
+        """ claim 的异步版本，等待者 await 返回的 Future (应配合 asyncio.shield)，领头者完成后调用 release_async。 """
+        loop = asyncio.get_running_loop()
+        stream_key = (id(loop), key)
+        with self._lock:
+            self._requests += 1
+            future = self._async_streams.get(stream_key)
+            if future is None:
+                self._async_streams[stream_key] = loop.create_future()
+                self._upstream_calls += 1
+            return future
+
+    def release_async(self, key: str):
+        """ 结束 claim_async 成为领头者的流式调用，需要在同一个事件循环中调用。 """
+        stream_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            future = self._async_streams.pop(stream_key, None)
+        if future is not None and not future.done():
+            future.set_result(None)
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        返回合并统计。
+
+        Returns:
+            requests: 调用总数；upstream_calls: 实际执行的上游调用数；
+            coalesced: 被合并的调用数；coalescing_ratio: coalesced / requests。
+        """
+        with self._lock:
+            requests, upstream_calls = self._requests, self._upstream_calls
+        coalesced = requests - upstream_calls
+        return {
+            "requests": requests,
+            "upstream_calls": upstream_calls,
+            "coalesced": coalesced,
+            "coalescing_ratio": coalesced / requests if requests else 0.0,
+        }
+
+    def reset_stats(self):
+        """ 清零统计计数。 """
+        with self._lock:
+            self._requests = 0
+            self._upstream_calls = 0
+
+
+_default_single_flight: Optional[SingleFlight] = None
+_default_single_flight_lock = threading.Lock()
+
+
+def get_default_single_flight() -> SingleFlight:
+    """
+    获取进程内共享的默认 SingleFlight。
+
+    未显式传入 single_flight 的 Config 都共享它，因此即使每个请求都创建新的 Config，
+    相同的上游GET请求也能被合并。
+    """
+    global _default_single_flight
+    with _default_single_flight_lock:
+        if _default_single_flight is None:
+            _default_single_flight = SingleFlight()
+        return _default_single_flight
@@ -1,13 +1,37 @@
 # okx_crosschain_sdk/status_tracker.py
 
-from .http_client import make_request, APIError
+import asyncio
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .http_client import make_request, async_make_request, APIError
 from .config import Config, get_default_config
 from typing import Dict, Any, Optional
 
+# 批量查询结果中的错误信息：交易未找到、超过批量查询的截止时间仍未完成
+BATCH_NOT_FOUND = "交易未找到"
+BATCH_TIMEOUT = "查询超时"
+
+_batch_executor: Optional[ThreadPoolExecutor] = None
+_batch_executor_lock = threading.Lock()
+
+
+def _get_batch_executor() -> ThreadPoolExecutor:
+    """ 同步批量查询共享的线程池 (每批最多占用 concurrency 个线程)。 """
+    global _batch_executor
+    with _batch_executor_lock:
+        if _batch_executor is None:
+            _batch_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="okx-status-batch")
+        return _batch_executor
+
 class StatusTracker:
     """
     状态追踪器，用于查询跨链交易的执行状态
     """
+    # OKX DEX API的交易状态和历史查询端点
+    STATUS_ENDPOINT = "/api/v5/dex/cross-chain/status"
+    HISTORY_ENDPOINT = "/api/v5/dex/cross-chain/history"
     
     def __init__(self, config: Config = None):
         """
@@ -33,7 +57,7 @@ class StatusTracker:
         """
         try:
             # OKX DEX API的交易状态查询端点
-            endpoint = "/api/v5/dex/cross-chain/status"
+            endpoint = self.STATUS_ENDPOINT
             
             params = {
                 "txId": tx_id
@@ -46,11 +70,7 @@ class StatusTracker:
                 params=params
             )
             
-            # 检查响应数据
-            if response and 'data' in response and response['data']:
-                return response['data'][0] if isinstance(response['data'], list) else response['data']
-            
-            return None
+            return self._extract_status(response)
             
         except APIError as e:
             # 重新抛出API错误，让调用方处理
@@ -59,6 +79,14 @@ class StatusTracker:
             # 包装其他异常为APIError
             raise APIError(f"查询交易状态时发生未知错误: {str(e)}")
     
+    def _extract_status(self, response: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """ 从 /status 响应中提取单个交易的状态，同步和异步版本共用。 """
+        # 检查响应数据
+        if response and 'data' in response and response['data']:
+            return response['data'][0] if isinstance(response['data'], list) else response['data']
+        
+        return None
+    
     def get_transaction_history(self, user_address: str, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
         """
         查询用户的跨链交易历史
@@ -76,7 +104,7 @@ class StatusTracker:
         """
         try:
             # 注意：这个端点可能不存在于OKX API中，这里是示例实现
-            endpoint = "/api/v5/dex/cross-chain/history"
+            endpoint = self.HISTORY_ENDPOINT
             
             params = {
                 "address": user_address,
@@ -101,29 +129,157 @@ class StatusTracker:
         except Exception as e:
             raise APIError(f"查询交易历史时发生未知错误: {str(e)}")
     
-    def batch_get_transaction_status(self, tx_ids: list) -> Dict[str, Dict[str, Any]]:
+    def status_query_rate(self) -> float:
+        """
+        客户端限流允许的单笔状态查询速率 (每秒请求数)，配置了凭证池时为各凭证速率之和。
+        可用于估算批量查询需要的时间，status 接口不受限流时返回无穷大。
+        """
+        rate_limiter = self.config.rate_limiter
+        family = rate_limiter.get_family(self.STATUS_ENDPOINT)
+        if family is None:
+            return float("inf")
+        pool = self.config.credential_pool
+        return rate_limiter.rates[family][0] * (len(pool) if pool is not None else 1)
+
+    def batch_get_transaction_status(
+        self,
+        tx_ids: list,
+        concurrency: int = 8,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
         """
         批量查询多个交易的状态
         
+        OKX API不支持批量查询，这里最多同时发起 concurrency 个单笔查询，
+        每个查询照常经过共享的客户端限流器、熔断器和凭证池。
+        
         Args:
             tx_ids: 交易ID列表
+            concurrency: 同时进行的查询数上限
+            timeout: 整批查询的截止时间（秒），None 表示不限制
             
         Returns:
-            以交易ID为键，状态信息为值的字典
-            
-        Raises:
-            APIError: 当API调用失败时抛出
+            以交易ID为键、按 tx_ids 顺序排列的字典，值为状态信息；
+            未找到、查询失败或超过截止时间的交易值为 {"error": 错误信息}
+            (未找到为 BATCH_NOT_FOUND，超时为 BATCH_TIMEOUT)。
+            同步请求无法被中途取消：截止时最多 concurrency 个已经开始的查询会在后台执行完毕，
+            其结果被丢弃，尚未开始的查询不再发出。
         """
+        tx_ids = list(dict.fromkeys(tx_ids))
+        if not tx_ids:
+            return {}
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        executor = _get_batch_executor()
+        queued = iter(tx_ids)
+        running = {}
         results = {}
         
-        # 由于OKX API可能不支持批量查询，我们逐个查询
-        for tx_id in tx_ids:
-            try:
-                status = self.get_transaction_status(tx_id)
-                results[tx_id] = status if status else {"error": "交易未找到"}
-            except APIError as e:
-                results[tx_id] = {"error": str(e)}
-            except Exception as e:
-                results[tx_id] = {"error": f"查询失败: {str(e)}"}
+        def submit_next():
+            tx_id = next(queued, None)
+            if tx_id is not None:
+                running[executor.submit(self._batch_item, tx_id)] = tx_id
+        
+        # 只在有空位时提交下一个查询，截止后未提交的交易不会占用限流配额
+        for _ in range(max(1, concurrency)):
+            submit_next()
+        while running:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            done, _ = wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                results[running.pop(future)] = future.result()
+                submit_next()
+        for future in running:
+            future.cancel()
+        
+        return {tx_id: results.get(tx_id, {"error": BATCH_TIMEOUT}) for tx_id in tx_ids}
+    
+    def _batch_item(self, tx_id: str) -> Dict[str, Any]:
+        try:
+            status = self.get_transaction_status(tx_id)
+            return status if status else {"error": BATCH_NOT_FOUND}
+        except APIError as e:
+            return {"error": str(e)}
+        except Exception as e:
+            return {"error": f"查询失败: {str(e)}"}
+
+
+class AsyncStatusTracker(StatusTracker):
+    """
+    异步状态追踪器，是 StatusTracker 的 asyncio 版本。
+    各方法的参数、返回值和异常与 StatusTracker 一致。
+    """
+
+    async def get_transaction_status(self, tx_id: str) -> Optional[Dict[str, Any]]:
+        """ 异步查询跨链交易状态，说明见 StatusTracker.get_transaction_status。 """
+        try:
+            response = await async_make_request(
+                method="GET",
+                endpoint=self.STATUS_ENDPOINT,
+                config=self.config,
+                params={"txId": tx_id}
+            )
+            return self._extract_status(response)
+        except APIError as e:
+            raise e
+        except Exception as e:
+            raise APIError(f"查询交易状态时发生未知错误: {str(e)}")
+
+    async def get_transaction_history(self, user_address: str, limit: int = 20, offset: int = 0) -> Dict[str, Any]:
+        """ 异步查询用户的跨链交易历史，说明见 StatusTracker.get_transaction_history。 """
+        try:
+            params = {
+                "address": user_address,
+                "limit": str(limit),
+                "offset": str(offset)
+            }
+            response = await async_make_request(
+                method="GET",
+                endpoint=self.HISTORY_ENDPOINT,
+                config=self.config,
+                params=params
+            )
+            return response if response else {"data": [], "total": 0}
+        except APIError as e:
+            if e.status_code == 404:
+                return {"data": [], "total": 0, "message": "历史查询功能暂不可用"}
+            raise e
+        except Exception as e:
+            raise APIError(f"查询交易历史时发生未知错误: {str(e)}")
+
+    async def batch_get_transaction_status(
+        self,
+        tx_ids: list,
+        concurrency: int = 8,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """ 异步批量查询多个交易的状态，说明见 StatusTracker.batch_get_transaction_status。超时时未完成的查询被取消。 """
+        tx_ids = list(dict.fromkeys(tx_ids))
+        if not tx_ids:
+            return {}
+        
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def query(tx_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    status = await self.get_transaction_status(tx_id)
+                    return status if status else {"error": BATCH_NOT_FOUND}
+                except APIError as e:
+                    return {"error": str(e)}
+                except Exception as e:
+                    return {"error": f"查询失败: {str(e)}"}
+        
+        tasks = {tx_id: asyncio.ensure_future(query(tx_id)) for tx_id in tx_ids}
+        try:
+            await asyncio.wait(tasks.values(), timeout=timeout)
+        finally:
+            for task in tasks.values():
+                task.cancel()
         
-        return results 
\ No newline at end of file
+        return {
+            tx_id: task.result() if task.done() and not task.cancelled() else {"error": BATCH_TIMEOUT}
+            for tx_id, task in tasks.items()
+        }
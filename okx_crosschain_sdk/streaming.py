@@ -0,0 +1,144 @@
+# okx_crosschain_sdk/streaming.py
+
+import codecs
+import json
+from typing import Any, Dict, List
+
+_WHITESPACE = " \t\n\r"
+
+
+class JSONArrayStreamParser:
+    """
+    增量解析形如 {"code": "0", "data": [{...}, {...}], "msg": ""} 的JSON响应。
+
+    调用方通过 feed() 不断喂入字节块，每次返回本块中新解析出的 `data` 数组元素；
+    数组之外的字段 (code、msg 等，以及为 null 的 data) 保存在 envelope 中。
+    已解析的文本会被丢弃，因此内存占用只与单个元素的大小有关，而与整个数组的长度无关。
+    数组元素和其它字段值用 json.JSONDecoder.raw_decode 解析。
+    """
+
+    # 解析阶段
+    _START = "start"              # 等待顶层的 '{'
+    _KEY = "key"                  # 等待下一个字段名或 '}'
+    _VALUE = "value"              # 等待当前字段的值
+    _ARRAY = "array"              # 在 data 数组中，等待下一个元素或 ']'
+    _DONE = "done"
+
+    def __init__(self, array_key: str = "data"):
+        """
+        Args:
+            array_key: 需要增量解析的数组字段名。
+        """
+        self.array_key = array_key
+        self.envelope: Dict[str, Any] = {}
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = self._START
+        self._current_key = None
+        # 是否已经遇到数组字段 (数组元素不会保存在 envelope 中)
+        self.saw_array = False
+
+    def _skip(self, chars: str = _WHITESPACE):
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in chars:
+            self._pos += 1
+
+    def _decode_value(self, final: bool):
+        """
+        从当前位置解析一个完整的JSON值，数据不足时返回 (False, None)。
+
+        数字等值在缓冲区末尾时可能被截断，因此不是最后一块数据时要求值后面还有字符。
+        """
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return False, None
+        if end == len(self._buffer) and not final:
+            return False, None
+        self._pos = end
+        return True, value
+
+    def feed(self, chunk: bytes, final: bool = False) -> List[Any]:
+        """
+        喂入一块数据，返回新解析出的数组元素。
+
+        Args:
+            chunk: 响应体的下一块字节。
+            final: 是否为最后一块数据。
+
+        Raises:
+            json.JSONDecodeError: 如果响应不是合法的JSON对象。
+        """
+        self._buffer = self._buffer[self._pos:] + self._text_decoder.decode(chunk, final)
+        self._pos = 0
+        items = []
+
+        while True:
+            self._skip()
+            if self._pos >= len(self._buffer):
+                break
+            char = self._buffer[self._pos]
+
+            if self._state == self._START:
+                if char != "{":
+                    raise json.JSONDecodeError("响应不是JSON对象", self._buffer, self._pos)
+                self._pos += 1
+                self._state = self._KEY
+
+            elif self._state == self._KEY:
+                if char == ",":
+                    self._pos += 1
+                    continue
+                if char == "}":
+                    self._pos += 1
+                    self._state = self._DONE
+                    continue
+                key_start = self._pos
+                ok, key = self._decode_value(final)
+                if not ok:
+                    break
+                self._skip()
+                if self._pos >= len(self._buffer):
+                    # 冒号还没到，回退到字段名之前等待更多数据
+                    self._pos = key_start
+                    break
+                if self._buffer[self._pos] != ":":
+                    raise json.JSONDecodeError("缺少 ':'", self._buffer, self._pos)
+                self._pos += 1
+                self._current_key = key
+                self._state = self._VALUE
+
+            elif self._state == self._VALUE:
+                if self._current_key == self.array_key and char == "[":
+                    self._pos += 1
+                    self.saw_array = True
+                    self._state = self._ARRAY
+                    continue
+                ok, value = self._decode_value(final)
+                if not ok:
+                    break
+                self.envelope[self._current_key] = value
+                self._state = self._KEY
+
+            elif self._state == self._ARRAY:
+                if char == ",":
+                    self._pos += 1
+                    continue
+                if char == "]":
+                    self._pos += 1
+                    self._state = self._KEY
+                    continue
+                ok, item = self._decode_value(final)
+                if not ok:
+                    break
+                items.append(item)
+
+            else:
+                raise json.JSONDecodeError("JSON对象之后存在多余数据", self._buffer, self._pos)
+
+        if final and self._state != self._DONE:
+            raise json.JSONDecodeError("响应在JSON对象结束前中断", self._buffer, self._pos)
+        return items
@@ -1,6 +1,6 @@
 from typing import Dict, Any, Optional
 from .config import Config, get_default_config
-from .http_client import make_request, APIError
+from .http_client import make_request, async_make_request, APIError
 
 class TransactionBuilder:
     """
@@ -40,11 +40,7 @@ class TransactionBuilder:
             ValueError: 如果 route_data 为空。
             APIError: 如果API请求失败。
         """
-        if not route_data:
-            raise ValueError("route_data 参数不能为空")
-
-        endpoint = self._get_full_endpoint("/approve-transaction")
-        request_body = route_data.copy()
+        endpoint, request_body = self._build_approve_request(route_data)
 
         try:
             response_json = make_request(
@@ -53,13 +49,7 @@ class TransactionBuilder:
                 json_data=request_body,
                 config=self.config
             )
-            if 'data' in response_json:
-                return response_json['data']
-            else:
-                raise APIError(
-                    message=f"API响应格式错误: 未找到'data'在 {endpoint}",
-                    response_data=response_json
-                )
+            return self._extract_data(endpoint, response_json)
         except APIError as e:
             raise
 
@@ -96,6 +86,36 @@ class TransactionBuilder:
             ValueError: 如果 route_data 为空。
             APIError: 如果API请求失败。
         """
+        endpoint, request_body = self._build_transaction_request(route_data, approve_tx_id, gas_price)
+        
+        try:
+            response_json = make_request(
+                method='POST',
+                endpoint=endpoint,
+                json_data=request_body, # 将路由对象及可能的额外参数作为JSON body发送
+                config=self.config
+            )
+            
+            # API成功时，`data` 字段应包含实际交易的数据
+            return self._extract_data(endpoint, response_json)
+        except APIError as e:
+            raise
+
+    def _build_approve_request(self, route_data: Dict[str, Any]) -> tuple[str, Dict[str, Any]]:
+        """ 校验并构建授权交易请求的 endpoint 和请求体，同步和异步版本共用。 """
+        if not route_data:
+            raise ValueError("route_data 参数不能为空")
+
+        endpoint = self._get_full_endpoint("/approve-transaction")
+        return endpoint, route_data.copy()
+
+    def _build_transaction_request(
+        self,
+        route_data: Dict[str, Any],
+        approve_tx_id: Optional[str] = None,
+        gas_price: Optional[str] = None
+    ) -> tuple[str, Dict[str, Any]]:
+        """ 校验并构建 /build-tx 请求的 endpoint 和请求体，同步和异步版本共用。 """
         if not route_data:
             raise ValueError("route_data 参数不能为空")
 
@@ -110,25 +130,52 @@ class TransactionBuilder:
         if gas_price:
             # 文档明确提到可以在请求体中加入gasPrice
             request_body["gasPrice"] = gas_price
-        
-        try:
-            response_json = make_request(
-                method='POST',
-                endpoint=endpoint,
-                json_data=request_body, # 将路由对象及可能的额外参数作为JSON body发送
-                config=self.config
+
+        return endpoint, request_body
+
+    def _extract_data(self, endpoint: str, response_json: Dict[str, Any]) -> Dict[str, Any]:
+        """ 从响应中提取 `data` 字段，同步和异步版本共用。 """
+        if 'data' in response_json:
+            return response_json['data']
+        else:
+            raise APIError(
+                message=f"API响应格式错误: 未找到'data'在 {endpoint}",
+                response_data=response_json
             )
-            
-            # API成功时，`data` 字段应包含实际交易的数据
-            if 'data' in response_json:
-                return response_json['data']
-            else:
-                raise APIError(
-                    message=f"API响应格式错误: 未找到'data'在 {endpoint}",
-                    response_data=response_json
-                )
-        except APIError as e:
-            raise
+
+
+class AsyncTransactionBuilder(TransactionBuilder):
+    """
+    异步交易构建模块，是 TransactionBuilder 的 asyncio 版本。
+    各方法的参数、返回值和异常与 TransactionBuilder 一致。
+    """
+
+    async def get_approve_transaction_data(self, route_data: Dict[str, Any]) -> Dict[str, Any]:
+        """ 异步获取ERC20代币授权交易数据。对应API: /api/v5/dex/cross-chain/approve-transaction """
+        endpoint, request_body = self._build_approve_request(route_data)
+        response_json = await async_make_request(
+            method='POST',
+            endpoint=endpoint,
+            json_data=request_body,
+            config=self.config
+        )
+        return self._extract_data(endpoint, response_json)
+
+    async def get_build_transaction_data(
+        self,
+        route_data: Dict[str, Any],
+        approve_tx_id: Optional[str] = None,
+        gas_price: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """ 异步获取构建跨链兑换交易的数据。对应API: /api/v5/dex/cross-chain/build-tx """
+        endpoint, request_body = self._build_transaction_request(route_data, approve_tx_id, gas_price)
+        response_json = await async_make_request(
+            method='POST',
+            endpoint=endpoint,
+            json_data=request_body,
+            config=self.config
+        )
+        return self._extract_data(endpoint, response_json)
 
 # 简单使用示例 (用于测试)
 # if __name__ == '__main__':
@@ -0,0 +1,292 @@
+# okx_crosschain_sdk/transport.py
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class HTTPTransport:
+    """
+    带连接池的HTTP传输层。
+
+    内部持有一个 requests.Session，并为每个主机维护一个 keep-alive 连接池，
+    避免每次请求都重新进行 TCP 和 TLS 握手。同一个 HTTPTransport 可以被多个
+    Config 以及所有SDK模块共享，并且是线程安全的。
+
+    连接池会在以下两种情况下整体回收重建：
+    - 空闲时间超过 idle_timeout（服务端很可能已经关闭了这些空闲连接）；
+    - 存活时间超过 max_lifetime（定期刷新连接，以便感知DNS和负载均衡的变化）。
+    回收时正在进行中的请求不受影响，它们使用的连接在请求结束后被关闭。
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 10,
+        pool_maxsize: int = 20,
+        idle_timeout: float = 60.0,
+        max_lifetime: float = 600.0
+    ):
+        """
+        初始化 HTTPTransport。
+
+        Args:
+            pool_connections: 缓存的主机连接池数量（每个主机一个连接池）。
+            pool_maxsize: 每个主机连接池中保持的最大连接数。
+            idle_timeout: 连接池最大空闲时间（秒），超过后在下次请求前重建。
+            max_lifetime: 连接池最大存活时间（秒），超过后在下次请求前重建。
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._created_at = 0.0
+        self._last_used = 0.0
+
+    def _new_session(self) -> requests.Session:
+        """ 创建一个挂载了连接池适配器的 Session。 """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _get_session(self) -> requests.Session:
+        """ 获取当前可用的 Session，必要时按空闲时间和存活时间回收重建。 """
+        now = time.monotonic()
+        with self._lock:
+            expired = self._session is not None and (
+                now - self._last_used > self.idle_timeout or
+                now - self._created_at > self.max_lifetime
+            )
+            if expired:
+                self._session.close()
+                self._session = None
+            if self._session is None:
+                self._session = self._new_session()
+                self._created_at = now
+            self._last_used = now
+            return self._session
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        json: dict = None,
+        data: bytes = None,
+        timeout: float = None,
+        stream: bool = False
+    ) -> requests.Response:
+        """
+        通过连接池发送一个HTTP请求。
+
+        Returns:
+            requests.Response 对象。
+
+        Raises:
+            requests.exceptions.RequestException: 网络层错误。
+        """
+        session = self._get_session()
+        return session.request(
+            method=method,
+            url=url,
+            headers=headers,
+            params=params,
+            json=json,
+            data=data,
+            timeout=timeout,
+            stream=stream
+        )
+
+    def close(self):
+        """ 关闭连接池，释放所有空闲连接。 """
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_default_transport: Optional[HTTPTransport] = None
+_default_transport_lock = threading.Lock()
+
+
+def get_default_transport() -> HTTPTransport:
+    """
+    获取进程内共享的默认 HTTPTransport。
+
+    未显式传入 transport 的 Config 都会使用它，因此即使调用方为每个请求
+    创建新的 Config，底层连接也能够被复用。
+    """
+    global _default_transport
+    with _default_transport_lock:
+        if _default_transport is None:
+            _default_transport = HTTPTransport()
+        return _default_transport
+
+
+class AsyncHTTPTransport:
+    """
+    基于 httpx.AsyncClient 的异步连接池传输层，是 HTTPTransport 的异步版本。
+
+    httpx 的连接与创建它的事件循环绑定，因此当检测到当前运行的事件循环发生变化时
+    (例如多次调用 asyncio.run)，会自动重建客户端。连接池的空闲超时由 httpx 按连接
+    处理，max_lifetime 的语义与 HTTPTransport 相同。
+    """
+
+    # 被回收的客户端在关闭前保留的宽限期（秒），应不小于请求超时时间
+    RETIRE_GRACE_PERIOD = 60.0
+
+    def __init__(
+        self,
+        pool_maxsize: int = 100,
+        max_keepalive: int = 20,
+        idle_timeout: float = 60.0,
+        max_lifetime: float = 600.0
+    ):
+        """
+        初始化 AsyncHTTPTransport。
+
+        Args:
+            pool_maxsize: 最大并发连接数。
+            max_keepalive: 保持 keep-alive 的最大空闲连接数。
+            idle_timeout: 单个空闲连接的最长保留时间（秒）。
+            max_lifetime: 客户端最大存活时间（秒），超过后在下次请求前重建。
+
+        Raises:
+            ImportError: 如果未安装 httpx。
+        """
+        if httpx is None:
+            raise ImportError("AsyncHTTPTransport 需要安装 httpx: pip install httpx")
+        self.pool_maxsize = pool_maxsize
+        self.max_keepalive = max_keepalive
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+
+        self._client = None
+        self._loop = None
+        self._created_at = 0.0
+
+    def _new_client(self):
+        """ 创建一个带连接池限制的 httpx.AsyncClient。 """
+        limits = httpx.Limits(
+            max_connections=self.pool_maxsize,
+            max_keepalive_connections=self.max_keepalive,
+            keepalive_expiry=self.idle_timeout
+        )
+        return httpx.AsyncClient(limits=limits)
+
+    async def _get_client(self):
+        """ 获取绑定到当前事件循环的客户端，必要时按存活时间回收重建。 """
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        if self._client is not None and self._loop is loop and now - self._created_at > self.max_lifetime:
+            # 旧客户端上可能还有进行中的请求，留出一个宽限期后再关闭
+            loop.create_task(self._close_later(self._client))
+            self._client = None
+        if self._client is None or self._loop is not loop:
+            # 旧事件循环上的客户端无法在新循环中使用，也无法安全关闭，直接丢弃
+            self._client = self._new_client()
+            self._loop = loop
+            self._created_at = now
+        return self._client
+
+    async def _close_later(self, client):
+        """ 等待进行中的请求结束后关闭被回收的客户端。 """
+        await asyncio.sleep(self.RETIRE_GRACE_PERIOD)
+        await client.aclose()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        json: dict = None,
+        data: bytes = None,
+        timeout: float = None,
+        extensions: dict = None
+    ):
+        """
+        通过连接池异步发送一个HTTP请求。
+        extensions 透传给 httpx (例如用于记录各阶段耗时的 "trace" 回调)。
+
+        Returns:
+            httpx.Response 对象。
+
+        Raises:
+            httpx.RequestError: 网络层错误。
+        """
+        client = await self._get_client()
+        return await client.request(
+            method=method,
+            url=url,
+            headers=headers,
+            params=params,
+            json=json,
+            content=data,
+            timeout=timeout,
+            extensions=extensions
+        )
+
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        headers: dict = None,
+        params: dict = None,
+        timeout: float = None,
+        extensions: dict = None
+    ):
+        """
+        以流式方式发送请求，返回 httpx 的异步上下文管理器，
+        在 `async with` 中通过 response.aiter_bytes() 逐块读取响应体。
+        """
+        client = await self._get_client()
+        return client.stream(
+            method=method,
+            url=url,
+            headers=headers,
+            params=params,
+            timeout=timeout,
+            extensions=extensions
+        )
+
+    async def aclose(self):
+        """ 关闭客户端，释放所有连接。 """
+        if self._client is not None:
+            client = self._client
+            self._client = None
+            self._loop = None
+            await client.aclose()
+
+
+_default_async_transport: Optional[AsyncHTTPTransport] = None
+
+
+def get_default_async_transport() -> AsyncHTTPTransport:
+    """
+    获取进程内共享的默认 AsyncHTTPTransport。
+
+    未显式传入 async_transport 的 Config 都会使用它。
+    """
+    global _default_async_transport
+    with _default_transport_lock:
+        if _default_async_transport is None:
+            _default_async_transport = AsyncHTTPTransport()
+        return _default_async_transport